@@ -0,0 +1,24 @@
+"""
+Optional Numba JIT.
+
+`njit` and `prange` come from numba when it is installed. Without it,
+`njit` is a no-op decorator and `prange` is `range`, so the same kernels
+run as plain Python (slower, same results).
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        # Bare @njit
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        # @njit(...) / @njit("signature", ...)
+        def decorator(fn):
+            return fn
+        return decorator
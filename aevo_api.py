@@ -6,14 +6,35 @@ API Documentation: https://api-docs.aevo.xyz/
 REST API: https://api.aevo.xyz
 """
 
+import functools
 import json
 import logging
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Fast JSON decoding if available (json.loads accepts bytes as well)
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Streaming JSON parser for the large /markets payload
+# (ijson picks its yajl2_c backend when available)
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 # Logging
 logging.basicConfig(
@@ -29,13 +50,38 @@ logger = logging.getLogger(__name__)
 AEVO_API_BASE = "https://api.aevo.xyz"
 AEVO_CACHE_FILE = "state/aevo_options_cache.json"
 CACHE_TTL_SECONDS = 300  # 5 minutes
+AEVO_RAW_CACHE_FILE = "state/aevo_raw_cache.json"
+RAW_CACHE_TTL_SECONDS = 60  # Orderbook/statistics reuse window
+QUOTE_FETCH_WORKERS = 16  # Parallel orderbook/statistics requests
+
+MONTH_MAP = {
+    'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
+    'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12
+}
+
+# ETH-28FEB25-2500-P → underlying, expiry, strike, type
+INSTRUMENT_RE = re.compile(r"^([^-]+)-(\d{2}[A-Za-z]{3}\d+)-([^-]+)-([^-]+)$")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HTTP SESSION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# One pooled session for all Aevo calls: keeps TCP/TLS connections alive
+# between requests instead of paying a handshake per call.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # DATA CLASSES
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True)
 class OptionQuote:
     """Option quote data"""
     instrument_name: str
@@ -57,9 +103,27 @@ class OptionQuote:
     # Calculated
     premium_pct: float  # Premium as % of underlying price
     days_to_expiry: int
+    
+    def to_dict(self) -> dict:
+        """Flat dict of all fields (cheaper than dataclasses.asdict)"""
+        return {
+            "instrument_name": self.instrument_name,
+            "underlying": self.underlying,
+            "option_type": self.option_type,
+            "strike": self.strike,
+            "expiry": self.expiry,
+            "expiry_timestamp": self.expiry_timestamp,
+            "mark_price": self.mark_price,
+            "bid_price": self.bid_price,
+            "ask_price": self.ask_price,
+            "iv": self.iv,
+            "delta": self.delta,
+            "premium_pct": self.premium_pct,
+            "days_to_expiry": self.days_to_expiry,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class OptionChain:
     """Option chain for an underlying"""
     underlying: str
@@ -69,35 +133,94 @@ class OptionChain:
     calls: List[OptionQuote]
 
 
+@dataclass(slots=True)
+class OptionChainSoA:
+    """Options as parallel arrays (only the columns used for scoring)"""
+    spot_price: float
+    names: List[str]
+    strikes: np.ndarray
+    days: np.ndarray
+    marks: np.ndarray
+    bids: np.ndarray  # 0 where no bid
+    asks: np.ndarray  # 0 where no ask
+    ivs: np.ndarray  # NaN where unknown
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # API FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Last /markets response per asset for conditional GETs
+_markets_cache: Dict[str, List[dict]] = {}
+_markets_validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+
 def get_aevo_markets(asset: str = "ETH") -> Optional[List[dict]]:
     """
-    Get all markets for an asset from Aevo.
+    Get all option markets for an asset from Aevo (perpetuals excluded).
     
     GET /markets?asset={asset}
+    
+    Sends If-None-Match / If-Modified-Since from the previous response and
+    reuses the last parsed list on 304 Not Modified.
     """
     try:
         url = f"{AEVO_API_BASE}/markets"
         params = {"asset": asset}
         
-        response = requests.get(url, params=params, timeout=30)
+        headers = {}
+        if asset in _markets_cache:
+            etag, last_modified = _markets_validators.get(asset, (None, None))
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
         
-        if response.status_code == 200:
-            data = response.json()
-            logger.info(f"Loaded {len(data)} markets for {asset}")
-            return data
-        else:
-            logger.error(f"Aevo API error: {response.status_code}")
-            return None
+        response = _SESSION.get(
+            url, params=params, headers=headers, timeout=30, stream=ijson is not None
+        )
+        
+        with response:
+            if response.status_code == 304 and asset in _markets_cache:
+                data = _markets_cache[asset]
+                logger.info("Markets not modified for %s (%d cached)", asset, len(data))
+                return data
+            elif response.status_code == 200:
+                data = parse_markets_response(response)
+                logger.info("Loaded %d markets for %s", len(data), asset)
+                
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    _markets_cache[asset] = data
+                    _markets_validators[asset] = (etag, last_modified)
+                
+                return data
+            else:
+                logger.error("Aevo API error: %s", response.status_code)
+                return None
             
     except Exception as e:
-        logger.error(f"Aevo API exception: {e}")
+        logger.error("Aevo API exception: %s", e)
         return None
 
 
+def parse_markets_response(response: requests.Response) -> List[dict]:
+    """
+    Decode a /markets response, dropping perpetuals while parsing.
+    
+    With ijson the body is streamed and filtered item by item, so the full
+    payload is never materialized as one list.
+    """
+    if ijson is not None:
+        response.raw.decode_content = True  # Undo gzip on the raw stream
+        items = ijson.items(response.raw, "item", use_float=True)
+    else:
+        items = _loads(response.content)
+    
+    return [m for m in items if "PERPETUAL" not in m.get("instrument_name", "")]
+
+
 def get_aevo_index_price(asset: str = "ETH") -> Optional[float]:
     """
     Get current index price for an asset.
@@ -108,19 +231,19 @@ def get_aevo_index_price(asset: str = "ETH") -> Optional[float]:
         url = f"{AEVO_API_BASE}/index"
         params = {"asset": asset}
         
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
         
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response.content)
             price = float(data.get("price", 0))
-            logger.info(f"{asset} index price: ${price:,.2f}")
+            logger.info("%s index price: $%.2f", asset, price)
             return price
         else:
-            logger.error(f"Aevo index API error: {response.status_code}")
+            logger.error("Aevo index API error: %s", response.status_code)
             return None
             
     except Exception as e:
-        logger.error(f"Aevo index API exception: {e}")
+        logger.error("Aevo index API exception: %s", e)
         return None
 
 
@@ -130,20 +253,27 @@ def get_aevo_orderbook(instrument_name: str) -> Optional[dict]:
     
     GET /orderbook?instrument_name={instrument_name}
     """
+    cache_key = f"orderbook:{instrument_name}"
+    cached = get_raw_cached(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
         url = f"{AEVO_API_BASE}/orderbook"
         params = {"instrument_name": instrument_name}
         
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
         
         if response.status_code == 200:
-            return response.json()
+            data = _loads(response.content)
+            put_raw_cached(cache_key, data)
+            return data
         else:
-            logger.warning(f"Orderbook not available for {instrument_name}")
+            logger.warning("Orderbook not available for %s", instrument_name)
             return None
             
     except Exception as e:
-        logger.warning(f"Orderbook exception for {instrument_name}: {e}")
+        logger.warning("Orderbook exception for %s: %s", instrument_name, e)
         return None
 
 
@@ -153,19 +283,26 @@ def get_aevo_statistics(instrument_name: str) -> Optional[dict]:
     
     GET /statistics?instrument_name={instrument_name}
     """
+    cache_key = f"statistics:{instrument_name}"
+    cached = get_raw_cached(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
         url = f"{AEVO_API_BASE}/statistics"
         params = {"instrument_name": instrument_name}
         
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
         
         if response.status_code == 200:
-            return response.json()
+            data = _loads(response.content)
+            put_raw_cached(cache_key, data)
+            return data
         else:
             return None
             
     except Exception as e:
-        logger.warning(f"Statistics exception: {e}")
+        logger.warning("Statistics exception: %s", e)
         return None
 
 
@@ -173,6 +310,7 @@ def get_aevo_statistics(instrument_name: str) -> Optional[dict]:
 # PARSING
 # ═══════════════════════════════════════════════════════════════════════════════
 
+@functools.lru_cache(maxsize=8192)
 def parse_instrument_name(name: str) -> Optional[dict]:
     """
     Parse Aevo instrument name.
@@ -182,58 +320,70 @@ def parse_instrument_name(name: str) -> Optional[dict]:
     - 28FEB25 = expiry date
     - 2500 = strike price
     - P = put (C = call)
+    
+    Results are memoized (names repeat across filter passes and polls),
+    so the returned dict is shared and must not be mutated.
     """
+    match = INSTRUMENT_RE.match(name)
+    if not match:
+        return None
+    
+    underlying, expiry_str, strike_str, option_type = match.groups()
+    
     try:
-        parts = name.split("-")
-        if len(parts) != 4:
-            return None
-        
-        underlying = parts[0]
-        expiry_str = parts[1]
-        strike = float(parts[2])
-        option_type = parts[3]  # P or C
-        
-        # Parse expiry date (e.g., 28FEB25)
-        day = int(expiry_str[:2])
-        month_str = expiry_str[2:5]
-        year_str = expiry_str[5:]
-        
-        month_map = {
-            'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
-            'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12
-        }
-        month = month_map.get(month_str.upper(), 1)
-        year = 2000 + int(year_str)
-        
-        expiry_date = datetime(year, month, day, tzinfo=timezone.utc)
+        expiry_date = parse_expiry(expiry_str)
         
         return {
             "underlying": underlying,
             "expiry_str": expiry_str,
             "expiry_date": expiry_date,
-            "strike": strike,
-            "option_type": option_type
+            "expiry_timestamp": int(expiry_date.timestamp()),
+            "strike": float(strike_str),
+            "option_type": option_type  # P or C
         }
         
     except Exception as e:
-        logger.warning(f"Failed to parse instrument: {name} - {e}")
+        logger.warning("Failed to parse instrument: %s - %s", name, e)
         return None
 
 
-def filter_options(
-    markets: List[dict],
-    option_type: str = "P",  # P for puts
-    min_days: int = 7,
-    max_days: int = 30,
-    spot_price: float = 0,
-    strike_range: Tuple[float, float] = (0.85, 1.0)  # -15% to ATM
-) -> List[dict]:
+@functools.lru_cache(maxsize=64)
+def parse_expiry(expiry_str: str) -> datetime:
     """
-    Filter options by criteria.
+    Parse expiry code (e.g., 28FEB25) to a UTC datetime.
+    
+    Only a handful of expiries exist per asset, so this is memoized.
     """
+    day = int(expiry_str[:2])
+    month = MONTH_MAP.get(expiry_str[2:5].upper(), 1)
+    year = 2000 + int(expiry_str[5:])
     
-    now = datetime.now(timezone.utc)
-    filtered = []
+    return datetime(year, month, day, tzinfo=timezone.utc)
+
+
+@dataclass(slots=True)
+class MarketTable:
+    """Option markets parsed once into parallel columns"""
+    markets: List[dict]
+    parsed: List[dict]
+    strikes: np.ndarray
+    days: np.ndarray  # Whole days to expiry
+    types: np.ndarray  # P or C
+
+
+def scan_markets(markets: List[dict], now: Optional[datetime] = None) -> MarketTable:
+    """
+    Parse all markets in a single pass.
+    
+    Perpetuals and unparseable instruments are skipped. The result is shared
+    by every option filter, so each instrument is parsed only once.
+    `now` is the reference time for days-to-expiry (defaults to current UTC).
+    """
+    
+    if now is None:
+        now = datetime.now(timezone.utc)
+    candidates = []
+    parsed_list = []
     
     for market in markets:
         instrument_name = market.get("instrument_name", "")
@@ -246,29 +396,82 @@ def filter_options(
         if not parsed:
             continue
         
-        # Filter by type
-        if parsed["option_type"] != option_type:
-            continue
-        
-        # Filter by expiry
-        days_to_expiry = (parsed["expiry_date"] - now).days
-        if days_to_expiry < min_days or days_to_expiry > max_days:
-            continue
-        
-        # Filter by strike (relative to spot)
-        if spot_price > 0:
-            strike_ratio = parsed["strike"] / spot_price
-            if strike_ratio < strike_range[0] or strike_ratio > strike_range[1]:
-                continue
-        
-        market["parsed"] = parsed
-        market["days_to_expiry"] = days_to_expiry
-        filtered.append(market)
+        candidates.append(market)
+        parsed_list.append(parsed)
+    
+    n = len(candidates)
+    strikes = np.fromiter((p["strike"] for p in parsed_list), dtype=float, count=n)
+    expiries = np.fromiter((p["expiry_timestamp"] for p in parsed_list), dtype=np.int64, count=n)
+    types = np.array([p["option_type"] for p in parsed_list], dtype=str)
+    
+    # Whole days to expiry (same flooring as timedelta.days)
+    days = ((expiries - now.timestamp()) // 86400).astype(int)
+    
+    return MarketTable(
+        markets=candidates,
+        parsed=parsed_list,
+        strikes=strikes,
+        days=days,
+        types=types
+    )
+
+
+def select_options(
+    table: MarketTable,
+    option_type: str = "P",  # P for puts
+    min_days: int = 7,
+    max_days: int = 30,
+    spot_price: float = 0,
+    strike_range: Tuple[float, float] = (0.85, 1.0)  # -15% to ATM
+) -> List[dict]:
+    """
+    Select options from a scanned market table, sorted by expiry then strike.
+    """
+    
+    strikes, days = table.strikes, table.days
+    
+    # Filter by type and expiry
+    mask = (table.types == option_type) & (days >= min_days) & (days <= max_days)
+    
+    # Filter by strike (relative to spot)
+    if spot_price > 0:
+        strike_ratio = strikes / spot_price
+        mask &= (strike_ratio >= strike_range[0]) & (strike_ratio <= strike_range[1])
     
     # Sort by expiry, then strike
-    filtered.sort(key=lambda x: (x["days_to_expiry"], x["parsed"]["strike"]))
+    idx = np.flatnonzero(mask)
+    idx = idx[np.lexsort((strikes[idx], days[idx]))]
+    
+    selected = []
+    for i in idx:
+        market = table.markets[i]
+        market["parsed"] = table.parsed[i]
+        market["days_to_expiry"] = int(days[i])
+        selected.append(market)
     
-    return filtered
+    return selected
+
+
+def filter_options(
+    markets: List[dict],
+    option_type: str = "P",  # P for puts
+    min_days: int = 7,
+    max_days: int = 30,
+    spot_price: float = 0,
+    strike_range: Tuple[float, float] = (0.85, 1.0),  # -15% to ATM
+    now: Optional[datetime] = None
+) -> List[dict]:
+    """
+    Filter options by criteria.
+    """
+    return select_options(
+        scan_markets(markets, now),
+        option_type=option_type,
+        min_days=min_days,
+        max_days=max_days,
+        spot_price=spot_price,
+        strike_range=strike_range
+    )
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -282,21 +485,27 @@ def build_option_chain(asset: str = "ETH", target_days: int = 14) -> Optional[Op
     Returns puts and calls around the target expiry.
     """
     
+    # Single reference time for expiry math and the chain timestamp
+    now = datetime.now(timezone.utc)
+    
     # Get spot price
     spot_price = get_aevo_index_price(asset)
     if not spot_price:
-        logger.error(f"Failed to get {asset} spot price")
+        logger.error("Failed to get %s spot price", asset)
         return None
     
     # Get all markets
     markets = get_aevo_markets(asset)
     if not markets:
-        logger.error(f"Failed to get {asset} markets")
+        logger.error("Failed to get %s markets", asset)
         return None
     
+    # Parse once, then select puts and calls from the same table
+    table = scan_markets(markets, now)
+    
     # Filter puts (for hedging)
-    puts = filter_options(
-        markets,
+    puts = select_options(
+        table,
         option_type="P",
         min_days=7,
         max_days=30,
@@ -305,8 +514,8 @@ def build_option_chain(asset: str = "ETH", target_days: int = 14) -> Optional[Op
     )
     
     # Filter calls (for reference)
-    calls = filter_options(
-        markets,
+    calls = select_options(
+        table,
         option_type="C",
         min_days=7,
         max_days=30,
@@ -314,25 +523,20 @@ def build_option_chain(asset: str = "ETH", target_days: int = 14) -> Optional[Op
         strike_range=(1.0, 1.20)  # ATM to +20%
     )
     
-    logger.info(f"Found {len(puts)} puts and {len(calls)} calls for {asset}")
+    logger.info("Found %d puts and %d calls for %s", len(puts), len(calls), asset)
     
-    # Get quotes for top options
-    put_quotes = []
-    for market in puts[:10]:  # Top 10 puts
-        quote = get_option_quote(market, spot_price)
-        if quote:
-            put_quotes.append(quote)
+    # Get quotes for top options (orderbook + statistics fetched in parallel)
+    top_puts = puts[:10]  # Top 10 puts
+    top_calls = calls[:5]  # Top 5 calls
     
-    call_quotes = []
-    for market in calls[:5]:  # Top 5 calls
-        quote = get_option_quote(market, spot_price)
-        if quote:
-            call_quotes.append(quote)
+    quotes = get_option_quotes(top_puts + top_calls, spot_price)
+    put_quotes = [q for q in quotes[:len(top_puts)] if q]
+    call_quotes = [q for q in quotes[len(top_puts):] if q]
     
     return OptionChain(
         underlying=asset,
         spot_price=spot_price,
-        timestamp=datetime.now(timezone.utc).isoformat(),
+        timestamp=now.isoformat(),
         puts=put_quotes,
         calls=call_quotes
     )
@@ -342,6 +546,56 @@ def get_option_quote(market: dict, spot_price: float) -> Optional[OptionQuote]:
     """
     Get full quote for an option including orderbook.
     """
+    instrument_name = market.get("instrument_name", "")
+    orderbook = get_aevo_orderbook(instrument_name)
+    stats = get_aevo_statistics(instrument_name)
+    return make_option_quote(market, spot_price, orderbook, stats)
+
+
+def get_option_quotes(markets: List[dict], spot_price: float) -> List[Optional[OptionQuote]]:
+    """
+    Get full quotes for several options at once.
+    
+    Orderbook and statistics requests for all instruments are issued
+    concurrently, so the chain costs ~1 round-trip instead of 2 per option.
+    Result order matches `markets`.
+    """
+    if not markets:
+        return []
+    
+    names = [market.get("instrument_name", "") for market in markets]
+    workers = min(QUOTE_FETCH_WORKERS, 2 * len(names))
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        orderbooks = pool.map(get_aevo_orderbook, names)
+        stats = pool.map(get_aevo_statistics, names)
+        orderbooks, stats = list(orderbooks), list(stats)
+    
+    # Premium as % of spot for the whole chain at once
+    marks = np.array([float(m.get("mark_price", 0) or 0) for m in markets])
+    if spot_price > 0:
+        premiums = np.where(marks > 0, marks / spot_price * 100, 0.0)
+    else:
+        premiums = np.zeros(len(markets))
+    
+    return [
+        make_option_quote(market, spot_price, orderbook, stat, float(premium))
+        for market, orderbook, stat, premium in zip(markets, orderbooks, stats, premiums)
+    ]
+
+
+def make_option_quote(
+    market: dict,
+    spot_price: float,
+    orderbook: Optional[dict],
+    stats: Optional[dict],
+    premium_pct: Optional[float] = None
+) -> Optional[OptionQuote]:
+    """
+    Assemble an option quote from market, orderbook and statistics data.
+    
+    premium_pct may be passed in when already computed for the whole chain.
+    """
     
     instrument_name = market.get("instrument_name", "")
     parsed = market.get("parsed", {})
@@ -349,8 +603,7 @@ def get_option_quote(market: dict, spot_price: float) -> Optional[OptionQuote]:
     # Get mark price from market data
     mark_price = float(market.get("mark_price", 0) or 0)
     
-    # Get orderbook for bid/ask
-    orderbook = get_aevo_orderbook(instrument_name)
+    # Bid/ask from orderbook
     bid_price = None
     ask_price = None
     
@@ -363,8 +616,7 @@ def get_option_quote(market: dict, spot_price: float) -> Optional[OptionQuote]:
         if asks:
             ask_price = float(asks[0][0])  # Best ask
     
-    # Get IV from statistics
-    stats = get_aevo_statistics(instrument_name)
+    # IV from statistics
     iv = None
     delta = None
     
@@ -372,11 +624,16 @@ def get_option_quote(market: dict, spot_price: float) -> Optional[OptionQuote]:
         iv = float(stats.get("iv", 0) or 0)
         delta = float(stats.get("delta", 0) or 0)
     
+    expiry_timestamp = parsed.get("expiry_timestamp")
+    if expiry_timestamp is None:
+        expiry_timestamp = int(datetime.now().timestamp())
+    
     # Calculate premium as % of spot
-    if mark_price > 0 and spot_price > 0:
-        premium_pct = mark_price / spot_price * 100
-    else:
-        premium_pct = 0
+    if premium_pct is None:
+        if mark_price > 0 and spot_price > 0:
+            premium_pct = mark_price / spot_price * 100
+        else:
+            premium_pct = 0
     
     return OptionQuote(
         instrument_name=instrument_name,
@@ -384,7 +641,7 @@ def get_option_quote(market: dict, spot_price: float) -> Optional[OptionQuote]:
         option_type=parsed.get("option_type", ""),
         strike=parsed.get("strike", 0),
         expiry=parsed.get("expiry_str", ""),
-        expiry_timestamp=int(parsed.get("expiry_date", datetime.now()).timestamp()),
+        expiry_timestamp=expiry_timestamp,
         mark_price=mark_price,
         bid_price=bid_price,
         ask_price=ask_price,
@@ -411,32 +668,62 @@ def find_best_put(
     if not chain.puts:
         return None
     
-    target_strike = chain.spot_price * target_strike_pct
+    best = find_best_put_soa(
+        to_option_soa(chain.spot_price, chain.puts),
+        target_strike_pct,
+        target_days
+    )
     
-    # Score options
-    scored = []
-    for put in chain.puts:
-        # Distance from target strike
-        strike_diff = abs(put.strike - target_strike) / chain.spot_price
-        
-        # Distance from target days
-        days_diff = abs(put.days_to_expiry - target_days) / 30
-        
-        # Prefer options with orderbook liquidity
-        liquidity_bonus = 0
-        if put.bid_price and put.ask_price:
-            spread = (put.ask_price - put.bid_price) / put.mark_price if put.mark_price > 0 else 1
-            if spread < 0.1:  # <10% spread
-                liquidity_bonus = 0.2
-        
-        # Lower score = better
-        score = strike_diff + days_diff - liquidity_bonus
-        scored.append((score, put))
+    return chain.puts[best]
+
+
+def to_option_soa(spot_price: float, quotes: List[OptionQuote]) -> OptionChainSoA:
+    """
+    Convert option quotes to column arrays.
+    """
+    return OptionChainSoA(
+        spot_price=spot_price,
+        names=[q.instrument_name for q in quotes],
+        strikes=np.array([q.strike for q in quotes], dtype=float),
+        days=np.array([q.days_to_expiry for q in quotes], dtype=float),
+        marks=np.array([q.mark_price for q in quotes], dtype=float),
+        bids=np.array([q.bid_price or 0.0 for q in quotes], dtype=float),
+        asks=np.array([q.ask_price or 0.0 for q in quotes], dtype=float),
+        ivs=np.array([np.nan if q.iv is None else q.iv for q in quotes], dtype=float)
+    )
+
+
+def find_best_put_soa(
+    puts: OptionChainSoA,
+    target_strike_pct: float = 0.90,  # -10% from spot
+    target_days: int = 14
+) -> Optional[int]:
+    """
+    Find the index of the best PUT in column form.
+    """
+    
+    if not puts.names:
+        return None
     
-    # Sort by score
-    scored.sort(key=lambda x: x[0])
+    spot_price = puts.spot_price
+    target_strike = spot_price * target_strike_pct
     
-    return scored[0][1] if scored else None
+    # Distance from target strike
+    strike_diff = np.abs(puts.strikes - target_strike) / spot_price
+    
+    # Distance from target days
+    days_diff = np.abs(puts.days - target_days) / 30
+    
+    # Prefer options with orderbook liquidity (<10% spread)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spread = np.where(puts.marks > 0, (puts.asks - puts.bids) / puts.marks, 1.0)
+    has_book = (puts.bids != 0) & (puts.asks != 0)
+    liquidity_bonus = np.where(has_book & (spread < 0.1), 0.2, 0.0)
+    
+    # Lower score = better (argmin keeps the first of equal scores)
+    score = strike_diff + days_diff - liquidity_bonus
+    
+    return int(np.argmin(score))
 
 
 def get_hedge_pricing(
@@ -457,7 +744,7 @@ def get_hedge_pricing(
     # Find best matching PUT
     best_put = find_best_put(chain, strike_pct, expiry_days)
     if not best_put:
-        logger.warning(f"No suitable PUT found for {underlying}")
+        logger.warning("No suitable PUT found for %s", underlying)
         return None
     
     # Calculate number of contracts
@@ -471,7 +758,7 @@ def get_hedge_pricing(
     return {
         "underlying": underlying,
         "spot_price": chain.spot_price,
-        "option": asdict(best_put),
+        "option": best_put.to_dict(),
         "contracts": contracts,
         "notional_usd": notional_usd,
         "total_premium_usd": total_premium,
@@ -491,8 +778,8 @@ def load_cache() -> Optional[dict]:
         return None
     
     try:
-        with open(AEVO_CACHE_FILE, 'r') as f:
-            data = json.load(f)
+        with open(AEVO_CACHE_FILE, 'rb') as f:
+            data = _loads(f.read())
         
         # Check TTL
         cached_at = datetime.fromisoformat(data.get("timestamp", "2000-01-01"))
@@ -505,7 +792,7 @@ def load_cache() -> Optional[dict]:
         return data
         
     except Exception as e:
-        logger.warning(f"Cache load error: {e}")
+        logger.warning("Cache load error: %s", e)
         return None
 
 
@@ -521,6 +808,64 @@ def save_cache(data: dict):
     logger.info("Cache saved")
 
 
+# Raw per-instrument responses: {key: (fetched_at, data)}
+_raw_cache: Dict[str, Tuple[float, dict]] = {}
+_raw_cache_loaded = False
+
+
+def get_raw_cached(key: str) -> Optional[dict]:
+    """Get a fresh raw orderbook/statistics response from cache"""
+    if not _raw_cache_loaded:
+        load_raw_cache()
+    
+    entry = _raw_cache.get(key)
+    if entry and time.time() - entry[0] <= RAW_CACHE_TTL_SECONDS:
+        return entry[1]
+    return None
+
+
+def put_raw_cached(key: str, data: dict):
+    """Store a raw orderbook/statistics response (failures are not cached)"""
+    _raw_cache[key] = (time.time(), data)
+
+
+def load_raw_cache():
+    """Rehydrate raw response cache from disk, dropping expired entries"""
+    global _raw_cache_loaded
+    _raw_cache_loaded = True
+    
+    if not os.path.exists(AEVO_RAW_CACHE_FILE):
+        return
+    
+    try:
+        with open(AEVO_RAW_CACHE_FILE, 'rb') as f:
+            data = _loads(f.read())
+        
+        now = time.time()
+        for key, (fetched_at, value) in data.items():
+            if now - fetched_at <= RAW_CACHE_TTL_SECONDS:
+                _raw_cache.setdefault(key, (fetched_at, value))
+        
+    except Exception as e:
+        logger.warning("Raw cache load error: %s", e)
+
+
+def save_raw_cache():
+    """Persist fresh raw responses to disk"""
+    now = time.time()
+    fresh = {
+        key: entry for key, entry in list(_raw_cache.items())
+        if now - entry[0] <= RAW_CACHE_TTL_SECONDS
+    }
+    
+    try:
+        os.makedirs(os.path.dirname(AEVO_RAW_CACHE_FILE), exist_ok=True)
+        with open(AEVO_RAW_CACHE_FILE, 'w') as f:
+            json.dump(fresh, f)
+    except Exception as e:
+        logger.warning("Raw cache save error: %s", e)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # PUBLIC API
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -557,9 +902,10 @@ def get_hedge_quotes(
         
         # Save to cache
         save_cache(result)
+        save_raw_cache()
         
     except Exception as e:
-        logger.error(f"Hedge quotes error: {e}")
+        logger.error("Hedge quotes error: %s", e)
         result["error"] = str(e)
     
     return result
@@ -21,24 +21,32 @@ Trade-offs (documented):
 - No EV calculation
 """
 
+import zlib
+from collections import OrderedDict, deque
 from dataclasses import dataclass
-from enum import Enum
-from typing import List, Optional, Tuple
+from enum import Enum, IntEnum
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
 from datetime import date, datetime, timedelta
 
+import numpy as np
+import pandas as pd
+
 import settings as cfg
+from _njit import njit, prange
 
 
 # ============================================================
 # ENUMS
 # ============================================================
 
-class AllocationAction(Enum):
-    STRONG_BUY = "STRONG_BUY"
-    BUY = "BUY"
-    HOLD = "HOLD"
-    SELL = "SELL"
-    STRONG_SELL = "STRONG_SELL"
+class AllocationAction(IntEnum):
+    """Value = bullishness rank, so actions compare and index as ints."""
+    STRONG_BUY = 4
+    BUY = 3
+    HOLD = 2
+    SELL = 1
+    STRONG_SELL = 0
 
 
 class Stance(Enum):
@@ -47,20 +55,56 @@ class Stance(Enum):
     RISK_OFF = "RISK_OFF"
 
 
+class Regime(IntEnum):
+    """Regime Engine regimes; unknown regime strings map to len(Regime)."""
+    BULL = 0
+    BEAR = 1
+    RANGE = 2
+    TRANSITION = 3
+
+
+class Asset(IntEnum):
+    BTC = 0
+    ETH = 1
+
+
+class TailPolarity(IntEnum):
+    NONE = 0
+    DOWNSIDE = 1
+    UPSIDE = 2
+
+
+# ============================================================
+# INPUT DATACLASS
+# ============================================================
+
+@dataclass(slots=True, frozen=True)
+class RegimeSnapshot:
+    """Allocation inputs taken from a Regime Engine output (see _parse_regime)."""
+    regime: str
+    confidence: float
+    risk_level: float
+    momentum: float
+    vol_z: float
+    returns_30d: float
+    structural_break: bool
+
+
 # ============================================================
 # OUTPUT DATACLASS
 # ============================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AllocationPolicy:
-    """Final allocation policy output."""
+    """Final allocation policy output (immutable, safe to share/cache)."""
     asset: str
     action: AllocationAction
     size_pct: float
     confidence: float
     stance: Stance
     blocked_by: Optional[str]  # CONFIDENCE | CHURN | COOLDOWN | None
-    reasoning: List[str]
+    reasoning: Tuple[str, ...]  # Empty unless explain=True
+    reasons: int = 0            # REASON_* bits behind the decision
 
 
 # ============================================================
@@ -123,98 +167,334 @@ ETH_ALLOWED = {
     Stance.RISK_OFF: [AllocationAction.STRONG_SELL, AllocationAction.SELL],
 }
 
-# Action ranking (for ETH ceiling)
-ACTION_RANK = {
-    AllocationAction.STRONG_BUY: 4,
-    AllocationAction.BUY: 3,
-    AllocationAction.HOLD: 2,
-    AllocationAction.SELL: 1,
-    AllocationAction.STRONG_SELL: 0,
+# Action ranking (for ETH ceiling), indexed by action value
+ACTION_RANK = (
+    0,  # STRONG_SELL
+    1,  # SELL
+    2,  # HOLD
+    3,  # BUY
+    4,  # STRONG_BUY
+)
+
+
+# ============================================================
+# LOOKUP TABLES (derived from the rules above)
+# ============================================================
+
+# Regime name or Regime member → int id
+_REGIME_IDS = {regime.name: int(regime) for regime in Regime}
+_REGIME_IDS.update({regime: int(regime) for regime in Regime})
+_UNKNOWN_REGIME_ID = len(Regime)
+_REGIME_BULL, _REGIME_BEAR, _REGIME_RANGE, _REGIME_TRANSITION = (int(regime) for regime in Regime)
+
+# Stance by [regime_id][risk bucket: < -0.30, mid, > 0.30][confidence > 0.60]
+_ON, _NEUTRAL, _OFF = Stance.RISK_ON, Stance.RISK_NEUTRAL, Stance.RISK_OFF
+_STANCE_LUT = (
+    ((_NEUTRAL, _NEUTRAL), (_NEUTRAL, _NEUTRAL), (_NEUTRAL, _ON)),   # BULL
+    ((_OFF, _OFF), (_NEUTRAL, _NEUTRAL), (_NEUTRAL, _NEUTRAL)),      # BEAR
+    ((_NEUTRAL, _NEUTRAL),) * 3,                                     # RANGE
+    ((_OFF, _OFF), (_NEUTRAL, _NEUTRAL), (_NEUTRAL, _NEUTRAL)),      # TRANSITION
+    ((_NEUTRAL, _NEUTRAL),) * 3,                                     # unknown
+)
+
+# Minimum confidence by action value (HOLD is always allowed)
+_CONF_REQUIRED = (
+    CONF_STRONG_SELL,   # STRONG_SELL
+    CONF_ACTION,        # SELL
+    float("-inf"),      # HOLD
+    CONF_ACTION,        # BUY
+    CONF_STRONG_BUY,    # STRONG_BUY
+)
+
+# Action at each rank (inverse of ACTION_RANK)
+_RANK_TO_ACTION = tuple(sorted(AllocationAction, key=lambda action: ACTION_RANK[action]))
+
+# Position sizes indexed by action value
+_SIZES_BTC = tuple(SIZES_BTC[action] for action in sorted(AllocationAction))
+_SIZES_ETH = tuple(SIZES_ETH[action] for action in sorted(AllocationAction))
+
+# Allowed actions per regime as a bitmask over action values
+_REGIME_MASK = {
+    regime: sum(1 << action for action in actions)
+    for regime, actions in REGIME_ACTIONS.items()
+}
+_HOLD_MASK = 1 << AllocationAction.HOLD
+
+# Allowed ETH actions per stance, same bitmask form
+_ETH_ALLOWED_MASK = {
+    stance: sum(1 << action for action in actions)
+    for stance, actions in ETH_ALLOWED.items()
 }
 
+# Small-int codes for the decision core (no strings/enums inside it)
+_STRONG_SELL, _SELL, _HOLD, _BUY, _STRONG_BUY = (int(action) for action in sorted(AllocationAction))
+_ACTION_IDS = {action.name: int(action) for action in AllocationAction}
+_ACTION_BY_ID = tuple(sorted(AllocationAction))
+_ACTION_NAMES = tuple(action.name for action in _ACTION_BY_ID)
+
+_ASSET_IDS = {asset.name: int(asset) for asset in Asset}
+_ASSET_BTC, _ASSET_ETH = int(Asset.BTC), int(Asset.ETH)
+_ASSET_OTHER = len(Asset)
+
+# Position sizes indexed by [asset id][action value]; other assets size like ETH
+_SIZE_TABLE = (_SIZES_BTC, _SIZES_ETH, _SIZES_ETH)
+
+_POLARITY_IDS = {"downside": int(TailPolarity.DOWNSIDE), "upside": int(TailPolarity.UPSIDE)}  # None → NONE
+_POLARITY_NONE, _POLARITY_DOWNSIDE, _POLARITY_UPSIDE = (int(polarity) for polarity in TailPolarity)
+
+_STANCE_BY_ID = (Stance.RISK_ON, Stance.RISK_NEUTRAL, Stance.RISK_OFF)
+_STANCE_ON, _STANCE_NEUTRAL, _STANCE_OFF = 0, 1, 2
+_STANCE_ID_LUT = np.array(
+    [[[_STANCE_BY_ID.index(stance) for stance in bucket] for bucket in row] for row in _STANCE_LUT],
+    dtype=np.int8
+)
+
+_REGIME_MASK_BY_ID = tuple(_REGIME_MASK.get(regime.name, _HOLD_MASK) for regime in Regime) + (_HOLD_MASK,)
+_ETH_ALLOWED_MASK_BY_ID = tuple(_ETH_ALLOWED_MASK[stance] for stance in _STANCE_BY_ID)
+
+# Settings passed to the decision core (see _decide_action_core)
+_CORE_PARAMS = (
+    float(CONF_NO_ACTION),
+    float(CONF_ACTION),
+    float(CONF_STRONG_SELL),
+    float(CONF_STRONG_BUY),
+    float(MOM_STRONG),
+    float(MOM_WEAK),
+    int(MAX_ACTIONS_30D),
+    int(COOLDOWN_BUY_AFTER_SELL),
+    int(COOLDOWN_SELL_AFTER_BUY),
+    int(COOLDOWN_STRONG_AFTER_STRONG),
+)
+
+
+# ============================================================
+# DECISION CODES
+# ============================================================
+
+# blocked_by codes
+BLOCKED_NONE = 0
+BLOCKED_CONFIDENCE = 1
+BLOCKED_COOLDOWN = 2
+BLOCKED_CHURN = 3
+BLOCKED_BY_NAMES = (None, "CONFIDENCE", "COOLDOWN", "CHURN")
+
+# Market states for the counter-cyclical rules, see _classify_market().
+# Each panic state includes the ones before it.
+MARKET_NORMAL = 0
+MARKET_PANIC = 1            # momentum < -0.85 and vol_z > 2.5
+MARKET_EXTREME_PANIC = 2    # momentum < -0.90 and vol_z > 3.0
+MARKET_CAPITULATION = 3     # extreme panic and returns_30d < -40%
+MARKET_EUPHORIA_RALLY = 4   # momentum > 0.80, confidence > 0.70 and returns_30d > +40%
+
+# Reason bits, in the order their text appears in `reasoning`
+REASON_ACCUMULATE = 1 << 0          # Counter-cyclical: panic + deep drawdown
+REASON_TAKE_PROFIT = 1 << 1         # Counter-cyclical: euphoria + big rally
+REASON_RULE_COOLDOWN = 1 << 2       # Cooldown on a counter-cyclical action
+REASON_TAIL_PANIC = 1 << 3          # Downside tail risk, but panic: HOLD
+REASON_TAIL_EXIT = 1 << 4           # Downside tail risk: emergency exit
+REASON_TAIL_UPSIDE = 1 << 5         # Upside tail risk: take profit
+REASON_LOW_CONFIDENCE = 1 << 6      # Below CONF_NO_ACTION
+REASON_ETH_EXIT = 1 << 7            # ETH must exit in RISK_OFF
+REASON_BULL_STRONG_BUY = 1 << 8
+REASON_BULL_BUY = 1 << 9
+REASON_BULL_HOLD = 1 << 10
+REASON_BEAR_PANIC = 1 << 11
+REASON_BEAR_STRONG_SELL = 1 << 12
+REASON_BEAR_SELL = 1 << 13
+REASON_BEAR_HOLD = 1 << 14
+REASON_TRANSITION_SELL = 1 << 15
+REASON_TRANSITION_HOLD = 1 << 16
+REASON_RANGE_ACCUMULATE = 1 << 17
+REASON_RANGE_HOLD = 1 << 18
+REASON_REGIME_GATE = 1 << 19
+REASON_CONFIDENCE_GATE = 1 << 20
+REASON_ETH_STANCE = 1 << 21
+REASON_ETH_CEILING = 1 << 22
+REASON_ETH_NO_STRONG_BUY = 1 << 23
+REASON_COOLDOWN = 1 << 24
+REASON_CHURN = 1 << 25
+
+# Text per reason bit; formatted with the context from compute_allocation
+_REASON_TEXT = dict((
+    (REASON_ACCUMULATE, (
+        "COUNTER-CYCLICAL: Panic + deep drawdown = accumulation",
+        "Momentum: %(momentum).2f, Vol_z: %(vol_z).2f, Returns_30d: %(returns_30d_pct).1f%%",
+    )),
+    (REASON_TAKE_PROFIT, (
+        "COUNTER-CYCLICAL: Euphoria + big rally = take profit",
+        "Momentum: %(momentum).2f, Confidence: %(confidence).2f, Returns_30d: %(returns_30d_pct).1f%%",
+    )),
+    (REASON_RULE_COOLDOWN, ("Cooldown active: %(days_remaining)sd remaining",)),
+    (REASON_TAIL_PANIC, (
+        "TAIL RISK detected, but PANIC conditions active",
+        "COUNTER-CYCLICAL: Not selling into panic",
+        "Momentum: %(momentum).2f, Vol_z: %(vol_z).2f",
+    )),
+    (REASON_TAIL_EXIT, ("TAIL RISK: Emergency exit", "Regime: %(regime)s, bypassing all gates")),
+    (REASON_TAIL_UPSIDE, ("TAIL RISK (upside): Take profit on euphoria",)),
+    (REASON_LOW_CONFIDENCE, (
+        "Confidence %(confidence).2f < " + str(CONF_NO_ACTION),
+        "No action allowed below confidence gate",
+    )),
+    (REASON_ETH_EXIT, ("ETH exception: must exit in RISK_OFF",)),
+    (REASON_BULL_STRONG_BUY, ("BULL: conf %(confidence).2f ≥ " + str(CONF_STRONG_BUY) + ", mom %(momentum).2f",)),
+    (REASON_BULL_BUY, ("BULL: conf %(confidence).2f ≥ " + str(CONF_ACTION),)),
+    (REASON_BULL_HOLD, ("BULL: HOLD (trend-following)",)),
+    (REASON_BEAR_PANIC, (
+        "BEAR: Extreme panic (mom=%(momentum).2f, vol_z=%(vol_z).2f)",
+        "COUNTER-CYCLICAL: Not selling into capitulation",
+    )),
+    (REASON_BEAR_STRONG_SELL, ("BEAR confirmed: conf %(confidence).2f, mom %(momentum).2f, ret30d %(returns_30d_pct).1f%%",)),
+    (REASON_BEAR_SELL, ("BEAR: conf %(confidence).2f, mom %(momentum).2f, ret30d %(returns_30d_pct).1f%%",)),
+    (REASON_BEAR_HOLD, ("BEAR: HOLD (waiting for confirmation)",)),
+    (REASON_TRANSITION_SELL, ("TRANSITION: high risk %(risk_level).2f, selling",)),
+    (REASON_TRANSITION_HOLD, ("TRANSITION: HOLD (uncertainty = no action)",)),
+    (REASON_RANGE_ACCUMULATE, ("RANGE + extreme panic: Accumulation",)),
+    (REASON_RANGE_HOLD, ("RANGE: HOLD (no trend)",)),
+    # The gates reset the action before logging it, hence the fixed HOLD
+    (REASON_REGIME_GATE, ("Regime gate: HOLD not allowed in %(regime)s",)),
+    (REASON_CONFIDENCE_GATE, ("Confidence gate: HOLD requires higher confidence",)),
+    (REASON_ETH_STANCE, ("ETH stance rule: %(eth_from)s → %(eth_to)s",)),
+    (REASON_ETH_CEILING, ("ETH ceiling: cannot exceed BTC (%(btc_action)s)",)),
+    (REASON_ETH_NO_STRONG_BUY, ("ETH: STRONG_BUY not allowed, downgraded to BUY",)),
+    (REASON_COOLDOWN, ("Cooldown: %(days_remaining)sd remaining before %(proposed)s",)),
+    (REASON_CHURN, ("Churn protection: %(actions_count)s/" + str(MAX_ACTIONS_30D) + " actions in 30d",)),
+))
+
 
 # ============================================================
 # HELPER FUNCTIONS
 # ============================================================
 
-def determine_stance(regime: str, confidence: float, risk_level: float) -> Stance:
+def determine_stance(regime: Union[str, Regime], confidence: float, risk_level: float) -> Stance:
     """
     Determine market stance.
     """
-    if regime == "BULL" and confidence > 0.60 and risk_level > 0.30:
-        return Stance.RISK_ON
-    elif regime == "BEAR" and risk_level < -0.30:
-        return Stance.RISK_OFF
-    elif regime == "TRANSITION" and risk_level < -0.30:
-        return Stance.RISK_OFF
-    elif regime == "RANGE":
-        return Stance.RISK_NEUTRAL
+    if risk_level < -0.30:
+        risk_bucket = 0
+    elif risk_level > 0.30:
+        risk_bucket = 2
     else:
-        return Stance.RISK_NEUTRAL
+        risk_bucket = 1
+    regime_id = _REGIME_IDS.get(regime, _UNKNOWN_REGIME_ID)
+    return _STANCE_LUT[regime_id][risk_bucket][1 if confidence > 0.60 else 0]
 
 
 def confidence_allows(confidence: float, action: AllocationAction) -> bool:
     """
     Check if confidence allows this action.
     """
-    if action == AllocationAction.HOLD:
-        return True
-    if action in [AllocationAction.BUY, AllocationAction.SELL]:
-        return confidence >= CONF_ACTION
-    if action == AllocationAction.STRONG_SELL:
-        return confidence >= CONF_STRONG_SELL
-    if action == AllocationAction.STRONG_BUY:
-        return confidence >= CONF_STRONG_BUY
-    return False
+    return confidence >= _CONF_REQUIRED[action]
 
 
-def regime_allows(regime: str, action: AllocationAction) -> bool:
+def regime_allows(regime: Union[str, Regime], action: AllocationAction) -> bool:
     """
     Check if regime allows this action.
     """
-    allowed = REGIME_ACTIONS.get(regime, [AllocationAction.HOLD])
-    return action in allowed
+    return bool((_REGIME_MASK_BY_ID[_REGIME_IDS.get(regime, _UNKNOWN_REGIME_ID)] >> action) & 1)
 
 
 def is_cooldown_active(
     last_action: Optional[str],
-    last_action_date: Optional[date],
+    last_action_date: Optional[Union[date, int]],
     proposed_action: AllocationAction,
-    today: date
+    today: Union[date, int]
 ) -> Tuple[bool, int]:
     """
     Check if cooldown prevents this action.
     Returns (is_active, days_remaining).
+    
+    Dates may also be given as ordinals (date.toordinal()), which loops
+    over many days can compute once.
     """
     if last_action is None or last_action_date is None:
         return False, 0
     
-    days_since = (today - last_action_date).days
+    if not isinstance(today, int):
+        today = today.toordinal()
+    if not isinstance(last_action_date, int):
+        last_action_date = last_action_date.toordinal()
     
-    # BUY after SELL
-    if last_action in ["SELL", "STRONG_SELL"]:
-        if proposed_action in [AllocationAction.BUY, AllocationAction.STRONG_BUY]:
-            if days_since < COOLDOWN_BUY_AFTER_SELL:
-                return True, COOLDOWN_BUY_AFTER_SELL - days_since
+    days_remaining = _cooldown_left(
+        _ACTION_IDS.get(last_action, -1), today - last_action_date, int(proposed_action), _CORE_PARAMS
+    )
+    return days_remaining > 0, days_remaining
+
+
+class ActionHistory:
+    """
+    Rolling 30-day action window for day-by-day backtests.
     
-    # SELL after BUY
-    if last_action in ["BUY", "STRONG_BUY"]:
-        if proposed_action in [AllocationAction.SELL, AllocationAction.STRONG_SELL]:
-            if days_since < COOLDOWN_SELL_AFTER_BUY:
-                return True, COOLDOWN_SELL_AFTER_BUY - days_since
+    Entries must be pushed in date order and queried with non-decreasing
+    `today`; old entries are evicted as the window slides, so counting is
+    amortized O(1) instead of rescanning the whole history.
+    """
     
-    # STRONG after STRONG
-    if "STRONG" in last_action and "STRONG" in proposed_action.value:
-        if days_since < COOLDOWN_STRONG_AFTER_STRONG:
-            return True, COOLDOWN_STRONG_AFTER_STRONG - days_since
+    def __init__(self, window_days: int = 30):
+        self._window = timedelta(days=window_days)
+        self._entries = deque()
+        self._non_hold_count = 0
     
-    return False, 0
+    def push(self, action: str, action_date: date):
+        self._entries.append((action, action_date))
+        if action != "HOLD":
+            self._non_hold_count += 1
+    
+    def count(self, today: date) -> int:
+        """Non-HOLD actions in the window ending at `today`."""
+        cutoff = today - self._window
+        entries = self._entries
+        while entries and entries[0][1] < cutoff:
+            action, _ = entries.popleft()
+            if action != "HOLD":
+                self._non_hold_count -= 1
+        return self._non_hold_count
+    
+    def __iter__(self):
+        return iter(self._entries)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
-def count_actions_30d(action_history: List[Tuple[str, date]], today: date) -> int:
+@dataclass(slots=True, frozen=True)
+class HistoryArrays:
+    """
+    Action history as parallel arrays, for long histories.
+    
+    ts_ns: int64 action dates (datetime64[ns] as integers)
+    action: int8 AllocationAction values (-1 for unknown names)
+    """
+    ts_ns: np.ndarray
+    action: np.ndarray
+    
+    @classmethod
+    def from_pairs(cls, action_history: List[Tuple[str, date]]) -> "HistoryArrays":
+        """Convert the legacy list of (action, date) tuples."""
+        return cls(
+            ts_ns=np.array([np.datetime64(d, "D") for _, d in action_history], dtype="datetime64[ns]").view(np.int64),
+            action=np.array([_ACTION_IDS.get(a, -1) for a, _ in action_history], dtype=np.int8),
+        )
+    
+    def count(self, today: date, window_days: int = 30) -> int:
+        """Non-HOLD actions dated on or after `today - window_days`."""
+        cutoff = (np.datetime64(today, "D") - np.timedelta64(window_days, "D")).astype("datetime64[ns]").view(np.int64)
+        return int(np.count_nonzero((self.ts_ns >= cutoff) & (self.action != _HOLD)))
+    
+    def __len__(self) -> int:
+        return len(self.action)
+
+
+def count_actions_30d(
+    action_history: Union[List[Tuple[str, date]], ActionHistory, HistoryArrays],
+    today: date
+) -> int:
     """
     Count non-HOLD actions in last 30 days.
     """
+    if isinstance(action_history, (ActionHistory, HistoryArrays)):
+        return action_history.count(today)
+    
     cutoff = today - timedelta(days=30)
     count = 0
     for action, action_date in action_history:
@@ -223,7 +503,10 @@ def count_actions_30d(action_history: List[Tuple[str, date]], today: date) -> in
     return count
 
 
-def is_churn(action_history: List[Tuple[str, date]], today: date) -> bool:
+def is_churn(
+    action_history: Union[List[Tuple[str, date]], ActionHistory, HistoryArrays],
+    today: date
+) -> bool:
     """
     Detect overtrading.
     """
@@ -237,26 +520,21 @@ def apply_eth_ceiling(btc_action: AllocationAction, eth_action: AllocationAction
     btc_rank = ACTION_RANK[btc_action]
     eth_rank = ACTION_RANK[eth_action]
     
-    if eth_rank > btc_rank:
-        # Find action at BTC level
-        for action, rank in ACTION_RANK.items():
-            if rank == btc_rank:
-                return action
-    
-    return eth_action
+    # Cap at the action of BTC's rank
+    return _RANK_TO_ACTION[btc_rank] if eth_rank > btc_rank else eth_action
 
 
 def apply_eth_stance_rules(action: AllocationAction, stance: Stance) -> AllocationAction:
     """
     Apply ETH-specific stance rules.
     """
-    allowed = ETH_ALLOWED.get(stance, [AllocationAction.HOLD])
+    allowed = _ETH_ALLOWED_MASK.get(stance, _HOLD_MASK)
     
-    if action not in allowed:
+    if not (allowed >> action) & 1:
         # Downgrade logic
         if action == AllocationAction.STRONG_BUY:
             # STRONG_BUY → BUY (if BUY allowed) → HOLD
-            if AllocationAction.BUY in allowed:
+            if (allowed >> AllocationAction.BUY) & 1:
                 return AllocationAction.BUY
             return AllocationAction.HOLD
         elif stance == Stance.RISK_NEUTRAL:
@@ -271,345 +549,674 @@ def get_size(asset: str, action: AllocationAction) -> float:
     """
     Get position size for action.
     """
-    if asset == "BTC":
-        return SIZES_BTC.get(action, 0.0)
-    else:
-        return SIZES_ETH.get(action, 0.0)
+    return _SIZE_TABLE[_ASSET_IDS.get(asset, _ASSET_OTHER)][action]
+
+
+def _classify_market(momentum: float, vol_z: float, returns_30d: float, confidence: float) -> int:
+    """
+    MARKET_* state for the counter-cyclical rules.
+    
+    Depends only on market inputs, so compute_btc_eth_allocation()
+    evaluates it once for both assets.
+    """
+    # Detect euphoria conditions (proxy for RSI > 75)
+    if momentum > 0.80:
+        # Rally threshold raised from 0.30 for less false positives
+        if confidence > 0.70 and returns_30d > 0.40:
+            return MARKET_EUPHORIA_RALLY
+        return MARKET_NORMAL
+    
+    # Panic detection - ТОЛЬКО экстремальные случаи
+    # Не блокируем обычные коррекции!
+    if momentum < -0.85 and vol_z > 2.5:  # Очень жёсткий порог
+        if momentum < -0.90 and vol_z > 3.0:
+            # Только -40%+
+            return MARKET_CAPITULATION if returns_30d < -0.40 else MARKET_EXTREME_PANIC
+        return MARKET_PANIC
+    
+    return MARKET_NORMAL
+
+
+def _classify_market_vec(
+    momentum: np.ndarray,
+    vol_z: np.ndarray,
+    returns_30d: np.ndarray,
+    confidence: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized _classify_market(); int8 MARKET_* states.
+    """
+    panic = (momentum < -0.85) & (vol_z > 2.5)
+    extreme_panic = panic & (momentum < -0.90) & (vol_z > 3.0)
+    return np.select(
+        [
+            (momentum > 0.80) & (confidence > 0.70) & (returns_30d > 0.40),
+            extreme_panic & (returns_30d < -0.40),
+            extreme_panic,
+            panic,
+        ],
+        [MARKET_EUPHORIA_RALLY, MARKET_CAPITULATION, MARKET_EXTREME_PANIC, MARKET_PANIC],
+        default=MARKET_NORMAL
+    ).astype(np.int8)
 
 
 # ============================================================
-# MAIN COMPUTATION
+# DECISION CORE (ints/floats only, compiled with numba if available)
 # ============================================================
 
-def compute_allocation(
-    regime: str,
-    confidence: float,
-    risk_level: float,
-    momentum: float,
-    tail_risk: bool,
-    tail_polarity: Optional[str],
-    asset: str,
-    btc_action: Optional[AllocationAction] = None,
-    last_action: Optional[str] = None,
-    last_action_date: Optional[date] = None,
-    action_history: Optional[List[Tuple[str, date]]] = None,
-    today: Optional[date] = None,
-    # v1.4 Counter-cyclical parameters
-    vol_z: float = 0.0,
-    returns_30d: float = 0.0,
-) -> AllocationPolicy:
+@njit(cache=True)
+def _cooldown_remaining(last_action_id, days_since, proposed, params):
     """
-    Compute asset allocation policy.
+    Days of cooldown left before `proposed` (0 = no cooldown).
+    last_action_id < 0 means no previous action.
+    """
+    if last_action_id < 0:
+        return 0
     
-    v1.4: Added counter-cyclical logic:
-    - Don't sell in panic (momentum < -0.7 + high vol)
-    - Accumulate on fear (extreme negative momentum + drawdown)
-    - Take profit on greed (extreme positive momentum + rally)
+    cooldown_buy_after_sell, cooldown_sell_after_buy, cooldown_strong = params[7], params[8], params[9]
     
-    Args:
-        regime: BULL | BEAR | RANGE | TRANSITION
-        confidence: Model confidence [0, 1]
-        risk_level: Directional risk [-1, +1]
-        momentum: Momentum score [-1, +1]
-        tail_risk: Whether tail risk is active
-        tail_polarity: "downside" | "upside" | None
-        asset: "BTC" | "ETH"
-        btc_action: BTC action (required for ETH)
-        last_action: Last action taken
-        last_action_date: Date of last action
-        action_history: List of (action, date) tuples
-        today: Current date (defaults to today)
-        vol_z: Volatility z-score (for panic detection)
-        returns_30d: 30-day returns (for drawdown/rally detection)
+    # BUY after SELL
+    if last_action_id == _SELL or last_action_id == _STRONG_SELL:
+        if proposed == _BUY or proposed == _STRONG_BUY:
+            if days_since < cooldown_buy_after_sell:
+                return cooldown_buy_after_sell - days_since
     
-    Returns:
-        AllocationPolicy with action and reasoning
+    # SELL after BUY
+    if last_action_id == _BUY or last_action_id == _STRONG_BUY:
+        if proposed == _SELL or proposed == _STRONG_SELL:
+            if days_since < cooldown_sell_after_buy:
+                return cooldown_sell_after_buy - days_since
+    
+    # STRONG after STRONG
+    if last_action_id == _STRONG_BUY or last_action_id == _STRONG_SELL:
+        if proposed == _STRONG_BUY or proposed == _STRONG_SELL:
+            if days_since < cooldown_strong:
+                return cooldown_strong - days_since
+    
+    return 0
+
+
+@njit(cache=True)
+def _decide_action_core(
+    regime_id,
+    confidence,
+    risk_level,
+    momentum,
+    returns_30d,
+    market_state,
+    tail_risk,
+    polarity_id,
+    asset_id,
+    btc_action,
+    last_action_id,
+    days_since,
+    actions_30d,
+    params,
+):
     """
-    if today is None:
-        today = date.today()
+    Decision ladder of compute_allocation() on small-int codes.
     
-    if action_history is None:
-        action_history = []
+    market_state is the MARKET_* state from _classify_market().
+    btc_action / last_action_id are -1 when absent. Thresholds come in
+    `params` (see _CORE_PARAMS) rather than from module globals, so a
+    cached or AOT-compiled core never goes stale when settings change.
+    
+    Returns (action, blocked_by, reasons, proposed, eth_from, eth_to):
+        action: final action value
+        blocked_by: BLOCKED_* code
+        reasons: REASON_* bits
+        proposed: action before the cooldown/churn checks
+        eth_from, eth_to: action before/after the ETH stance rule
+    """
+    (conf_no_action, conf_action, conf_strong_sell, conf_strong_buy,
+     mom_strong, mom_weak, max_actions_30d) = params[:7]
     
-    reasoning = []
-    blocked_by = None
+    is_btc = asset_id == _ASSET_BTC
     
-    # Determine stance
-    stance = determine_stance(regime, confidence, risk_level)
+    if risk_level < -0.30:
+        risk_bucket = 0
+    elif risk_level > 0.30:
+        risk_bucket = 2
+    else:
+        risk_bucket = 1
+    stance_id = _STANCE_ID_LUT[regime_id, risk_bucket, 1 if confidence > 0.60 else 0]
     
     # ══════════════════════════════════════════════════════════════
     # v1.6 TREND-FOLLOWING: минимальная блокировка продаж
     # ══════════════════════════════════════════════════════════════
     
-    # Panic detection - ТОЛЬКО экстремальные случаи
-    # Не блокируем обычные коррекции!
-    is_panic = momentum < -0.85 and vol_z > 2.5  # Очень жёсткий порог
-    is_extreme_panic = momentum < -0.90 and vol_z > 3.0
-    is_deep_drawdown = returns_30d < -0.40  # Только -40%+
-    
-    # Detect euphoria conditions (proxy for RSI > 75)
-    is_euphoria = momentum > 0.70 and confidence > 0.60
-    is_extreme_euphoria = momentum > 0.80 and confidence > 0.70
-    is_big_rally = returns_30d > 0.40  # Raised from 0.30 for less false positives
+    # Panic / euphoria come pre-classified in market_state
+    is_extreme_panic = MARKET_EXTREME_PANIC <= market_state <= MARKET_CAPITULATION
     
     # COUNTER-CYCLICAL RULE 1: Don't sell in panic
     # If we're in panic, block SELL/STRONG_SELL (will be applied later)
-    panic_block_sell = is_panic or is_extreme_panic
+    panic_block_sell = MARKET_PANIC <= market_state <= MARKET_CAPITULATION
     
     # COUNTER-CYCLICAL RULE 2: Accumulate on fear
     # Extreme panic + deep drawdown = buying opportunity
-    if is_extreme_panic and is_deep_drawdown and asset == "BTC":
-        action = AllocationAction.BUY
-        reasoning.append("COUNTER-CYCLICAL: Panic + deep drawdown = accumulation")
-        reasoning.append(f"Momentum: {momentum:.2f}, Vol_z: {vol_z:.2f}, Returns_30d: {returns_30d:.1%}")
-        
-        # Still apply cooldown check
-        cooldown_active, days_remaining = is_cooldown_active(
-            last_action, last_action_date, action, today
-        )
-        if cooldown_active:
-            action = AllocationAction.HOLD
-            reasoning.append(f"Cooldown active: {days_remaining}d remaining")
-            blocked_by = "COOLDOWN"
-        
-        return AllocationPolicy(
-            asset=asset,
-            action=action,
-            size_pct=get_size(asset, action),
-            confidence=confidence,
-            stance=stance,
-            blocked_by=blocked_by,
-            reasoning=reasoning
-        )
-    
     # COUNTER-CYCLICAL RULE 3: Take profit on greed
     # Extreme euphoria + big rally = reduce exposure
-    if is_extreme_euphoria and is_big_rally and asset == "BTC":
-        action = AllocationAction.SELL
-        reasoning.append("COUNTER-CYCLICAL: Euphoria + big rally = take profit")
-        reasoning.append(f"Momentum: {momentum:.2f}, Confidence: {confidence:.2f}, Returns_30d: {returns_30d:.1%}")
-        
+    rule = 0
+    if market_state == MARKET_CAPITULATION and is_btc:
+        action = _BUY
+        rule = REASON_ACCUMULATE
+    elif market_state == MARKET_EUPHORIA_RALLY and is_btc:
+        action = _SELL
+        rule = REASON_TAKE_PROFIT
+    if rule:
         # Still apply cooldown check
-        cooldown_active, days_remaining = is_cooldown_active(
-            last_action, last_action_date, action, today
-        )
-        if cooldown_active:
-            action = AllocationAction.HOLD
-            reasoning.append(f"Cooldown active: {days_remaining}d remaining")
-            blocked_by = "COOLDOWN"
-        
-        return AllocationPolicy(
-            asset=asset,
-            action=action,
-            size_pct=get_size(asset, action),
-            confidence=confidence,
-            stance=stance,
-            blocked_by=blocked_by,
-            reasoning=reasoning
-        )
+        if _cooldown_remaining(last_action_id, days_since, action, params) > 0:
+            return _HOLD, BLOCKED_COOLDOWN, rule | REASON_RULE_COOLDOWN, action, 0, 0
+        return action, BLOCKED_NONE, rule, action, 0, 0
     
     # ── Step 1: Tail risk override (highest priority) ──
     # v1.4 MODIFICATION: Don't trigger STRONG_SELL in panic conditions
-    if tail_risk and tail_polarity == "downside":
+    if tail_risk and polarity_id == _POLARITY_DOWNSIDE:
         if panic_block_sell:
             # In panic: downgrade to HOLD, don't sell the bottom
-            action = AllocationAction.HOLD
-            reasoning.append("TAIL RISK detected, but PANIC conditions active")
-            reasoning.append("COUNTER-CYCLICAL: Not selling into panic")
-            reasoning.append(f"Momentum: {momentum:.2f}, Vol_z: {vol_z:.2f}")
-            
-            return AllocationPolicy(
-                asset=asset,
-                action=action,
-                size_pct=get_size(asset, action),
-                confidence=confidence,
-                stance=stance,
-                blocked_by=None,
-                reasoning=reasoning
-            )
-        else:
-            # Normal tail risk response (not in panic)
-            action = AllocationAction.STRONG_SELL
-            reasoning.append("TAIL RISK: Emergency exit")
-            reasoning.append(f"Regime: {regime}, bypassing all gates")
-            
-            return AllocationPolicy(
-                asset=asset,
-                action=action,
-                size_pct=get_size(asset, action),
-                confidence=confidence,
-                stance=stance,
-                blocked_by=None,
-                reasoning=reasoning
-            )
+            return _HOLD, BLOCKED_NONE, REASON_TAIL_PANIC, _HOLD, 0, 0
+        # Normal tail risk response (not in panic)
+        return _STRONG_SELL, BLOCKED_NONE, REASON_TAIL_EXIT, _STRONG_SELL, 0, 0
     
     # Upside tail risk: take profit
-    if tail_risk and tail_polarity == "upside":
-        action = AllocationAction.SELL
-        reasoning.append("TAIL RISK (upside): Take profit on euphoria")
-        
-        return AllocationPolicy(
-            asset=asset,
-            action=action,
-            size_pct=get_size(asset, action),
-            confidence=confidence,
-            stance=stance,
-            blocked_by=None,
-            reasoning=reasoning
-        )
+    if tail_risk and polarity_id == _POLARITY_UPSIDE:
+        return _SELL, BLOCKED_NONE, REASON_TAIL_UPSIDE, _SELL, 0, 0
     
     # ── Step 2: Confidence gate ──
-    if confidence < CONF_NO_ACTION:
-        action = AllocationAction.HOLD
-        reasoning.append(f"Confidence {confidence:.2f} < {CONF_NO_ACTION}")
-        reasoning.append("No action allowed below confidence gate")
-        blocked_by = "CONFIDENCE"
-        
+    if confidence < conf_no_action:
         # Exception: ETH in RISK_OFF must still exit
-        if asset == "ETH" and stance == Stance.RISK_OFF:
-            action = AllocationAction.SELL
-            reasoning.append("ETH exception: must exit in RISK_OFF")
-            blocked_by = None
-        
-        return AllocationPolicy(
-            asset=asset,
-            action=action,
-            size_pct=get_size(asset, action),
-            confidence=confidence,
-            stance=stance,
-            blocked_by=blocked_by,
-            reasoning=reasoning
-        )
+        if asset_id == _ASSET_ETH and stance_id == _STANCE_OFF:
+            return _SELL, BLOCKED_NONE, REASON_LOW_CONFIDENCE | REASON_ETH_EXIT, _SELL, 0, 0
+        return _HOLD, BLOCKED_CONFIDENCE, REASON_LOW_CONFIDENCE, _HOLD, 0, 0
     
     # ── Step 3: Compute raw action based on regime ──
-    if regime == "BULL":
+    # Compiled, these branches cost nothing next to the call itself, so the
+    # core is not specialized per (regime, asset).
+    if regime_id == _REGIME_BULL:
         # v1.6 TREND-FOLLOWING: В бычке ПОКУПАЕМ, не боимся euphoria!
         # Euphoria в бычке = продолжение тренда, не время продавать
-        if confidence >= CONF_STRONG_BUY and momentum > MOM_WEAK:
-            raw_action = AllocationAction.STRONG_BUY
-            reasoning.append(f"BULL: conf {confidence:.2f} ≥ {CONF_STRONG_BUY}, mom {momentum:.2f}")
-        elif confidence >= CONF_ACTION and momentum > -0.2:  # Покупаем даже при слабом моментуме
-            raw_action = AllocationAction.BUY
-            reasoning.append(f"BULL: conf {confidence:.2f} ≥ {CONF_ACTION}")
+        if confidence >= conf_strong_buy and momentum > mom_weak:
+            action, reasons = _STRONG_BUY, REASON_BULL_STRONG_BUY
+        elif confidence >= conf_action and momentum > -0.2:  # Покупаем даже при слабом моментуме
+            action, reasons = _BUY, REASON_BULL_BUY
         else:
-            raw_action = AllocationAction.HOLD
-            reasoning.append(f"BULL: HOLD (trend-following)")
+            action, reasons = _HOLD, REASON_BULL_HOLD
     
-    elif regime == "BEAR":
+    elif regime_id == _REGIME_BEAR:
         # v1.6 TREND-FOLLOWING: Продаём только при СИЛЬНОМ подтверждении
         # Не продаём на каждой коррекции!
         if panic_block_sell:
-            raw_action = AllocationAction.HOLD
-            reasoning.append(f"BEAR: Extreme panic (mom={momentum:.2f}, vol_z={vol_z:.2f})")
-            reasoning.append("COUNTER-CYCLICAL: Not selling into capitulation")
-        elif confidence >= CONF_STRONG_SELL and momentum < -MOM_STRONG and returns_30d < -0.15:
+            action, reasons = _HOLD, REASON_BEAR_PANIC
+        elif confidence >= conf_strong_sell and momentum < -mom_strong and returns_30d < -0.15:
             # Требуем: высокая уверенность + сильный негативный моментум + уже есть просадка
-            raw_action = AllocationAction.STRONG_SELL
-            reasoning.append(f"BEAR confirmed: conf {confidence:.2f}, mom {momentum:.2f}, ret30d {returns_30d:.1%}")
+            action, reasons = _STRONG_SELL, REASON_BEAR_STRONG_SELL
         elif confidence >= 0.50 and momentum < -0.40 and returns_30d < -0.10:
             # Обычный SELL только при подтверждённом даунтренде
-            raw_action = AllocationAction.SELL
-            reasoning.append(f"BEAR: conf {confidence:.2f}, mom {momentum:.2f}, ret30d {returns_30d:.1%}")
+            action, reasons = _SELL, REASON_BEAR_SELL
         else:
-            raw_action = AllocationAction.HOLD
-            reasoning.append(f"BEAR: HOLD (waiting for confirmation)")
+            action, reasons = _HOLD, REASON_BEAR_HOLD
     
-    elif regime == "TRANSITION":
+    elif regime_id == _REGIME_TRANSITION:
         # v1.6: TRANSITION = неопределённость, лучше HOLD
         # Продаём только при очень сильном риске
         if risk_level < -0.7 and confidence >= 0.50 and momentum < -0.3:
-            raw_action = AllocationAction.SELL
-            reasoning.append(f"TRANSITION: high risk {risk_level:.2f}, selling")
+            action, reasons = _SELL, REASON_TRANSITION_SELL
         else:
-            raw_action = AllocationAction.HOLD
-            reasoning.append("TRANSITION: HOLD (uncertainty = no action)")
+            action, reasons = _HOLD, REASON_TRANSITION_HOLD
     
     else:  # RANGE
         # v1.6: В боковике больше HOLD, меньше торговли
-        if is_extreme_panic and asset == "BTC":
-            raw_action = AllocationAction.BUY
-            reasoning.append("RANGE + extreme panic: Accumulation")
+        if is_extreme_panic and is_btc:
+            action, reasons = _BUY, REASON_RANGE_ACCUMULATE
         else:
-            raw_action = AllocationAction.HOLD
-            reasoning.append("RANGE: HOLD (no trend)")
+            action, reasons = _HOLD, REASON_RANGE_HOLD
     
     # ── Step 4: Regime gate ──
-    if not regime_allows(regime, raw_action):
-        raw_action = AllocationAction.HOLD
-        reasoning.append(f"Regime gate: {raw_action.value} not allowed in {regime}")
+    if not (_REGIME_MASK_BY_ID[regime_id] >> action) & 1:
+        action = _HOLD
+        reasons |= REASON_REGIME_GATE
     
     # ── Step 5: Confidence gate (double check) ──
-    if not confidence_allows(confidence, raw_action):
-        raw_action = AllocationAction.HOLD
-        reasoning.append(f"Confidence gate: {raw_action.value} requires higher confidence")
+    if action == _STRONG_SELL:
+        required = conf_strong_sell
+    elif action == _STRONG_BUY:
+        required = conf_strong_buy
+    elif action == _HOLD:
+        required = -np.inf
+    else:
+        required = conf_action
+    if not confidence >= required:
+        action = _HOLD
+        reasons |= REASON_CONFIDENCE_GATE
     
     # ── Step 6: ETH adjustments ──
-    if asset == "ETH":
-        original = raw_action
-        
+    eth_from = eth_to = action
+    if asset_id == _ASSET_ETH:
         # ETH stance rules
-        raw_action = apply_eth_stance_rules(raw_action, stance)
-        if raw_action != original:
-            reasoning.append(f"ETH stance rule: {original.value} → {raw_action.value}")
+        allowed = _ETH_ALLOWED_MASK_BY_ID[stance_id]
+        if not (allowed >> action) & 1:
+            # Downgrade logic
+            if action == _STRONG_BUY:
+                # STRONG_BUY → BUY (if BUY allowed) → HOLD
+                action = _BUY if (allowed >> _BUY) & 1 else _HOLD
+            elif stance_id == _STANCE_NEUTRAL:
+                action = _HOLD
+            elif stance_id == _STANCE_OFF:
+                action = _SELL
+        eth_to = action
+        if eth_to != eth_from:
+            reasons |= REASON_ETH_STANCE
         
         # ETH ceiling (cannot exceed BTC)
-        if btc_action is not None:
-            original = raw_action
-            raw_action = apply_eth_ceiling(btc_action, raw_action)
-            if raw_action != original:
-                reasoning.append(f"ETH ceiling: cannot exceed BTC ({btc_action.value})")
+        if btc_action >= 0 and action > btc_action:
+            action = btc_action
+            reasons |= REASON_ETH_CEILING
         
         # ETH STRONG_BUY never allowed
-        if raw_action == AllocationAction.STRONG_BUY:
-            raw_action = AllocationAction.BUY
-            reasoning.append("ETH: STRONG_BUY not allowed, downgraded to BUY")
+        if action == _STRONG_BUY:
+            action = _BUY
+            reasons |= REASON_ETH_NO_STRONG_BUY
     
     # ── Step 7: Cooldown check ──
-    cooldown_active, days_remaining = is_cooldown_active(
-        last_action, last_action_date, raw_action, today
-    )
-    if cooldown_active:
-        reasoning.append(f"Cooldown: {days_remaining}d remaining before {raw_action.value}")
-        raw_action = AllocationAction.HOLD
-        blocked_by = "COOLDOWN"
-        
-        return AllocationPolicy(
-            asset=asset,
-            action=raw_action,
-            size_pct=get_size(asset, raw_action),
-            confidence=confidence,
-            stance=stance,
-            blocked_by=blocked_by,
-            reasoning=reasoning
-        )
+    if _cooldown_remaining(last_action_id, days_since, action, params) > 0:
+        return _HOLD, BLOCKED_COOLDOWN, reasons | REASON_COOLDOWN, action, eth_from, eth_to
     
     # ── Step 8: Churn protection ──
-    if is_churn(action_history, today) and raw_action != AllocationAction.STRONG_SELL:
-        actions_count = count_actions_30d(action_history, today)
-        reasoning.append(f"Churn protection: {actions_count}/{MAX_ACTIONS_30D} actions in 30d")
-        raw_action = AllocationAction.HOLD
-        blocked_by = "CHURN"
-        
-        return AllocationPolicy(
-            asset=asset,
-            action=raw_action,
-            size_pct=get_size(asset, raw_action),
-            confidence=confidence,
-            stance=stance,
-            blocked_by=blocked_by,
-            reasoning=reasoning
-        )
+    if actions_30d >= max_actions_30d and action != _STRONG_SELL:
+        return _HOLD, BLOCKED_CHURN, reasons | REASON_CHURN, action, eth_from, eth_to
     
     # ── Step 9: Return final action ──
+    return action, BLOCKED_NONE, reasons, action, eth_from, eth_to
+
+
+@njit(cache=True)
+def _decide_pair_core(
+    regime_id,
+    confidence,
+    risk_level,
+    momentum,
+    returns_30d,
+    market_state,
+    tail_risk,
+    polarity_id,
+    btc_last_action_id,
+    btc_days_since,
+    btc_actions_30d,
+    eth_last_action_id,
+    eth_days_since,
+    eth_actions_30d,
+    params,
+):
+    """
+    BTC and then ETH (capped by the BTC action) in one call.
+    
+    Returns the two _decide_action_core() tuples concatenated (BTC first).
+    """
+    btc = _decide_action_core(
+        regime_id, confidence, risk_level, momentum, returns_30d, market_state, tail_risk,
+        polarity_id, _ASSET_BTC, -1, btc_last_action_id, btc_days_since, btc_actions_30d, params,
+    )
+    eth = _decide_action_core(
+        regime_id, confidence, risk_level, momentum, returns_30d, market_state, tail_risk,
+        polarity_id, _ASSET_ETH, btc[0], eth_last_action_id, eth_days_since, eth_actions_30d, params,
+    )
+    return btc + eth
+
+
+# Prefer the AOT-compiled core from build_aot.py, but only if it was built
+# from this exact file; otherwise use the JIT (or plain Python) version.
+_SOURCE_CRC = zlib.crc32(Path(__file__).read_bytes())
+try:
+    import allocation_core as _aot
+    if _aot.source_crc() != _SOURCE_CRC:
+        _aot = None
+except ImportError:
+    _aot = None
+
+if _aot is not None:
+    _decide_action, _decide_pair, _cooldown_left = _aot.decide_action, _aot.decide_pair, _aot.cooldown_remaining
+else:
+    _decide_action, _decide_pair, _cooldown_left = _decide_action_core, _decide_pair_core, _cooldown_remaining
+
+
+def format_reasoning(reasons: int, ctx: dict) -> List[str]:
+    """
+    Materialize reasoning lines for the REASON_* bits set in `reasons`.
+    
+    ctx keys: regime, confidence, risk_level, momentum, vol_z,
+    returns_30d_pct (returns_30d * 100), btc_action, eth_from, eth_to,
+    proposed (action names), days_remaining, actions_count.
+    """
+    lines = []
+    while reasons:
+        bit = reasons & -reasons  # lowest set bit first = emission order
+        for template in _REASON_TEXT[bit]:
+            lines.append(template % ctx)
+        reasons ^= bit
+    return lines
+
+
+# ============================================================
+# MAIN COMPUTATION
+# ============================================================
+
+# LRU cache of compute_allocation results (live loops re-evaluate the
+# same regime snapshot many times)
+POLICY_CACHE_SIZE = 1024
+_POLICY_CACHE = OrderedDict()
+
+
+def compute_allocation(
+    regime: Union[str, Regime],
+    confidence: float,
+    risk_level: float,
+    momentum: float,
+    tail_risk: bool,
+    tail_polarity: Optional[str],
+    asset: str,
+    btc_action: Optional[AllocationAction] = None,
+    last_action: Optional[str] = None,
+    last_action_date: Optional[date] = None,
+    action_history: Optional[Union[List[Tuple[str, date]], ActionHistory, HistoryArrays]] = None,
+    today: Optional[date] = None,
+    # v1.4 Counter-cyclical parameters
+    vol_z: float = 0.0,
+    returns_30d: float = 0.0,
+    explain: bool = True,
+    market_state: Optional[int] = None,
+) -> AllocationPolicy:
+    """
+    Compute asset allocation policy.
+    
+    v1.4: Added counter-cyclical logic:
+    - Don't sell in panic (momentum < -0.7 + high vol)
+    - Accumulate on fear (extreme negative momentum + drawdown)
+    - Take profit on greed (extreme positive momentum + rally)
+    
+    The decision itself is made by _decide_action_core(); this wrapper
+    converts inputs to int codes and builds the policy. Reasoning text
+    is only formatted when `explain` is set; policy.reasons always holds
+    the REASON_* bits.
+    
+    Args:
+        regime: BULL | BEAR | RANGE | TRANSITION (name or Regime)
+        confidence: Model confidence [0, 1]
+        risk_level: Directional risk [-1, +1]
+        momentum: Momentum score [-1, +1]
+        tail_risk: Whether tail risk is active
+        tail_polarity: "downside" | "upside" | None
+        asset: "BTC" | "ETH"
+        btc_action: BTC action (required for ETH)
+        last_action: Last action taken
+        last_action_date: Date of last action
+        action_history: List of (action, date) tuples or an ActionHistory
+        today: Current date (defaults to today)
+        vol_z: Volatility z-score (for panic detection)
+        returns_30d: 30-day returns (for drawdown/rally detection)
+        explain: Build the reasoning strings (skip in backtests)
+        market_state: Precomputed _classify_market() state (computed here if None)
+    
+    Returns:
+        AllocationPolicy with action and reasoning
+    """
+    if today is None:
+        today = date.today()
+    
+    last_action_id, days_since, actions_count = _history_state(
+        last_action, last_action_date, action_history, today
+    )
+    
+    if market_state is None:
+        market_state = _classify_market(momentum, vol_z, returns_30d, confidence)
+    
+    # Everything the decision and its text depend on (history and dates
+    # reduced to actions_count / days_since; vol_z and returns_30d included)
+    key = (
+        regime, confidence, risk_level, momentum, vol_z, returns_30d, market_state,
+        bool(tail_risk), tail_polarity, asset, btc_action,
+        last_action_id, days_since, actions_count, explain,
+    )
+    policy = _POLICY_CACHE.get(key)
+    if policy is not None:
+        _POLICY_CACHE.move_to_end(key)
+        return policy
+    
+    decision = _compute_allocation_result(
+        regime, confidence, risk_level, momentum, returns_30d, market_state,
+        tail_risk, tail_polarity, asset, btc_action,
+        last_action_id, days_since, actions_count,
+    )
+    policy = _make_policy(
+        decision, regime, confidence, risk_level, momentum, vol_z, returns_30d,
+        asset, btc_action, last_action_id, days_since, actions_count, explain,
+    )
+    
+    _POLICY_CACHE[key] = policy
+    if len(_POLICY_CACHE) > POLICY_CACHE_SIZE:
+        _POLICY_CACHE.popitem(last=False)
+    return policy
+
+
+def compute_allocation_action_only(
+    regime: Union[str, Regime],
+    confidence: float,
+    risk_level: float,
+    momentum: float,
+    tail_risk: bool,
+    tail_polarity: Optional[str],
+    asset: str,
+    btc_action: Optional[AllocationAction] = None,
+    last_action: Optional[str] = None,
+    last_action_date: Optional[date] = None,
+    action_history: Optional[Union[List[Tuple[str, date]], ActionHistory, HistoryArrays]] = None,
+    today: Optional[date] = None,
+    vol_z: float = 0.0,
+    returns_30d: float = 0.0,
+    market_state: Optional[int] = None,
+) -> Tuple[int, int]:
+    """
+    compute_allocation() reduced to (action value, BLOCKED_* code).
+    
+    Builds no AllocationPolicy, reasoning or cache entry, for backtest
+    loops that only need the action. Whole series can go through
+    compute_allocations_parallel() instead.
+    """
+    if today is None:
+        today = date.today()
+    
+    if market_state is None:
+        market_state = _classify_market(momentum, vol_z, returns_30d, confidence)
+    
+    decision = _compute_allocation_result(
+        regime, confidence, risk_level, momentum, returns_30d, market_state,
+        tail_risk, tail_polarity, asset, btc_action,
+        *_history_state(last_action, last_action_date, action_history, today),
+    )
+    return decision[0], decision[1]
+
+
+def _compute_allocation_result(
+    regime: Union[str, Regime],
+    confidence: float,
+    risk_level: float,
+    momentum: float,
+    returns_30d: float,
+    market_state: int,
+    tail_risk: bool,
+    tail_polarity: Optional[str],
+    asset: str,
+    btc_action: Optional[AllocationAction],
+    last_action_id: int,
+    days_since: int,
+    actions_count: int,
+) -> Tuple[int, ...]:
+    """
+    Run the decision core for one asset (see _decide_action_core for the tuple).
+    """
+    return _decide_action(
+        _REGIME_IDS.get(regime, _UNKNOWN_REGIME_ID),
+        float(confidence),
+        float(risk_level),
+        float(momentum),
+        float(returns_30d),
+        int(market_state),
+        bool(tail_risk),
+        _POLARITY_IDS.get(tail_polarity, _POLARITY_NONE),
+        _ASSET_IDS.get(asset, _ASSET_OTHER),
+        -1 if btc_action is None else int(btc_action),
+        last_action_id,
+        days_since,
+        actions_count,
+        _CORE_PARAMS,
+    )
+
+
+def _history_state(
+    last_action: Optional[str],
+    last_action_date: Optional[date],
+    action_history: Optional[Union[List[Tuple[str, date]], ActionHistory, HistoryArrays]],
+    today: date,
+    today_ord: Optional[int] = None,
+) -> Tuple[int, int, int]:
+    """
+    Reduce an asset's action history to (last_action_id, days_since, actions_count).
+    
+    today_ord is today.toordinal(), for callers that reuse it across assets.
+    """
+    if action_history is None:
+        action_history = []
+    
+    if last_action is None or last_action_date is None:
+        last_action_id, days_since = -1, 0
+    else:
+        last_action_id = _ACTION_IDS.get(last_action, -1)
+        if today_ord is None:
+            today_ord = today.toordinal()
+        days_since = today_ord - last_action_date.toordinal()
+    
+    return last_action_id, days_since, count_actions_30d(action_history, today)
+
+
+def _make_policy(
+    decision: Tuple[int, ...],
+    regime: Union[str, Regime],
+    confidence: float,
+    risk_level: float,
+    momentum: float,
+    vol_z: float,
+    returns_30d: float,
+    asset: str,
+    btc_action: Optional[AllocationAction],
+    last_action_id: int,
+    days_since: int,
+    actions_count: int,
+    explain: bool,
+) -> AllocationPolicy:
+    """
+    Build the AllocationPolicy for a _decide_action_core() result.
+    """
+    action_id, blocked_id, reasons, proposed, eth_from, eth_to = decision
+    action = _ACTION_BY_ID[action_id]
+    
+    if not explain:
+        reasoning = ()
+    else:
+        if reasons & (REASON_COOLDOWN | REASON_RULE_COOLDOWN):
+            days_remaining = _cooldown_left(last_action_id, days_since, proposed, _CORE_PARAMS)
+        else:
+            days_remaining = 0
+        reasoning = tuple(format_reasoning(reasons, {
+            "regime": regime.name if isinstance(regime, Regime) else regime,
+            "confidence": confidence,
+            "risk_level": risk_level,
+            "momentum": momentum,
+            "vol_z": vol_z,
+            "returns_30d_pct": returns_30d * 100,
+            "btc_action": _ACTION_NAMES[btc_action] if btc_action is not None else None,
+            "eth_from": _ACTION_NAMES[eth_from],
+            "eth_to": _ACTION_NAMES[eth_to],
+            "proposed": _ACTION_NAMES[proposed],
+            "days_remaining": days_remaining,
+            "actions_count": actions_count,
+        }))
+    
     return AllocationPolicy(
         asset=asset,
-        action=raw_action,
-        size_pct=get_size(asset, raw_action),
+        action=action,
+        size_pct=get_size(asset, action),
         confidence=confidence,
-        stance=stance,
-        blocked_by=blocked_by,
-        reasoning=reasoning
+        stance=determine_stance(regime, confidence, risk_level),
+        blocked_by=BLOCKED_BY_NAMES[blocked_id],
+        reasoning=reasoning,
+        reasons=reasons,
+    )
+
+
+def _parse_regime(regime_output: dict) -> RegimeSnapshot:
+    """
+    Extract allocation inputs from a Regime Engine output in one pass.
+    """
+    metadata = regime_output.get("metadata", {})
+    return RegimeSnapshot(
+        regime=regime_output.get("regime", "TRANSITION"),
+        confidence=regime_output.get("confidence", {}).get("quality_adjusted", 0.0),
+        risk_level=regime_output.get("risk", {}).get("risk_level", 0.0),
+        momentum=regime_output.get("buckets", {}).get("Momentum", 0.0),
+        vol_z=metadata.get("vol_z", 0.0),
+        # v1.4: 30d returns for counter-cyclical logic (from price data if available)
+        returns_30d=metadata.get("returns_30d", 0.0),
+        structural_break=regime_output.get("normalization", {}).get("break_active", False),
+    )
+
+
+def _compute_btc_eth_core(
+    snap: RegimeSnapshot,
+    regime: Union[str, Regime],
+    market_state: int,
+    tail_risk: bool,
+    tail_polarity: Optional[str],
+    btc_state: Tuple[int, int, int],
+    eth_state: Tuple[int, int, int],
+    explain: bool,
+) -> Tuple[AllocationPolicy, AllocationPolicy]:
+    """
+    BTC and ETH policies from one _decide_pair_core() call.
+    
+    *_state are _history_state() tuples. The pair shares the policy LRU
+    cache with compute_allocation() (its keys are shorter, so they never
+    collide).
+    """
+    key = (
+        regime, snap.confidence, snap.risk_level, snap.momentum, snap.vol_z, snap.returns_30d,
+        market_state, bool(tail_risk), tail_polarity, btc_state, eth_state, explain,
+    )
+    pair = _POLICY_CACHE.get(key)
+    if pair is not None:
+        _POLICY_CACHE.move_to_end(key)
+        return pair
+    
+    decision = _decide_pair(
+        _REGIME_IDS.get(regime, _UNKNOWN_REGIME_ID),
+        float(snap.confidence),
+        float(snap.risk_level),
+        float(snap.momentum),
+        float(snap.returns_30d),
+        int(market_state),
+        bool(tail_risk),
+        _POLARITY_IDS.get(tail_polarity, _POLARITY_NONE),
+        *btc_state,
+        *eth_state,
+        _CORE_PARAMS,
     )
+    inputs = (regime, snap.confidence, snap.risk_level, snap.momentum, snap.vol_z, snap.returns_30d)
+    btc_policy = _make_policy(decision[:6], *inputs, "BTC", None, *btc_state, explain)
+    eth_policy = _make_policy(decision[6:], *inputs, "ETH", btc_policy.action, *eth_state, explain)
+    
+    pair = btc_policy, eth_policy
+    _POLICY_CACHE[key] = pair
+    if len(_POLICY_CACHE) > POLICY_CACHE_SIZE:
+        _POLICY_CACHE.popitem(last=False)
+    return pair
 
 
 def compute_btc_eth_allocation(
@@ -618,10 +1225,11 @@ def compute_btc_eth_allocation(
     tail_polarity: Optional[str] = None,
     btc_last_action: Optional[str] = None,
     btc_last_date: Optional[date] = None,
-    btc_history: Optional[List[Tuple[str, date]]] = None,
+    btc_history: Optional[Union[List[Tuple[str, date]], ActionHistory, HistoryArrays]] = None,
     eth_last_action: Optional[str] = None,
     eth_last_date: Optional[date] = None,
-    eth_history: Optional[List[Tuple[str, date]]] = None,
+    eth_history: Optional[Union[List[Tuple[str, date]], ActionHistory, HistoryArrays]] = None,
+    explain: bool = True,
 ) -> dict:
     """
     Compute allocation for both BTC and ETH.
@@ -633,82 +1241,59 @@ def compute_btc_eth_allocation(
         *_last_action: Last action for each asset
         *_last_date: Date of last action
         *_history: Action history
+        explain: Include reasoning strings
     
     Returns:
         Dict with btc, eth, and meta keys
     """
-    # Extract inputs from regime output
-    regime = regime_output.get("regime", "TRANSITION")
-    confidence = regime_output.get("confidence", {}).get("quality_adjusted", 0.0)
-    risk_level = regime_output.get("risk", {}).get("risk_level", 0.0)
-    momentum = regime_output.get("buckets", {}).get("Momentum", 0.0)
-    vol_z = regime_output.get("metadata", {}).get("vol_z", 0.0)
-    structural_break = regime_output.get("normalization", {}).get("break_active", False)
+    snap = _parse_regime(regime_output)
+    
+    # Resolve the regime name once for both assets (unknown names pass through)
+    regime_key = Regime.__members__.get(snap.regime, snap.regime)
     
-    # v1.4: Extract 30d returns for counter-cyclical logic
-    # This comes from the price data if available
-    returns_30d = regime_output.get("metadata", {}).get("returns_30d", 0.0)
+    # Panic/euphoria predicates are the same for both assets
+    market_state = _classify_market(snap.momentum, snap.vol_z, snap.returns_30d, snap.confidence)
     
     # Auto-detect tail risk if not provided
     if not tail_risk:
-        tail_risk, tail_polarity = detect_tail_risk(vol_z, risk_level, momentum, structural_break)
+        tail_risk, tail_polarity = detect_tail_risk(snap.vol_z, snap.risk_level, snap.momentum, snap.structural_break)
     
-    # Compute BTC first
-    btc_policy = compute_allocation(
-        regime=regime,
-        confidence=confidence,
-        risk_level=risk_level,
-        momentum=momentum,
-        tail_risk=tail_risk,
-        tail_polarity=tail_polarity,
-        asset="BTC",
-        btc_action=None,
-        last_action=btc_last_action,
-        last_action_date=btc_last_date,
-        action_history=btc_history,
-        vol_z=vol_z,
-        returns_30d=returns_30d,
-    )
-    
-    # Compute ETH with BTC as ceiling
-    eth_policy = compute_allocation(
-        regime=regime,
-        confidence=confidence,
-        risk_level=risk_level,
-        momentum=momentum,
-        tail_risk=tail_risk,
-        tail_polarity=tail_polarity,
-        asset="ETH",
-        btc_action=btc_policy.action,
-        last_action=eth_last_action,
-        last_action_date=eth_last_date,
-        action_history=eth_history,
-        vol_z=vol_z,
-        returns_30d=returns_30d,
+    # BTC first, then ETH with BTC as ceiling, in one core call
+    today = date.today()
+    today_ord = today.toordinal()
+    btc_policy, eth_policy = _compute_btc_eth_core(
+        snap,
+        regime_key,
+        market_state,
+        tail_risk,
+        tail_polarity,
+        _history_state(btc_last_action, btc_last_date, btc_history, today, today_ord),
+        _history_state(eth_last_action, eth_last_date, eth_history, today, today_ord),
+        explain,
     )
     
     return {
         "btc": {
-            "action": btc_policy.action.value,
+            "action": btc_policy.action.name,
             "size_pct": btc_policy.size_pct,
             "confidence": btc_policy.confidence,
             "stance": btc_policy.stance.value,
             "blocked_by": btc_policy.blocked_by,
-            "reasoning": btc_policy.reasoning,
+            "reasoning": list(btc_policy.reasoning),
         },
         "eth": {
-            "action": eth_policy.action.value,
+            "action": eth_policy.action.name,
             "size_pct": eth_policy.size_pct,
             "confidence": eth_policy.confidence,
             "stance": eth_policy.stance.value,
             "blocked_by": eth_policy.blocked_by,
-            "reasoning": eth_policy.reasoning,
+            "reasoning": list(eth_policy.reasoning),
         },
         "meta": {
-            "regime": regime,
+            "regime": snap.regime,
             "tail_risk_active": tail_risk,
             "tail_polarity": tail_polarity,
-            "structural_break": structural_break,
+            "structural_break": snap.structural_break,
         }
     }
 
@@ -740,6 +1325,414 @@ def detect_tail_risk(
         return True, "downside"  # Conservative default
 
 
+# ============================================================
+# BATCH (vectorized, for backtests)
+# ============================================================
+
+def regime_ids_vec(regime: np.ndarray) -> np.ndarray:
+    """
+    Regime names (or Regime ids) → int8 Regime ids; unknown names map
+    to len(Regime).
+    """
+    regime = np.asarray(regime)
+    if np.issubdtype(regime.dtype, np.integer):
+        return regime.astype(np.int8, copy=False)
+    
+    ids = np.full(regime.shape, _UNKNOWN_REGIME_ID, dtype=np.int8)
+    for member in Regime:
+        ids[regime == member.name] = member
+    return ids
+
+
+def polarity_ids_vec(tail_polarity: np.ndarray) -> np.ndarray:
+    """
+    Tail polarity strings (or TailPolarity ids) → int8 TailPolarity ids;
+    None and unknown values map to NONE.
+    """
+    tail_polarity = np.asarray(tail_polarity)
+    if np.issubdtype(tail_polarity.dtype, np.integer):
+        return tail_polarity.astype(np.int8, copy=False)
+    
+    ids = np.full(tail_polarity.shape, _POLARITY_NONE, dtype=np.int8)
+    for name, polarity_id in _POLARITY_IDS.items():
+        ids[tail_polarity == name] = polarity_id
+    return ids
+
+
+def detect_tail_risk_batch(
+    vol_z: np.ndarray,
+    risk_level: np.ndarray,
+    momentum: np.ndarray,
+    structural_break: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized detect_tail_risk() over N rows.
+    
+    Returns:
+        (is_tail, polarity_id): bool array and int8 TailPolarity ids
+        (NONE where there is no tail risk)
+    """
+    vol_z = np.asarray(vol_z, dtype=float)
+    risk_level = np.asarray(risk_level, dtype=float)
+    momentum = np.asarray(momentum, dtype=float)
+    structural_break = np.asarray(structural_break, dtype=bool)
+    
+    extreme_vol = vol_z > 2.5
+    deep_risk_off = risk_level < -0.70
+    break_negative = structural_break & (risk_level < -0.30)
+    
+    is_tail = extreme_vol | deep_risk_off | break_negative
+    
+    # Polarity: downside unless clearly upside (conservative default)
+    upside = (risk_level > 0.30) & (momentum > 0.30)
+    polarity_id = np.where(upside, _POLARITY_UPSIDE, _POLARITY_DOWNSIDE).astype(np.int8)
+    polarity_id[~is_tail] = _POLARITY_NONE
+    
+    return is_tail, polarity_id
+
+
+def determine_stance_vec(
+    regime: np.ndarray,
+    confidence: np.ndarray,
+    risk_level: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized determine_stance(). Returns Stance values as strings.
+    """
+    regime_id = regime_ids_vec(regime)
+    confidence = np.asarray(confidence, dtype=float)
+    risk_level = np.asarray(risk_level, dtype=float)
+    
+    risk_on = (regime_id == Regime.BULL) & (confidence > 0.60) & (risk_level > 0.30)
+    risk_off = ((regime_id == Regime.BEAR) | (regime_id == Regime.TRANSITION)) & (risk_level < -0.30)
+    
+    return np.select(
+        [risk_on, risk_off],
+        [Stance.RISK_ON.value, Stance.RISK_OFF.value],
+        default=Stance.RISK_NEUTRAL.value
+    )
+
+
+def compute_policies_vec(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized stance, churn and cooldown state for a daily series.
+    
+    Replaces per-day determine_stance / count_actions_30d / is_churn /
+    is_cooldown_active calls in backtest loops.
+    
+    Args:
+        df: DatetimeIndex-ed frame with columns regime, confidence,
+            risk_level and, optionally, action (action taken that day).
+    
+    Returns:
+        DataFrame (same index) with columns:
+            stance: RISK_ON | RISK_NEUTRAL | RISK_OFF
+            actions_30d: non-HOLD actions in the 30 days before each row
+            churn: actions_30d >= MAX_ACTIONS_30D
+            last_action: last non-HOLD action before each row (or None)
+            days_since_action: days since last_action (NaN if none)
+            cooldown_buy: BUY/STRONG_BUY blocked by cooldown
+            cooldown_sell: SELL/STRONG_SELL blocked by cooldown
+            cooldown_strong: STRONG_* blocked by cooldown
+    """
+    out = pd.DataFrame(index=df.index)
+    out["stance"] = determine_stance_vec(
+        df["regime"].to_numpy(),
+        df["confidence"].to_numpy(),
+        df["risk_level"].to_numpy()
+    )
+    
+    if "action" not in df:
+        out["actions_30d"] = 0
+        out["churn"] = False
+        out["last_action"] = None
+        out["days_since_action"] = np.nan
+        out["cooldown_buy"] = False
+        out["cooldown_sell"] = False
+        out["cooldown_strong"] = False
+        return out
+    
+    action = df["action"].where(df["action"].notna(), "HOLD")
+    is_action = action != "HOLD"
+    
+    # Window [today - 30d, today), same as count_actions_30d on past history
+    actions_30d = is_action.astype(float).rolling("30D", closed="left").sum()
+    out["actions_30d"] = actions_30d.fillna(0).astype(int)
+    out["churn"] = out["actions_30d"] >= MAX_ACTIONS_30D
+    
+    # Last non-HOLD action strictly before each row
+    last_action = action.where(is_action).shift(1).ffill()
+    action_dates = pd.Series(df.index, index=df.index).where(is_action)
+    last_date = action_dates.shift(1).ffill()
+    days_since = (pd.Series(df.index, index=df.index) - last_date).dt.days
+    
+    out["last_action"] = last_action.astype(object).where(last_action.notna(), None)
+    out["days_since_action"] = days_since
+    
+    last_sell = last_action.isin(["SELL", "STRONG_SELL"])
+    last_buy = last_action.isin(["BUY", "STRONG_BUY"])
+    last_strong = last_action.isin(["STRONG_BUY", "STRONG_SELL"])
+    
+    out["cooldown_buy"] = last_sell & (days_since < COOLDOWN_BUY_AFTER_SELL)
+    out["cooldown_sell"] = last_buy & (days_since < COOLDOWN_SELL_AFTER_BUY)
+    out["cooldown_strong"] = last_strong & (days_since < COOLDOWN_STRONG_AFTER_STRONG)
+    
+    return out
+
+
+def compute_allocations_batch(
+    regime: np.ndarray,
+    confidence: np.ndarray,
+    risk_level: np.ndarray,
+    momentum: np.ndarray,
+    asset: str,
+    tail_risk: Optional[np.ndarray] = None,
+    tail_polarity: Optional[np.ndarray] = None,
+    btc_action: Optional[np.ndarray] = None,
+    vol_z: Optional[np.ndarray] = None,
+    returns_30d: Optional[np.ndarray] = None,
+    cooldown_buy: Optional[np.ndarray] = None,
+    cooldown_sell: Optional[np.ndarray] = None,
+    cooldown_strong: Optional[np.ndarray] = None,
+    churn: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized compute_allocation() for one asset over N rows.
+    
+    Same decision ladder as the scalar path, but without reasoning
+    strings or AllocationPolicy objects. Cooldown and churn depend on
+    the actions actually taken, so they are not derived here: pass the
+    cooldown_*/churn masks (e.g. from compute_policies_vec) to apply them.
+    
+    regime may hold names or Regime ids, tail_polarity "downside"/"upside"
+    strings or TailPolarity ids (as from detect_tail_risk_batch). For ETH
+    pass the BTC actions from a previous call as btc_action.
+    
+    Returns:
+        (action, blocked_by): int8 arrays of AllocationAction values and
+        BLOCKED_* codes (see BLOCKED_BY_NAMES)
+    """
+    confidence = np.asarray(confidence, dtype=float)
+    risk_level = np.asarray(risk_level, dtype=float)
+    momentum = np.asarray(momentum, dtype=float)
+    n = len(confidence)
+    
+    def _arr(values, fill, dtype):
+        return np.full(n, fill, dtype=dtype) if values is None else np.asarray(values, dtype=dtype)
+    
+    vol_z = _arr(vol_z, 0.0, float)
+    returns_30d = _arr(returns_30d, 0.0, float)
+    tail_risk = _arr(tail_risk, False, bool)
+    polarity_id = _arr(None, _POLARITY_NONE, np.int8) if tail_polarity is None else polarity_ids_vec(tail_polarity)
+    cooldown_buy = _arr(cooldown_buy, False, bool)
+    cooldown_sell = _arr(cooldown_sell, False, bool)
+    cooldown_strong = _arr(cooldown_strong, False, bool)
+    churn = _arr(churn, False, bool)
+    
+    STRONG_BUY, BUY, HOLD, SELL, STRONG_SELL = (
+        int(a) for a in (AllocationAction.STRONG_BUY, AllocationAction.BUY, AllocationAction.HOLD,
+                         AllocationAction.SELL, AllocationAction.STRONG_SELL)
+    )
+    is_btc = asset == "BTC"
+    
+    regime_id = regime_ids_vec(regime)
+    stance = determine_stance_vec(regime_id, confidence, risk_level)
+    
+    # Counter-cyclical predicates
+    market_state = _classify_market_vec(momentum, vol_z, returns_30d, confidence)
+    is_extreme_panic = (market_state >= MARKET_EXTREME_PANIC) & (market_state <= MARKET_CAPITULATION)
+    panic_block_sell = (market_state >= MARKET_PANIC) & (market_state <= MARKET_CAPITULATION)
+    
+    # ── Step 3: raw action by regime ──
+    bull = regime_id == Regime.BULL
+    bear = regime_id == Regime.BEAR
+    transition = regime_id == Regime.TRANSITION
+    other = ~(bull | bear | transition)
+    action = np.select(
+        [
+            bull & (confidence >= CONF_STRONG_BUY) & (momentum > MOM_WEAK),
+            bull & (confidence >= CONF_ACTION) & (momentum > -0.2),
+            bear & panic_block_sell,
+            bear & (confidence >= CONF_STRONG_SELL) & (momentum < -MOM_STRONG) & (returns_30d < -0.15),
+            bear & (confidence >= 0.50) & (momentum < -0.40) & (returns_30d < -0.10),
+            transition & (risk_level < -0.7) & (confidence >= 0.50) & (momentum < -0.3),
+            other & is_extreme_panic & is_btc,
+        ],
+        [STRONG_BUY, BUY, HOLD, STRONG_SELL, SELL, SELL, BUY],
+        default=HOLD
+    ).astype(np.int8)
+    
+    # ── Step 4: regime gate ──
+    allowed = np.asarray(_REGIME_MASK_BY_ID, dtype=np.int64)[regime_id]
+    action = np.where((allowed >> action) & 1 == 1, action, HOLD).astype(np.int8)
+    
+    # ── Step 5: confidence gate ──
+    action = np.where(confidence >= np.asarray(_CONF_REQUIRED)[action], action, HOLD).astype(np.int8)
+    
+    # ── Step 6: ETH adjustments ──
+    if not is_btc:
+        eth_allowed = np.full(n, _HOLD_MASK, dtype=np.int64)
+        for stance_enum, mask in _ETH_ALLOWED_MASK.items():
+            eth_allowed[stance == stance_enum.value] = mask
+        not_allowed = (eth_allowed >> action) & 1 == 0
+        buy_allowed = (eth_allowed >> BUY) & 1 == 1
+        action = np.select(
+            [
+                not_allowed & (action == STRONG_BUY) & buy_allowed,
+                not_allowed & (action == STRONG_BUY),
+                not_allowed & (stance == Stance.RISK_NEUTRAL.value),
+                not_allowed & (stance == Stance.RISK_OFF.value),
+            ],
+            [BUY, HOLD, HOLD, SELL],
+            default=action
+        ).astype(np.int8)
+        if btc_action is not None:
+            # Rank == value, so the ceiling is an elementwise min
+            action = np.minimum(action, np.asarray(btc_action, dtype=np.int8))
+        action[action == STRONG_BUY] = BUY
+    
+    # Early-return branches, in scalar priority order
+    rule_accumulate = is_btc & (market_state == MARKET_CAPITULATION)
+    rule_take_profit = is_btc & (market_state == MARKET_EUPHORIA_RALLY)
+    tail_down = tail_risk & (polarity_id == _POLARITY_DOWNSIDE)
+    tail_up = tail_risk & (polarity_id == _POLARITY_UPSIDE)
+    low_confidence = confidence < CONF_NO_ACTION
+    eth_exit = low_confidence & (not is_btc) & (stance == Stance.RISK_OFF.value)
+    
+    early = [
+        rule_accumulate,
+        rule_take_profit,
+        tail_down & panic_block_sell,
+        tail_down,
+        tail_up,
+        eth_exit,
+        low_confidence,
+    ]
+    action = np.select(early, [BUY, SELL, HOLD, STRONG_SELL, SELL, SELL, HOLD], default=action).astype(np.int8)
+    blocked_by = np.where(
+        low_confidence & ~(rule_accumulate | rule_take_profit | tail_down | tail_up | eth_exit),
+        BLOCKED_CONFIDENCE, BLOCKED_NONE
+    ).astype(np.int8)
+    
+    # ── Step 7: cooldown (counter-cyclical rules and the regime ladder) ──
+    ladder = ~np.logical_or.reduce(early)
+    cooldown = (
+        (((action == BUY) | (action == STRONG_BUY)) & cooldown_buy)
+        | (((action == SELL) | (action == STRONG_SELL)) & cooldown_sell)
+        | (((action == STRONG_BUY) | (action == STRONG_SELL)) & cooldown_strong)
+    ) & (rule_accumulate | rule_take_profit | ladder)
+    action[cooldown] = HOLD
+    blocked_by[cooldown] = BLOCKED_COOLDOWN
+    
+    # ── Step 8: churn (regime ladder only) ──
+    churned = churn & ladder & ~cooldown & (action != STRONG_SELL)
+    action[churned] = HOLD
+    blocked_by[churned] = BLOCKED_CHURN
+    
+    return action, blocked_by
+
+
+# Below this many rows the thread pool costs more than it saves
+PARALLEL_MIN_ROWS = 1024
+
+
+@njit(cache=True)
+def _decide_actions_serial(
+    regime_id, confidence, risk_level, momentum, returns_30d, market_state, tail_risk,
+    polarity_id, asset_id, btc_action, last_action_id, days_since, actions_30d, params,
+):
+    n = regime_id.shape[0]
+    action = np.empty(n, np.int8)
+    blocked_by = np.empty(n, np.int8)
+    reasons = np.empty(n, np.int64)
+    for i in range(n):
+        a, b, r, _, _, _ = _decide_action_core(
+            regime_id[i], confidence[i], risk_level[i], momentum[i], returns_30d[i],
+            market_state[i], tail_risk[i], polarity_id[i], asset_id, btc_action[i],
+            last_action_id[i], days_since[i], actions_30d[i], params,
+        )
+        action[i], blocked_by[i], reasons[i] = a, b, r
+    return action, blocked_by, reasons
+
+
+@njit(parallel=True, cache=True)
+def _decide_actions_parallel(
+    regime_id, confidence, risk_level, momentum, returns_30d, market_state, tail_risk,
+    polarity_id, asset_id, btc_action, last_action_id, days_since, actions_30d, params,
+):
+    n = regime_id.shape[0]
+    action = np.empty(n, np.int8)
+    blocked_by = np.empty(n, np.int8)
+    reasons = np.empty(n, np.int64)
+    for i in prange(n):
+        a, b, r, _, _, _ = _decide_action_core(
+            regime_id[i], confidence[i], risk_level[i], momentum[i], returns_30d[i],
+            market_state[i], tail_risk[i], polarity_id[i], asset_id, btc_action[i],
+            last_action_id[i], days_since[i], actions_30d[i], params,
+        )
+        action[i], blocked_by[i], reasons[i] = a, b, r
+    return action, blocked_by, reasons
+
+
+def compute_allocations_parallel(
+    regime: np.ndarray,
+    confidence: np.ndarray,
+    risk_level: np.ndarray,
+    momentum: np.ndarray,
+    asset: str,
+    tail_risk: Optional[np.ndarray] = None,
+    tail_polarity: Optional[np.ndarray] = None,
+    btc_action: Optional[np.ndarray] = None,
+    vol_z: Optional[np.ndarray] = None,
+    returns_30d: Optional[np.ndarray] = None,
+    last_action: Optional[np.ndarray] = None,
+    days_since: Optional[np.ndarray] = None,
+    actions_30d: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run the compiled decision core for one asset over N independent rows.
+    
+    Unlike compute_allocations_batch, cooldown and churn come from the
+    per-row state the scalar path uses: last_action (AllocationAction
+    values, -1 = none), days_since that action and actions_30d. Rows do
+    not depend on each other, so with numba the loop is spread over
+    NUMBA_NUM_THREADS threads (serial below PARALLEL_MIN_ROWS rows).
+    
+    Returns:
+        (action, blocked_by, reasons): int8 AllocationAction values,
+        int8 BLOCKED_* codes and int64 REASON_* bits (see format_reasoning)
+    """
+    confidence = np.asarray(confidence, dtype=np.float64)
+    risk_level = np.asarray(risk_level, dtype=np.float64)
+    momentum = np.asarray(momentum, dtype=np.float64)
+    n = len(confidence)
+    
+    def _arr(values, fill, dtype):
+        return np.full(n, fill, dtype=dtype) if values is None else np.asarray(values, dtype=dtype)
+    
+    vol_z = _arr(vol_z, 0.0, np.float64)
+    returns_30d = _arr(returns_30d, 0.0, np.float64)
+    polarity_id = _arr(None, _POLARITY_NONE, np.int64) if tail_polarity is None else polarity_ids_vec(tail_polarity)
+    
+    kernel = _decide_actions_parallel if n >= PARALLEL_MIN_ROWS else _decide_actions_serial
+    return kernel(
+        regime_ids_vec(regime).astype(np.int64),
+        confidence,
+        risk_level,
+        momentum,
+        returns_30d,
+        _classify_market_vec(momentum, vol_z, returns_30d, confidence).astype(np.int64),
+        _arr(tail_risk, False, np.bool_),
+        polarity_id.astype(np.int64),
+        _ASSET_IDS.get(asset, _ASSET_OTHER),
+        _arr(btc_action, -1, np.int64),
+        _arr(last_action, -1, np.int64),
+        _arr(days_since, 0, np.int64),
+        _arr(actions_30d, 0, np.int64),
+        _CORE_PARAMS,
+    )
+
+
 # ============================================================
 # ACTION EMOJI (for Telegram)
 # ============================================================
@@ -753,6 +1746,12 @@ ACTION_EMOJI = {
 }
 
 
-def get_action_emoji(action: str) -> str:
-    """Get emoji for action."""
+# Same emoji indexed by action value
+ACTION_EMOJI_BY_ID = tuple(ACTION_EMOJI[name] for name in _ACTION_NAMES)
+
+
+def get_action_emoji(action: Union[AllocationAction, int, str]) -> str:
+    """Get emoji for action (AllocationAction, action value or name)."""
+    if isinstance(action, int) and action >= 0:
+        return ACTION_EMOJI_BY_ID[action]
     return ACTION_EMOJI.get(action, "⚪️")
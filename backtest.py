@@ -15,23 +15,32 @@ Asset Allocation Model Backtest
 
 import logging
 import json
-from datetime import datetime, timedelta
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
 
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from _njit import njit
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
 
 try:
     import yfinance as yf
-    import ta
 except ImportError:
     print("Installing required packages...")
     import subprocess
-    subprocess.check_call(['pip', 'install', 'yfinance', 'ta', '--quiet'])
+    subprocess.check_call(['pip', 'install', 'yfinance', '--quiet'])
     import yfinance as yf
-    import ta
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
@@ -52,6 +61,7 @@ class Trade:
     momentum: float
     rsi: float
     reason: str
+    bar_idx: int = -1  # position in the backtest df (-1 = unknown, look up by date)
 
 
 @dataclass
@@ -69,136 +79,307 @@ class BacktestResult:
     sells_at_top_pct: float     # % of sells within 10% of local top
     buys_at_bottom_pct: float   # % of buys within 10% of local bottom
     buys_at_top_pct: float      # % of buys within 10% of local top
+    
+    # Same trades as columns (date index; action/regime/reason categorical)
+    trades_df: Optional[pd.DataFrame] = None
 
 
 # ══════════════════════════════════════════════════════════════════
 # SIMPLIFIED REGIME DETECTION (for backtest)
 # ══════════════════════════════════════════════════════════════════
 
-def calculate_regime(df: pd.DataFrame, i: int) -> Dict:
+REGIME_NAMES = ("BULL", "BEAR", "TRANSITION", "RANGE")
+REG_BULL, REG_BEAR, REG_TRANSITION, REG_RANGE = range(len(REGIME_NAMES))
+
+# tail_polarity codes; index TAIL_POLARITY_NAMES for calculate_regime()'s value
+TAIL_POLARITY_NAMES = (None, "downside", "upside")
+TAIL_NONE, TAIL_DOWNSIDE, TAIL_UPSIDE = range(len(TAIL_POLARITY_NAMES))
+
+# Tail-risk conditions packed one bit each into a uint8 per bar;
+# _TAIL_LUT[flags] is the TAIL_* code for every combination.
+TF_BEAR, TF_BULL, TF_RSI_LOW, TF_RSI_HIGH, TF_MOM_CRASH = (1 << b for b in range(5))
+
+
+def _tail_code(flags: int) -> int:
+    if flags & TF_BEAR and flags & (TF_RSI_LOW | TF_MOM_CRASH):
+        return TAIL_DOWNSIDE
+    if flags & TF_BULL and flags & TF_RSI_HIGH:
+        return TAIL_UPSIDE
+    return TAIL_NONE
+
+
+_TAIL_LUT = np.array([_tail_code(f) for f in range(32)], dtype=np.int8)
+
+
+@njit(cache=True)
+def _ewm_mean_core(x, com, adjust, min_periods):
     """
-    Simplified regime detection based on engine.py logic.
-    Returns regime, confidence, momentum, risk_level.
+    pandas Series.ewm(com=com, adjust=adjust, min_periods=min_periods).mean(),
+    same recurrence and rounding (ignore_na=False).
     """
-    if i < 50:
-        return {
-            'regime': 'TRANSITION',
-            'confidence': 0.3,
-            'momentum': 0,
-            'risk_level': 0,
-            'tail_risk': False
-        }
+    n = x.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+    
+    alpha = 1.0 / (1.0 + com)
+    old_wt_factor = 1.0 - alpha
+    new_wt = 1.0 if adjust else alpha
+    
+    weighted = x[0]
+    nobs = 0 if np.isnan(weighted) else 1
+    out[0] = weighted if nobs >= min_periods else np.nan
+    old_wt = 1.0
+    
+    for i in range(1, n):
+        cur = x[i]
+        is_observation = not np.isnan(cur)
+        if is_observation:
+            nobs += 1
+        if not np.isnan(weighted):
+            old_wt *= old_wt_factor
+            if is_observation:
+                # pandas skips the update on equal values (constant series)
+                if weighted != cur:
+                    weighted = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+                if adjust:
+                    old_wt += new_wt
+                else:
+                    old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        out[i] = weighted if nobs >= min_periods else np.nan
+    
+    return out
+
+
+@njit(cache=True)
+def _wilder_smooth_core(values, seed, window):
+    """ATR recurrence: zeros, seed at window-1, then (prev*(n-1) + x) / n."""
+    out = np.zeros(values.shape[0])
+    out[window - 1] = seed
+    for i in range(window, values.shape[0]):
+        out[i] = (out[i - 1] * (window - 1) + values[i]) / float(window)
+    return out
+
+
+@njit(cache=True)
+def _floored_price_path_core(start, growth, floor):
+    """
+    generate_mock_btc_data() price path:
+    prices[0] = start, prices[i] = max(prices[i-1] * growth[i-1], floor).
+    """
+    prices = np.empty(growth.shape[0] + 1)
+    prices[0] = start
+    for i in range(growth.shape[0]):
+        prices[i + 1] = max(prices[i] * growth[i], floor)
+    return prices
+
+
+def ema(close: np.ndarray, span: int) -> np.ndarray:
+    """EMA identical to pd.Series(close).ewm(span=span).mean() (adjust=True)."""
+    return _ewm_mean(close, (span - 1) / 2, True, 0)
+
+
+def rsi_wilder(close: np.ndarray, window: int = 14) -> np.ndarray:
+    """
+    Wilder RSI over the full series, identical to
+    ta.momentum.RSIIndicator(close, window).rsi() (NaN for the first window-1 bars).
+    """
+    delta = np.empty_like(close, dtype=np.float64)
+    delta[0] = np.nan
+    np.subtract(close[1:], close[:-1], out=delta[1:])
+    
+    up = np.where(delta > 0, delta, 0.0)
+    down = -np.where(delta < 0, delta, 0.0)
+    
+    # ewm(alpha=1/window) as pandas converts it
+    alpha = 1 / window
+    com = (1 - alpha) / alpha
+    ema_up = _ewm_mean(up, com, False, window)
+    ema_down = _ewm_mean(down, com, False, window)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = ema_up / ema_down
+        return np.where(ema_down == 0, 100, 100 - (100 / (1 + rs)))
+
+
+def atr_wilder(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> np.ndarray:
+    """
+    Wilder ATR over the full series, identical to
+    ta.volatility.AverageTrueRange(...).average_true_range() (0 for the first window-1 bars).
+    """
+    prev_close = np.empty_like(close, dtype=np.float64)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    
+    # max() of the three skips the missing previous close on bar 0
+    true_range = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
     
-    close = df['Close'].iloc[:i+1]
-    high = df['High'].iloc[:i+1]
-    low = df['Low'].iloc[:i+1]
-    volume = df['Volume'].iloc[:i+1]
+    return _wilder_smooth(true_range, true_range[:window].mean(), window)
+
+
+# EMAs through a Polars lazy query instead of the compiled recurrence.
+# Off by default: on one series it is slower (~245 vs ~38 us for 1200 bars)
+# and differs from pandas in the last bits (~1e-15 relative), which can
+# flip a bar sitting exactly on a threshold. For pipelines that already
+# hold their data in Polars; needs `pip install polars`.
+USE_POLARS = False
+
+
+def _emas_polars(close: np.ndarray, spans: Tuple[int, ...]) -> Dict[str, np.ndarray]:
+    frame = pl.DataFrame({'close': close}).lazy().select([
+        pl.col('close').ewm_mean(span=span, adjust=True).alias(f'ema{span}')
+        for span in spans
+    ]).collect()
+    return {name: frame[name].to_numpy() for name in frame.columns}
+
+
+def precompute_indicators(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Indicators for calculate_regime() over the full series, computed once.
     
-    # EMAs
-    ema20 = close.ewm(span=20).mean().iloc[-1]
-    ema50 = close.ewm(span=50).mean().iloc[-1]
-    ema200 = close.ewm(span=200).mean().iloc[-1] if len(close) >= 200 else ema50
+    All of them are causal (EWM, Wilder RSI/ATR), so row i equals the
+    value computed on df.iloc[:i+1]. Prices and indicators stay float64:
+    the models compare them against fixed thresholds, and float32 moves
+    metrics (and can flip bars near a threshold). Codes are int8.
+    """
+    close = df['Close']
     
-    price = close.iloc[-1]
+    close_np = close.to_numpy(dtype=np.float64)
+    high_np = df['High'].to_numpy(dtype=np.float64)
+    low_np = df['Low'].to_numpy(dtype=np.float64)
     
-    # RSI
-    rsi = ta.momentum.RSIIndicator(close, window=14).rsi().iloc[-1]
+    if USE_POLARS and pl is not None:
+        emas = _emas_polars(close_np, (20, 50, 200))
+    else:
+        emas = {f'ema{span}': ema(close_np, span) for span in (20, 50, 200)}
     
-    # ATR for volatility
-    atr = ta.volatility.AverageTrueRange(high, low, close, window=14).average_true_range().iloc[-1]
-    atr_pct = atr / price * 100
+    ind = {
+        'close': close.to_numpy(),
+        **emas,
+        'rsi': rsi_wilder(close_np, window=14),
+        'atr': atr_wilder(high_np, low_np, close_np, window=14),
+    }
+    ind.update(score_regimes(close_np, ind['ema20'], ind['ema50'], ind['ema200'], ind['rsi']))
+    return ind
+
+
+def score_regimes(
+    close: np.ndarray,
+    ema20: np.ndarray,
+    ema50: np.ndarray,
+    ema200: np.ndarray,
+    rsi: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Regime scoring for every bar at once (simplified from engine.py).
     
-    # Momentum (7d change)
-    momentum = (price / close.iloc[-8] - 1) if i >= 8 else 0
+    Returns per-bar arrays: momentum (7d change), score (int8, -6..6),
+    regime (REG_* codes), confidence, risk_level, tail (TAIL_* codes).
+    calculate_regime() and the compiled bar loop only index these.
+    """
+    n = close.shape[0]
+    bar = np.arange(n)
     
-    # Volume trend
-    vol_ma = volume.rolling(20).mean().iloc[-1]
-    vol_ratio = volume.iloc[-1] / vol_ma if vol_ma > 0 else 1
+    # Momentum (7d change)
+    momentum = np.zeros(n)
+    momentum[8:] = close[8:] / close[1:n - 7] - 1
     
     # ══════════════════════════════════════════════════════
-    # REGIME SCORING (simplified from engine.py)
+    # REGIME SCORING
     # ══════════════════════════════════════════════════════
-    score = 0
     
     # Trend structure
-    if price > ema20 > ema50:
-        score += 2
-    elif price < ema20 < ema50:
-        score -= 2
-    elif price > ema20:
-        score += 1
-    else:
-        score -= 1
+    score = np.select(
+        [(close > ema20) & (ema20 > ema50), (close < ema20) & (ema20 < ema50), close > ema20],
+        [2, -2, 1],
+        default=-1
+    )
     
     # Momentum
-    if momentum > 0.08:
-        score += 2
-    elif momentum > 0.03:
-        score += 1
-    elif momentum < -0.08:
-        score -= 2
-    elif momentum < -0.03:
-        score -= 1
+    score += np.select(
+        [momentum > 0.08, momentum > 0.03, momentum < -0.08, momentum < -0.03],
+        [2, 1, -2, -1],
+        default=0
+    )
     
     # RSI
-    if rsi > 60:
-        score += 1
-    elif rsi < 40:
-        score -= 1
-    
-    # 200 EMA (long-term trend)
-    if len(close) >= 200:
-        if price > ema200:
-            score += 1
-        else:
-            score -= 1
-    
-    # Determine regime
-    if score >= 4:
-        regime = "BULL"
-    elif score >= 2:
-        regime = "BULL"  # early
-    elif score <= -4:
-        regime = "BEAR"
-    elif score <= -2:
-        regime = "BEAR"  # early
-    else:
-        regime = "TRANSITION" if abs(momentum) > 0.02 else "RANGE"
+    score += np.select([rsi > 60, rsi < 40], [1, -1], default=0)
+    
+    # 200 EMA (long-term trend), once there are 200 bars
+    score += np.where(bar >= 199, np.where(close > ema200, 1, -1), 0)
+    
+    # Determine regime (BULL/BEAR include the "early" +-2..3 band)
+    regime = np.select(
+        [score >= 2, score <= -2, np.abs(momentum) > 0.02],
+        [REG_BULL, REG_BEAR, REG_TRANSITION],
+        default=REG_RANGE
+    ).astype(np.int8)
     
     # Confidence
-    confidence = min(abs(score) * 0.12 + 0.20, 0.80)
-    if regime in ["TRANSITION", "RANGE"]:
-        confidence *= 0.7
-    
-    # Risk level
-    risk_level = score / 5  # Normalize to [-1, 1]
-    
-    # Tail risk (extreme conditions)
-    tail_risk = False
-    tail_polarity = None
-    
-    if regime == "BEAR" and rsi < 25:
-        tail_risk = True
-        tail_polarity = "downside"
-    elif regime == "BEAR" and momentum < -0.12:
-        tail_risk = True
-        tail_polarity = "downside"
-    elif regime == "BULL" and rsi > 80:
-        tail_risk = True
-        tail_polarity = "upside"
+    confidence = np.minimum(np.abs(score) * 0.12 + 0.20, 0.80)
+    confidence[regime >= REG_TRANSITION] *= 0.7
+    
+    # Risk level, normalized to [-1, 1]
+    risk_level = score / 5
+    
+    # Tail risk (extreme conditions): pack the flags, one table lookup per bar
+    tail_flags = (
+        (regime == REG_BEAR).view(np.uint8)
+        | (regime == REG_BULL).view(np.uint8) << 1
+        | (rsi < 25).view(np.uint8) << 2
+        | (rsi > 80).view(np.uint8) << 3
+        | (momentum < -0.12).view(np.uint8) << 4
+    )
+    tail = _TAIL_LUT[tail_flags]
     
     return {
+        'momentum': momentum,
+        'score': score.astype(np.int8),
         'regime': regime,
         'confidence': confidence,
-        'momentum': momentum,
         'risk_level': risk_level,
-        'rsi': rsi,
-        'tail_risk': tail_risk,
-        'tail_polarity': tail_polarity,
-        'atr_pct': atr_pct
+        'tail': tail,
+    }
+
+
+def calculate_regime(ind: Dict[str, np.ndarray], i: int) -> Dict:
+    """
+    Simplified regime detection based on engine.py logic.
+    Returns regime, confidence, momentum, risk_level.
+    
+    ind: precompute_indicators() output; i: bar index.
+    The scoring itself is score_regimes(); this reads bar i.
+    """
+    if i < 50:
+        return {
+            'regime': 'TRANSITION',
+            'confidence': 0.3,
+            'momentum': 0,
+            'risk_level': 0,
+            'tail_risk': False
+        }
+    
+    tail = ind['tail'][i]
+    
+    return {
+        'regime': REGIME_NAMES[ind['regime'][i]],
+        'confidence': ind['confidence'][i],
+        'momentum': ind['momentum'][i],
+        'risk_level': ind['risk_level'][i],
+        'rsi': ind['rsi'][i],
+        'tail_risk': tail != TAIL_NONE,
+        'tail_polarity': TAIL_POLARITY_NAMES[tail],
+        'atr_pct': ind['atr'][i] / ind['close'][i] * 100
     }
 
 
+# Buy / sell side of a model action (set lookup instead of substring scans)
+_BUY_ACTIONS = frozenset({"BUY", "STRONG_BUY"})
+_SELL_ACTIONS = frozenset({"SELL", "STRONG_SELL"})
+
+
 # ══════════════════════════════════════════════════════════════════
 # CURRENT MODEL (v1.3.1 - conservative)
 # ══════════════════════════════════════════════════════════════════
@@ -228,9 +409,9 @@ def current_model_action(regime_data: Dict, last_action: str = None,
     # 3. Cooldown check (simplified)
     if last_action and last_action_date and current_date:
         days_since = (current_date - last_action_date).days
-        if "BUY" in last_action and "SELL" in "SELL" and days_since < 3:
+        if last_action in _BUY_ACTIONS and days_since < 3:
             return ("HOLD", 0, "cooldown")
-        if "SELL" in last_action and "BUY" in "BUY" and days_since < 7:
+        if last_action in _SELL_ACTIONS and days_since < 7:
             return ("HOLD", 0, "cooldown")
     
     # 4. Regime logic
@@ -340,6 +521,277 @@ def contrarian_model_action(regime_data: Dict, last_action: str = None,
         return ("HOLD", 0, "range")
 
 
+# ══════════════════════════════════════════════════════════════════
+# COMPILED BAR LOOP (numba if available)
+# ══════════════════════════════════════════════════════════════════
+# Both models above on small-int codes over the score_regimes() table, so
+# the whole bar loop compiles into one function. The Python versions stay
+# the reference (and run custom model functions); keep the two in sync.
+
+MODEL_CURRENT = 0
+MODEL_CONTRARIAN = 1
+
+# run_backtest() model_func -> compiled model; other functions use the Python loop
+_MODEL_IDS = {
+    current_model_action: MODEL_CURRENT,
+    contrarian_model_action: MODEL_CONTRARIAN,
+}
+
+ACTION_NAMES = ("HOLD", "BUY", "STRONG_BUY", "SELL", "STRONG_SELL")
+ACT_HOLD, ACT_BUY, ACT_STRONG_BUY, ACT_SELL, ACT_STRONG_SELL = range(len(ACTION_NAMES))
+
+# Every reason the two models give comes with one fixed (action, size_pct),
+# so the compiled models return only the reason and this table does the rest
+REASONS = (
+    ("tail_risk_downside", ACT_STRONG_SELL, -0.50),
+    ("low_confidence", ACT_HOLD, 0.0),
+    ("cooldown", ACT_HOLD, 0.0),
+    ("bull_strong", ACT_STRONG_BUY, 0.20),
+    ("bull_buy", ACT_BUY, 0.10),
+    ("bull_hold", ACT_HOLD, 0.0),
+    ("bear_strong", ACT_STRONG_SELL, -0.50),
+    ("bear_sell", ACT_SELL, -0.15),
+    ("bear_hold", ACT_HOLD, 0.0),
+    ("transition_risk", ACT_SELL, -0.15),
+    ("transition_wait", ACT_HOLD, 0.0),
+    ("range", ACT_HOLD, 0.0),
+    ("euphoria_exit", ACT_STRONG_SELL, -0.50),
+    ("panic_accumulate", ACT_BUY, 0.10),
+    ("panic_hold", ACT_HOLD, 0.0),
+    ("overbought", ACT_SELL, -0.25),
+    ("oversold_hold", ACT_HOLD, 0.0),
+)
+REASON_NAMES = tuple(name for name, _, _ in REASONS)
+REASON_ACTION = np.array([action for _, action, _ in REASONS], dtype=np.int8)
+REASON_SIZE = np.array([size_pct for _, _, size_pct in REASONS])
+(
+    R_TAIL_RISK_DOWNSIDE, R_LOW_CONFIDENCE, R_COOLDOWN,
+    R_BULL_STRONG, R_BULL_BUY, R_BULL_HOLD,
+    R_BEAR_STRONG, R_BEAR_SELL, R_BEAR_HOLD,
+    R_TRANSITION_RISK, R_TRANSITION_WAIT, R_RANGE,
+    R_EUPHORIA_EXIT, R_PANIC_ACCUMULATE, R_PANIC_HOLD, R_OVERBOUGHT, R_OVERSOLD_HOLD,
+) = range(len(REASON_NAMES))
+
+
+@njit(cache=True)
+def _current_model_core(regime, conf, mom, risk, tail, last_action, bars_since):
+    """
+    current_model_action() -> reason (R_*); last_action < 0 = none.
+    Cooldown counts bars since last_action (daily bars: bars = days).
+    """
+    if tail == TAIL_DOWNSIDE:
+        return R_TAIL_RISK_DOWNSIDE
+    
+    if conf < 0.40:
+        return R_LOW_CONFIDENCE
+    
+    if last_action == ACT_BUY or last_action == ACT_STRONG_BUY:
+        if bars_since < 3:
+            return R_COOLDOWN
+    if last_action == ACT_SELL or last_action == ACT_STRONG_SELL:
+        if bars_since < 7:
+            return R_COOLDOWN
+    
+    if regime == REG_BULL:
+        if conf >= 0.70 and mom > 0.05:
+            return R_BULL_STRONG
+        elif conf >= 0.50 and mom > 0:
+            return R_BULL_BUY
+        return R_BULL_HOLD
+    
+    if regime == REG_BEAR:
+        if conf >= 0.60 and mom < -0.05:
+            return R_BEAR_STRONG
+        elif conf >= 0.50 and mom < 0:
+            return R_BEAR_SELL
+        return R_BEAR_HOLD
+    
+    if regime == REG_TRANSITION:
+        if risk < -0.30 and conf >= 0.50:
+            return R_TRANSITION_RISK
+        return R_TRANSITION_WAIT
+    
+    return R_RANGE
+
+
+@njit(cache=True)
+def _contrarian_model_core(regime, conf, mom, risk, rsi, tail):
+    """contrarian_model_action() -> reason (R_*)."""
+    if tail == TAIL_UPSIDE:
+        return R_EUPHORIA_EXIT
+    
+    if tail == TAIL_DOWNSIDE:
+        if rsi < 25:
+            return R_PANIC_ACCUMULATE
+        return R_PANIC_HOLD
+    
+    if rsi > 75 and regime == REG_BULL:
+        return R_OVERBOUGHT
+    
+    if rsi < 30 and regime == REG_BEAR:
+        return R_OVERSOLD_HOLD
+    
+    if conf < 0.35:
+        return R_LOW_CONFIDENCE
+    
+    if regime == REG_BULL:
+        if conf >= 0.60 and mom > 0.05:
+            return R_BULL_STRONG
+        elif conf >= 0.45 and mom > 0:
+            return R_BULL_BUY
+        return R_BULL_HOLD
+    
+    if regime == REG_BEAR:
+        if conf >= 0.65 and mom < -0.08 and rsi > 40:
+            return R_BEAR_STRONG
+        elif conf >= 0.55 and mom < -0.03 and rsi > 35:
+            return R_BEAR_SELL
+        return R_BEAR_HOLD
+    
+    if regime == REG_TRANSITION:
+        if risk < -0.30 and conf >= 0.50 and rsi > 45:
+            return R_TRANSITION_RISK
+        return R_TRANSITION_WAIT
+    
+    return R_RANGE
+
+
+@njit(cache=True, nogil=True)
+def _backtest_loop_core(
+    regime_id, confidence, risk_level, tail, momentum, rsi,
+    model_id, initial_capital, position_pct,
+):
+    """
+    Bar loop of run_backtest() for MODEL_CURRENT / MODEL_CONTRARIAN.
+    
+    Returns equity per bar from bar 50 on (before that bar's action), the
+    final equity, and the trades as parallel arrays: bar index, regime,
+    confidence, momentum, reason (action and size_pct follow from
+    REASONS), trimmed to the trade count.
+    """
+    n = regime_id.shape[0]
+    m = max(n - 50, 0)
+    
+    position = initial_capital * position_pct
+    cash = initial_capital * (1 - position_pct)
+    
+    equity = np.empty(m)
+    
+    t_bar = np.empty(m, np.int64)
+    t_regime = np.empty(m, np.int8)
+    t_conf = np.empty(m)
+    t_mom = np.empty(m)
+    t_reason = np.empty(m, np.int8)
+    n_trades = 0
+    
+    last_action = -1
+    last_bar = -1
+    
+    for i in range(50, n):
+        k = i - 50
+        equity[k] = cash + position
+        
+        regime = regime_id[i]
+        conf = confidence[i]
+        mom = momentum[i]
+        
+        if model_id == MODEL_CURRENT:
+            reason = _current_model_core(
+                regime, conf, mom, risk_level[i], tail[i], last_action, i - last_bar
+            )
+        else:
+            reason = _contrarian_model_core(
+                regime, conf, mom, risk_level[i], rsi[i], tail[i]
+            )
+        
+        action = REASON_ACTION[reason]
+        if action == ACT_HOLD:
+            continue
+        size_pct = REASON_SIZE[reason]
+        
+        traded = False
+        if action == ACT_BUY or action == ACT_STRONG_BUY:
+            buy_amount = cash * abs(size_pct) * 2
+            if buy_amount > cash:
+                buy_amount = cash
+            if buy_amount > 0:
+                position += buy_amount
+                cash -= buy_amount
+                traded = True
+        else:
+            sell_amount = position * abs(size_pct)
+            if sell_amount > position:
+                sell_amount = position
+            if sell_amount > 0:
+                position -= sell_amount
+                cash += sell_amount
+                traded = True
+        
+        if traded:
+            t_bar[n_trades] = i
+            t_regime[n_trades] = regime
+            t_conf[n_trades] = conf
+            t_mom[n_trades] = mom
+            t_reason[n_trades] = reason
+            n_trades += 1
+            
+            last_action = action
+            last_bar = i
+    
+    return (
+        equity, cash + position,
+        t_bar[:n_trades], t_regime[:n_trades], t_conf[:n_trades], t_mom[:n_trades],
+        t_reason[:n_trades],
+    )
+
+
+@njit(cache=True, nogil=True)
+def _sharpe_ratio_core(equity):
+    """
+    Annualized Sharpe of the bar-to-bar equity returns (mean / sample std * sqrt(252)),
+    0 when std is 0 or there are fewer than 2 returns.
+    
+    One Welford pass over equity, no returns array; matches
+    pct_change().mean() / .std() up to rounding.
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(1, equity.shape[0]):
+        r = equity[i] / equity[i - 1] - 1
+        n += 1
+        delta = r - mean
+        mean += delta / n
+        m2 += delta * (r - mean)
+    
+    if n < 2 or m2 <= 0:
+        return 0.0
+    return mean / np.sqrt(m2 / (n - 1)) * np.sqrt(252)
+
+
+# Prefer the AOT-compiled kernels from build_aot.py (no JIT warmup), but only
+# if they were built from this exact file; otherwise use the JIT (or plain
+# Python) versions.
+_SOURCE_CRC = zlib.crc32(Path(__file__).read_bytes())
+try:
+    import backtest_kernel as _aot
+    if _aot.source_crc() != _SOURCE_CRC:
+        _aot = None
+except ImportError:
+    _aot = None
+
+if _aot is not None:
+    _ewm_mean, _wilder_smooth, _floored_price_path, _backtest_loop, _sharpe_ratio = (
+        _aot.ewm_mean, _aot.wilder_smooth, _aot.floored_price_path, _aot.backtest_loop,
+        _aot.sharpe_ratio,
+    )
+else:
+    _ewm_mean, _wilder_smooth, _floored_price_path, _backtest_loop, _sharpe_ratio = (
+        _ewm_mean_core, _wilder_smooth_core, _floored_price_path_core, _backtest_loop_core,
+        _sharpe_ratio_core,
+    )
+
+
 # ══════════════════════════════════════════════════════════════════
 # BACKTEST ENGINE
 # ══════════════════════════════════════════════════════════════════
@@ -348,46 +800,144 @@ def run_backtest(
     df: pd.DataFrame,
     model_func,
     initial_capital: float = 100000,
-    position_pct: float = 0.5  # Start with 50% position
+    position_pct: float = 0.5,  # Start with 50% position
+    ind: Optional[Dict[str, np.ndarray]] = None
 ) -> BacktestResult:
     """
     Run backtest on historical data.
     
     Args:
         df: OHLCV DataFrame
-        model_func: Action function (current_model_action or contrarian_model_action)
+        model_func: Action function (current_model_action or contrarian_model_action;
+            these two run through the compiled _backtest_loop, whose cooldown
+            counts bars - same as days on daily data)
         initial_capital: Starting capital
         position_pct: Initial position size (0-1)
+        ind: precompute_indicators(df), if already computed - the arrays are
+            only read, so several runs on the same df can share one bundle
+    """
+    if ind is None:
+        ind = precompute_indicators(df)
+    
+    model_id = _MODEL_IDS.get(model_func)
+    if model_id is None:
+        trades, equity, final_equity = _simulate_python(df, ind, model_func, initial_capital, position_pct)
+        trades_df = trades_frame(trades)
+    else:
+        trades_df, equity, final_equity = _simulate_compiled(df, ind, model_id, initial_capital, position_pct)
+        trades = trades_from_frame(trades_df)
+    
+    equity_curve = pd.Series(equity, index=df.index[50:].rename('date'), name='equity')
+    
+    # Calculate metrics
+    total_return = (final_equity / initial_capital - 1) * 100
+    
+    # Buy & Hold return
+    buy_hold_return = (df['Close'].iloc[-1] / df['Close'].iloc[50] - 1) * 100
+    
+    alpha = total_return - buy_hold_return
+    
+    # Sharpe Ratio (simplified)
+    sharpe = _sharpe_ratio(equity)
+    
+    # Max Drawdown
+    if len(equity):
+        rolling_max = np.maximum.accumulate(equity)
+        max_drawdown = ((equity - rolling_max) / rolling_max).min() * 100
+    else:
+        max_drawdown = np.nan
+    
+    # Timing analysis
+    close = ind['close']
+    bars = trades_df['bar_idx'].to_numpy()
+    prices = trades_df['price'].to_numpy()
+    is_buy, is_sell = _action_sides(trades_df['action'].array)
+    sells_at_bottom, sells_at_top = _timing_pcts(close, bars[is_sell], prices[is_sell])
+    buys_at_bottom, buys_at_top = _timing_pcts(close, bars[is_buy], prices[is_buy])
+    
+    return BacktestResult(
+        total_return=total_return,
+        buy_hold_return=buy_hold_return,
+        alpha=alpha,
+        sharpe_ratio=sharpe,
+        max_drawdown=max_drawdown,
+        trades=trades,
+        equity_curve=equity_curve,
+        sells_at_bottom_pct=sells_at_bottom,
+        sells_at_top_pct=sells_at_top,
+        buys_at_bottom_pct=buys_at_bottom,
+        buys_at_top_pct=buys_at_top,
+        trades_df=trades_df
+    )
+
+
+def run_backtests(
+    df: pd.DataFrame,
+    model_funcs: List,
+    initial_capital: float = 100000,
+    position_pct: float = 0.5,
+    max_workers: Optional[int] = None,
+    ind: Optional[Dict[str, np.ndarray]] = None
+) -> List[BacktestResult]:
+    """
+    run_backtest() for several models on the same data, results in
+    model_funcs order.
+    
+    The runs are independent, so with max_workers > 1 (default: one per
+    model, capped at the CPU count) they share df in a thread pool; the
+    compiled bar loop releases the GIL. No processes: a ~5 ms backtest is
+    cheaper than spawning a worker and pickling df to it.
+    
+    Indicators are computed once (or taken from ind) and shared by all runs.
+    """
+    if ind is None:
+        ind = precompute_indicators(df)
+    
+    if max_workers is None:
+        max_workers = min(len(model_funcs), os.cpu_count() or 1)
+    
+    def run(model_func):
+        return run_backtest(df, model_func, initial_capital, position_pct, ind)
+    
+    if max_workers <= 1:
+        return [run(f) for f in model_funcs]
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run, model_funcs))
+
+
+def _simulate_python(
+    df: pd.DataFrame,
+    ind: Dict[str, np.ndarray],
+    model_func,
+    initial_capital: float,
+    position_pct: float
+) -> Tuple[List[Trade], np.ndarray, float]:
+    """
+    Bar loop for any model_func.
+    Returns (trades, equity per bar from bar 50 on, final equity).
     """
-    capital = initial_capital
     position = initial_capital * position_pct  # $ in BTC
     cash = initial_capital * (1 - position_pct)
     
     trades: List[Trade] = []
-    equity_curve = []
+    equity = np.empty(max(len(df) - 50, 0))
     
     last_action = None
     last_action_date = None
     
-    # Track local highs/lows for timing analysis
-    window = 30  # 30 day window for local extremes
+    close = ind['close']
+    dates = df.index
     
     for i in range(50, len(df)):
-        current_date = df.index[i]
-        price = df['Close'].iloc[i]
+        current_date = dates[i]
+        price = close[i]
         
-        # Calculate current equity
-        current_equity = cash + position
-        equity_curve.append({
-            'date': current_date,
-            'equity': current_equity,
-            'price': price,
-            'position_value': position,
-            'cash': cash
-        })
+        # Equity before this bar's action
+        equity[i - 50] = cash + position
         
         # Get regime data
-        regime_data = calculate_regime(df, i)
+        regime_data = calculate_regime(ind, i)
         
         # Get action from model
         action, size_pct, reason = model_func(
@@ -399,7 +949,7 @@ def run_backtest(
         
         # Execute action
         if action != "HOLD" and size_pct != 0:
-            if "BUY" in action:
+            if action in _BUY_ACTIONS:
                 # Buy with cash
                 buy_amount = cash * abs(size_pct) * 2  # size_pct is of total, so multiply
                 if buy_amount > cash:
@@ -417,13 +967,14 @@ def run_backtest(
                         confidence=regime_data['confidence'],
                         momentum=regime_data['momentum'],
                         rsi=regime_data['rsi'],
-                        reason=reason
+                        reason=reason,
+                        bar_idx=i
                     ))
                     
                     last_action = action
                     last_action_date = current_date
             
-            elif "SELL" in action:
+            elif action in _SELL_ACTIONS:
                 # Sell position
                 sell_amount = position * abs(size_pct)
                 if sell_amount > position:
@@ -441,100 +992,133 @@ def run_backtest(
                         confidence=regime_data['confidence'],
                         momentum=regime_data['momentum'],
                         rsi=regime_data['rsi'],
-                        reason=reason
+                        reason=reason,
+                        bar_idx=i
                     ))
                     
                     last_action = action
                     last_action_date = current_date
     
-    # Final equity
-    final_equity = cash + position
-    
-    # Create equity DataFrame
-    eq_df = pd.DataFrame(equity_curve)
-    eq_df.set_index('date', inplace=True)
-    
-    # Calculate metrics
-    total_return = (final_equity / initial_capital - 1) * 100
-    
-    # Buy & Hold return
-    buy_hold_return = (df['Close'].iloc[-1] / df['Close'].iloc[50] - 1) * 100
-    
-    alpha = total_return - buy_hold_return
-    
-    # Sharpe Ratio (simplified)
-    if len(eq_df) > 1:
-        daily_returns = eq_df['equity'].pct_change().dropna()
-        if daily_returns.std() > 0:
-            sharpe = daily_returns.mean() / daily_returns.std() * np.sqrt(252)
-        else:
-            sharpe = 0
-    else:
-        sharpe = 0
+    return trades, equity, cash + position
+
+
+def _simulate_compiled(
+    df: pd.DataFrame,
+    ind: Dict[str, np.ndarray],
+    model_id: int,
+    initial_capital: float,
+    position_pct: float
+) -> Tuple[pd.DataFrame, np.ndarray, float]:
+    """
+    _simulate_python() for the built-in models via _backtest_loop();
+    trades come back as a trades_frame()-style DataFrame.
+    """
+    (equity, final_equity,
+     t_bar, t_regime, t_conf, t_mom, t_reason) = _backtest_loop(
+        ind['regime'], ind['confidence'], ind['risk_level'], ind['tail'], ind['momentum'],
+        ind['rsi'], model_id, float(initial_capital), float(position_pct)
+    )
     
-    # Max Drawdown
-    rolling_max = eq_df['equity'].cummax()
-    drawdown = (eq_df['equity'] - rolling_max) / rolling_max
-    max_drawdown = drawdown.min() * 100
+    trades_df = pd.DataFrame({
+        'action': pd.Categorical.from_codes(REASON_ACTION[t_reason], categories=ACTION_NAMES),
+        'price': ind['close'][t_bar],
+        'size_pct': REASON_SIZE[t_reason],
+        'regime': pd.Categorical.from_codes(t_regime, categories=REGIME_NAMES),
+        'confidence': t_conf,
+        'momentum': t_mom,
+        'rsi': ind['rsi'][t_bar],
+        'reason': pd.Categorical.from_codes(t_reason, categories=REASON_NAMES),
+        'bar_idx': t_bar,
+    }, index=df.index[t_bar].rename('date'))
+    
+    return trades_df, equity, final_equity
+
+
+_TRADE_COLUMNS = ('action', 'price', 'size_pct', 'regime', 'confidence', 'momentum', 'rsi', 'reason', 'bar_idx')
+
+
+def trades_frame(trades: List[Trade]) -> pd.DataFrame:
+    """Trades as columns: date index, categorical action/regime/reason."""
+    columns = {name: [getattr(t, name) for t in trades] for name in _TRADE_COLUMNS}
+    for name in ('action', 'regime', 'reason'):
+        columns[name] = pd.Categorical(columns[name])
+    for name in ('price', 'size_pct', 'confidence', 'momentum', 'rsi'):
+        columns[name] = np.array(columns[name], dtype=np.float64)
+    columns['bar_idx'] = np.array(columns['bar_idx'], dtype=np.int64)
+    return pd.DataFrame(columns, index=pd.DatetimeIndex([t.date for t in trades], name='date'))
+
+
+def trades_from_frame(trades_df: pd.DataFrame) -> List[Trade]:
+    """trades_frame() back to Trade objects (one pass over column lists)."""
+    columns = [trades_df[name].tolist() for name in _TRADE_COLUMNS]
+    return [
+        Trade(date, action, price, size_pct, regime, confidence, momentum, rsi, reason, bar_idx)
+        for date, action, price, size_pct, regime, confidence, momentum, rsi, reason, bar_idx
+        in zip(trades_df.index.tolist(), *columns)
+    ]
+
+
+def _action_sides(actions: pd.Categorical) -> Tuple[np.ndarray, np.ndarray]:
+    """(is_buy, is_sell) masks per trade, by action category."""
+    categories = actions.categories
+    buy = categories.isin(_BUY_ACTIONS)
+    sell = categories.isin(_SELL_ACTIONS)
+    codes = actions.codes
+    return buy[codes], sell[codes]
+
+
+def _range_positions(close: np.ndarray, bars: np.ndarray, prices: np.ndarray, window: int) -> np.ndarray:
+    """
+    Where each trade price sits in the close range of bars
+    [bar - window, bar + window): 0 = local min, 1 = local max,
+    NaN when the range is flat.
+    """
+    # NaN padding stands in for the clipped window edges; fmin/fmax skip it
+    padded = np.concatenate((np.full(window, np.nan), close, np.full(window - 1, np.nan)))
+    windows = sliding_window_view(padded, 2 * window)[bars]
+    local_min = np.fmin.reduce(windows, axis=1)
+    local_max = np.fmax.reduce(windows, axis=1)
+    price_range = local_max - local_min
+    
+    position = np.full(len(bars), np.nan)
+    ok = price_range != 0
+    position[ok] = (prices[ok] - local_min[ok]) / price_range[ok]
+    return position
+
+
+def _timing_pcts(close: np.ndarray, bars: np.ndarray, prices: np.ndarray, window: int = 30) -> Tuple[float, float]:
+    """(pct_at_bottom, pct_at_top): trades in the bottom / top 20% of their window."""
+    if len(bars) == 0:
+        return (0, 0)
     
-    # Timing analysis
-    sells_at_bottom, sells_at_top = analyze_sell_timing(trades, df)
-    buys_at_bottom, buys_at_top = analyze_buy_timing(trades, df)
+    position_in_range = _range_positions(np.asarray(close, dtype=np.float64), bars, prices, window)
+    at_bottom = int(np.count_nonzero(position_in_range < 0.20))
+    at_top = int(np.count_nonzero(position_in_range > 0.80))
     
-    return BacktestResult(
-        total_return=total_return,
-        buy_hold_return=buy_hold_return,
-        alpha=alpha,
-        sharpe_ratio=sharpe,
-        max_drawdown=max_drawdown,
-        trades=trades,
-        equity_curve=eq_df['equity'],
-        sells_at_bottom_pct=sells_at_bottom,
-        sells_at_top_pct=sells_at_top,
-        buys_at_bottom_pct=buys_at_bottom,
-        buys_at_top_pct=buys_at_top
+    return (
+        at_bottom / len(bars) * 100,
+        at_top / len(bars) * 100
     )
 
 
+def _trade_bars(trades: List[Trade], df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """(bar index, price) arrays; trades without bar_idx are looked up by date."""
+    bars = np.array([t.bar_idx for t in trades], dtype=np.int64)
+    unknown = bars < 0
+    if unknown.any():
+        bars[unknown] = df.index.get_indexer([t.date for t, u in zip(trades, unknown) if u])
+    prices = np.array([t.price for t in trades], dtype=np.float64)
+    return bars, prices
+
+
 def analyze_sell_timing(trades: List[Trade], df: pd.DataFrame, window: int = 30) -> Tuple[float, float]:
     """
     Analyze if sells happened near local bottoms or tops.
     Returns: (pct_at_bottom, pct_at_top)
     """
-    sell_trades = [t for t in trades if "SELL" in t.action]
-    if not sell_trades:
-        return (0, 0)
-    
-    at_bottom = 0
-    at_top = 0
-    
-    for trade in sell_trades:
-        idx = df.index.get_loc(trade.date)
-        
-        # Get window around trade
-        start = max(0, idx - window)
-        end = min(len(df), idx + window)
-        
-        window_prices = df['Close'].iloc[start:end]
-        local_min = window_prices.min()
-        local_max = window_prices.max()
-        price_range = local_max - local_min
-        
-        if price_range == 0:
-            continue
-        
-        # Where in the range was the sell?
-        position_in_range = (trade.price - local_min) / price_range
-        
-        if position_in_range < 0.20:  # Bottom 20%
-            at_bottom += 1
-        elif position_in_range > 0.80:  # Top 20%
-            at_top += 1
-    
-    return (
-        at_bottom / len(sell_trades) * 100,
-        at_top / len(sell_trades) * 100
-    )
+    sell_trades = [t for t in trades if t.action in _SELL_ACTIONS]
+    bars, prices = _trade_bars(sell_trades, df)
+    return _timing_pcts(df['Close'].to_numpy(), bars, prices, window)
 
 
 def analyze_buy_timing(trades: List[Trade], df: pd.DataFrame, window: int = 30) -> Tuple[float, float]:
@@ -542,38 +1126,9 @@ def analyze_buy_timing(trades: List[Trade], df: pd.DataFrame, window: int = 30)
     Analyze if buys happened near local bottoms or tops.
     Returns: (pct_at_bottom, pct_at_top)
     """
-    buy_trades = [t for t in trades if "BUY" in t.action]
-    if not buy_trades:
-        return (0, 0)
-    
-    at_bottom = 0
-    at_top = 0
-    
-    for trade in buy_trades:
-        idx = df.index.get_loc(trade.date)
-        
-        start = max(0, idx - window)
-        end = min(len(df), idx + window)
-        
-        window_prices = df['Close'].iloc[start:end]
-        local_min = window_prices.min()
-        local_max = window_prices.max()
-        price_range = local_max - local_min
-        
-        if price_range == 0:
-            continue
-        
-        position_in_range = (trade.price - local_min) / price_range
-        
-        if position_in_range < 0.20:
-            at_bottom += 1
-        elif position_in_range > 0.80:
-            at_top += 1
-    
-    return (
-        at_bottom / len(buy_trades) * 100,
-        at_top / len(buy_trades) * 100
-    )
+    buy_trades = [t for t in trades if t.action in _BUY_ACTIONS]
+    bars, prices = _trade_bars(buy_trades, df)
+    return _timing_pcts(df['Close'].to_numpy(), bars, prices, window)
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -589,46 +1144,31 @@ def generate_mock_btc_data(days: int = 1000) -> pd.DataFrame:
     
     dates = pd.date_range(end=datetime.now(), periods=days, freq='D')
     
-    # Start price
-    price = 20000
-    prices = [price]
-    
     # Simulate cycles
     cycle_length = 200
+    cycle_position = (np.arange(1, days) % cycle_length) / cycle_length
     
-    for i in range(1, days):
-        # Trend component (cycles)
-        cycle_position = (i % cycle_length) / cycle_length
-        
-        if cycle_position < 0.4:
-            # Bull phase
-            trend = 0.002
-        elif cycle_position < 0.6:
-            # Top / distribution
-            trend = 0.0001
-        elif cycle_position < 0.85:
-            # Bear phase
-            trend = -0.0025
-        else:
-            # Bottom / accumulation
-            trend = 0.0005
-        
-        # Volatility
-        volatility = 0.03
-        noise = np.random.normal(0, volatility)
-        
-        # Calculate new price
-        price = prices[-1] * (1 + trend + noise)
-        price = max(price, 10000)  # Floor
-        prices.append(price)
+    # Trend component: bull / top (distribution) / bear / bottom (accumulation)
+    trend = np.select(
+        [cycle_position < 0.4, cycle_position < 0.6, cycle_position < 0.85],
+        [0.002, 0.0001, -0.0025],
+        default=0.0005
+    )
+    
+    # Volatility (same draws, in the same order, as one normal() per day)
+    volatility = 0.03
+    noise = np.random.normal(0, volatility, days - 1)
+    
+    # Start price 20000, floor 10000
+    prices = _floored_price_path(20000.0, 1 + trend + noise, 10000.0)
     
     # Create OHLCV
     df = pd.DataFrame({
         'Open': prices,
         'Close': prices,
-        'High': [p * (1 + abs(np.random.normal(0, 0.02))) for p in prices],
-        'Low': [p * (1 - abs(np.random.normal(0, 0.02))) for p in prices],
-        'Volume': [np.random.uniform(1e9, 5e9) for _ in prices]
+        'High': prices * (1 + np.abs(np.random.normal(0, 0.02, days))),
+        'Low': prices * (1 - np.abs(np.random.normal(0, 0.02, days))),
+        'Volume': np.random.uniform(1e9, 5e9, days)
     }, index=dates)
     
     # Smooth high/low
@@ -638,6 +1178,52 @@ def generate_mock_btc_data(days: int = 1000) -> pd.DataFrame:
     return df
 
 
+# One download per UTC day; older files are replaced
+PRICE_CACHE_DIR = Path("state")
+
+
+def load_btc_history(period: str = "3y") -> Optional[pd.DataFrame]:
+    """
+    BTC-USD daily bars from yfinance, cached on disk for the UTC day.
+    
+    Parquet when pyarrow/fastparquet is installed, pickle otherwise.
+    Returns None if the data is unavailable.
+    """
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%d')
+    prefix = f"btc-usd-{period}-"
+    
+    for path in (PRICE_CACHE_DIR / f"{prefix}{stamp}.parquet", PRICE_CACHE_DIR / f"{prefix}{stamp}.pkl"):
+        if not path.exists():
+            continue
+        try:
+            if path.suffix == '.parquet':
+                return pd.read_parquet(path)
+            return pd.read_pickle(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable price cache {path}: {e}")
+    
+    try:
+        df = yf.download("BTC-USD", period=period, progress=False)
+    except Exception as e:
+        logger.warning(f"Could not fetch real data: {e}")
+        return None
+    if df is None or df.empty:
+        return None
+    
+    try:
+        PRICE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for old in PRICE_CACHE_DIR.glob(f"{prefix}*"):
+            old.unlink()
+        try:
+            df.to_parquet(PRICE_CACHE_DIR / f"{prefix}{stamp}.parquet")
+        except ImportError:
+            df.to_pickle(PRICE_CACHE_DIR / f"{prefix}{stamp}.pkl")
+    except Exception as e:
+        logger.warning(f"Could not cache price data: {e}")
+    
+    return df
+
+
 def main():
     print("=" * 60)
     print("ASSET ALLOCATION MODEL BACKTEST")
@@ -646,14 +1232,7 @@ def main():
     # Try to fetch historical BTC data
     print("\nFetching BTC-USD data (3 years)...")
     
-    df = None
-    try:
-        df = yf.download("BTC-USD", period="3y", progress=False)
-        if df.empty:
-            df = None
-    except Exception as e:
-        logger.warning(f"Could not fetch real data: {e}")
-        df = None
+    df = load_btc_history("3y")
     
     if df is None or df.empty:
         print("⚠️ Real data unavailable, using simulated BTC data...")
@@ -663,13 +1242,17 @@ def main():
         print(f"Data: {df.index[0].strftime('%Y-%m-%d')} to {df.index[-1].strftime('%Y-%m-%d')}")
     print(f"Total days: {len(df)}")
     
-    # Run backtest: CURRENT MODEL
+    # Indicators once, shared by both models
+    ind = precompute_indicators(df)
+    result_current, result_contrarian = run_backtests(
+        df, [current_model_action, contrarian_model_action], ind=ind
+    )
+    
+    # CURRENT MODEL
     print("\n" + "=" * 60)
     print("MODEL 1: CURRENT (v1.3.1 Conservative)")
     print("=" * 60)
     
-    result_current = run_backtest(df, current_model_action)
-    
     print(f"\nTotal Return: {result_current.total_return:+.1f}%")
     print(f"Buy & Hold:   {result_current.buy_hold_return:+.1f}%")
     print(f"Alpha:        {result_current.alpha:+.1f}%")
@@ -689,13 +1272,11 @@ def main():
         print(f"  {trade.date.strftime('%Y-%m-%d')} | {trade.action:12} @ ${trade.price:,.0f} | "
               f"RSI: {trade.rsi:.0f} | {trade.reason}")
     
-    # Run backtest: CONTRARIAN MODEL
+    # CONTRARIAN MODEL
     print("\n" + "=" * 60)
     print("MODEL 2: CONTRARIAN (v2 proposal)")
     print("=" * 60)
     
-    result_contrarian = run_backtest(df, contrarian_model_action)
-    
     print(f"\nTotal Return: {result_contrarian.total_return:+.1f}%")
     print(f"Buy & Hold:   {result_contrarian.buy_hold_return:+.1f}%")
     print(f"Alpha:        {result_contrarian.alpha:+.1f}%")
@@ -17,20 +17,51 @@ Compares:
 
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 from dataclasses import dataclass
 from typing import List, Dict, Tuple
 import json
+import zlib
+from pathlib import Path
+
+from _njit import njit, prange
 
 np.random.seed(42)
 
+# Price paths for the Monte Carlo section of main()
+MC_SCENARIOS = 100
+
+# Daily <-> annualized volatility (365 trading days a year for BTC)
+_SQRT365 = np.sqrt(365.0)
+
 
 # ══════════════════════════════════════════════════════════════════
 # DATA GENERATION
 # ══════════════════════════════════════════════════════════════════
 
-def generate_btc_data() -> pd.DataFrame:
-    """Generate realistic BTC price data."""
+@njit(cache=True)
+def _phase_path_core(start_p, end_p, days, shocks):
+    """
+    One generate_btc_data() phase: from start_p, drift 10% of the way to the
+    straight line towards end_p each day plus shocks[d - 1], floored at 10000.
+    """
+    prices = np.empty(days)
+    prices[0] = start_p
+    for d in range(1, days):
+        progress = d / days
+        target = start_p + (end_p - start_p) * progress
+        drift = 0.1 * (target - prices[d - 1]) / prices[d - 1]
+        prices[d] = max(prices[d - 1] * (1 + drift + shocks[d - 1]), 10000.0)
+    return prices
+
+
+def generate_btc_data(rng=None) -> pd.DataFrame:
+    """
+    Generate realistic BTC price data.
+    
+    Draws from np.random, or from rng (e.g. a RandomState) for independent paths.
+    """
+    rng = np.random if rng is None else rng
     phases = [
         ("Bull", 120, 40000, 65000, 0.03),
         ("Range 1", 60, 65000, 60000, 0.02),
@@ -43,90 +74,325 @@ def generate_btc_data() -> pd.DataFrame:
         ("Distribution", 60, 75000, 65000, 0.03),
     ]
     
-    all_prices, all_dates = [], []
-    current_date = datetime(2022, 1, 1)
+    all_prices = []
     
     for _, days, start_p, end_p, vol in phases:
-        prices = [start_p]
-        for d in range(1, days):
-            progress = d / days
-            target = start_p + (end_p - start_p) * progress
-            drift = 0.1 * (target - prices[-1]) / prices[-1]
-            prices.append(max(prices[-1] * (1 + drift + np.random.normal(0, vol)), 10000))
+        prices = _phase_path(float(start_p), float(end_p), days, rng.normal(0, vol, days - 1))
         
+        # Pull the path onto end_p, linearly over the phase
         adj = end_p / prices[-1]
-        prices = [p * (1 + (adj - 1) * (i / len(prices))) for i, p in enumerate(prices)]
+        prices *= 1 + (adj - 1) * (np.arange(days) / days)
+        all_prices.append(prices)
+    
+    close = np.concatenate(all_prices)
+    dates = pd.date_range(datetime(2022, 1, 1), periods=len(close), freq='D', name='date')
+    return pd.DataFrame({'close': close}, index=dates)
+
+
+# regime_code / tail_polarity_code values (the *_NAMES tuples map them back)
+REGIME_NAMES = ("RANGE", "BULL", "BEAR", "TRANSITION")
+REG_RANGE, REG_BULL, REG_BEAR, REG_TRANSITION = range(len(REGIME_NAMES))
+
+TAIL_POLARITY_NAMES = ("none", "downside")
+TAIL_NONE, TAIL_DOWNSIDE = range(len(TAIL_POLARITY_NAMES))
+
+
+# pandas' rolling-mean state: nobs, neg_ct, sum, add/remove compensations,
+# run length of equal values, last value (see _roll_mean_add / _roll_mean_value)
+_ROLL_MEAN_STATE = 7
+
+
+@njit(cache=True)
+def _roll_mean_add(st, v):
+    if np.isnan(v):
+        return
+    st[0] += 1
+    y = v - st[3]
+    t = st[2] + y
+    st[3] = t - st[2] - y
+    st[2] = t
+    if np.signbit(v):
+        st[1] += 1
+    if v == st[6]:
+        st[5] += 1
+    else:
+        st[5] = 1
+    st[6] = v
+
+
+@njit(cache=True)
+def _roll_mean_remove(st, v):
+    if np.isnan(v):
+        return
+    st[0] -= 1
+    y = -v - st[4]
+    t = st[2] + y
+    st[4] = t - st[2] - y
+    st[2] = t
+    if np.signbit(v):
+        st[1] -= 1
+
+
+@njit(cache=True)
+def _roll_mean_value(st, window):
+    nobs = st[0]
+    if nobs < window or nobs <= 0:
+        return np.nan
+    result = st[2] / nobs
+    if st[5] >= nobs:
+        result = st[6]
+    elif st[1] == 0 and result < 0:
+        result = 0.0
+    elif st[1] == nobs and result > 0:
+        result = 0.0
+    return result
+
+
+@njit(cache=True)
+def _rolling_mean_core(values, window):
+    """values.rolling(window).mean(), same arithmetic as pandas."""
+    n = values.shape[0]
+    out = np.empty(n)
+    st = np.zeros(_ROLL_MEAN_STATE)
+    if n:
+        st[6] = values[0]
+    for i in range(n):
+        if i >= window:
+            _roll_mean_remove(st, values[i - window])
+        _roll_mean_add(st, values[i])
+        out[i] = _roll_mean_value(st, window)
+    return out
+
+
+# pandas' rolling-variance state (Welford with Kahan-compensated mean): nobs,
+# mean, sum of squared deviations, add/remove compensations, run length of
+# equal values, last value
+_ROLL_VAR_STATE = 7
+
+
+@njit(cache=True)
+def _roll_var_add(st, v):
+    if np.isnan(v):
+        return
+    st[0] += 1
+    if v == st[6]:
+        st[5] += 1
+    else:
+        st[5] = 1
+    st[6] = v
+    
+    prev_mean = st[1] - st[3]
+    y = v - st[3]
+    t = y - st[1]
+    st[3] = t + st[1] - y
+    st[1] = st[1] + t / st[0]
+    st[2] = st[2] + (v - prev_mean) * (v - st[1])
+
+
+@njit(cache=True)
+def _roll_var_remove(st, v):
+    if np.isnan(v):
+        return
+    st[0] -= 1
+    if st[0]:
+        prev_mean = st[1] - st[4]
+        y = v - st[4]
+        t = y - st[1]
+        st[4] = t + st[1] - y
+        st[1] = st[1] - t / st[0]
+        st[2] = st[2] - (v - prev_mean) * (v - st[1])
+    else:
+        st[1] = 0.0
+        st[2] = 0.0
+
+
+@njit(cache=True)
+def _rolling_std_core(values, window):
+    """
+    values.rolling(window).std() (ddof=1), following pandas' update order.
+    
+    Bit-identical for the 30/90-bar windows used here; very short windows can
+    still land an ulp away from pandas.
+    """
+    n = values.shape[0]
+    out = np.empty(n)
+    st = np.zeros(_ROLL_VAR_STATE)
+    if n:
+        st[6] = values[0]
+    for i in range(n):
+        if i >= window:
+            _roll_var_remove(st, values[i - window])
+        _roll_var_add(st, values[i])
         
-        for i, p in enumerate(prices):
-            all_prices.append(p)
-            all_dates.append(current_date + timedelta(days=i))
-        current_date = all_dates[-1] + timedelta(days=1)
+        nobs = st[0]
+        if nobs >= window and nobs > 1:
+            var = 0.0 if st[5] >= nobs else st[2] / (nobs - 1)
+            out[i] = np.sqrt(var) if var > 0 else 0.0
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(cache=True)
+def _rsi_core(close, window):
+    """
+    RSI on simple `window`-bar means of gains / losses, in one pass.
+    
+    Same arithmetic as pandas' Series.rolling(window).mean() (Kahan-compensated
+    running sums and its exact-result fixups), so the values equal
+    delta.where(...).rolling(window).mean() bit for bit.
+    """
+    n = close.shape[0]
+    rsi = np.empty(n)
+    gain = np.empty(n)
+    loss = np.empty(n)
+    gain_st = np.zeros(_ROLL_MEAN_STATE)
+    loss_st = np.zeros(_ROLL_MEAN_STATE)
+    
+    for i in range(n):
+        # delta.where(delta > 0, 0) / -delta.where(delta < 0, 0); delta[0] is NaN
+        delta = close[i] - close[i - 1] if i > 0 else np.nan
+        gain[i] = delta if delta > 0 else 0.0
+        loss[i] = -delta if delta < 0 else -0.0
+        if i == 0:
+            gain_st[6] = gain[0]
+            loss_st[6] = loss[0]
+        
+        if i >= window:
+            _roll_mean_remove(gain_st, gain[i - window])
+            _roll_mean_remove(loss_st, loss[i - window])
+        _roll_mean_add(gain_st, gain[i])
+        _roll_mean_add(loss_st, loss[i])
+        
+        g = _roll_mean_value(gain_st, window)
+        l = _roll_mean_value(loss_st, window)
+        rsi[i] = 100 - (100 / (1 + g / (l + 1e-10)))
     
-    df = pd.DataFrame({'date': all_dates, 'close': all_prices})
-    df.set_index('date', inplace=True)
-    return df
+    return rsi
+
+
+def _pct_change(close: np.ndarray, periods: int) -> np.ndarray:
+    """Series.pct_change(periods) on an array: NaN for the first `periods` rows."""
+    out = np.full(close.shape[0], np.nan)
+    out[periods:] = close[periods:] / close[:-periods] - 1
+    return out
 
 
 def compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """Compute all indicators."""
     df = df.copy()
+    close = df['close'].to_numpy(dtype=np.float64)
     
-    df['returns_1d'] = df['close'].pct_change()
-    df['returns_7d'] = df['close'].pct_change(7)
-    df['returns_30d'] = df['close'].pct_change(30)
-    df['volatility'] = df['returns_1d'].rolling(30).std() * np.sqrt(365)
-    df['vol_z'] = (df['volatility'] - df['volatility'].rolling(90).mean()) / \
-                  (df['volatility'].rolling(90).std() + 1e-10)
+    df['returns_1d'] = _pct_change(close, 1)
+    df['returns_7d'] = _pct_change(close, 7)
+    df['returns_30d'] = _pct_change(close, 30)
+    volatility = _rolling_std(df['returns_1d'].to_numpy(), 30) * _SQRT365
+    df['volatility'] = volatility
+    df['vol_z'] = (volatility - _rolling_mean(volatility, 90)) / \
+                  (_rolling_std(volatility, 90) + 1e-10)
     
     df['ema_20'] = df['close'].ewm(span=20).mean()
     df['ema_50'] = df['close'].ewm(span=50).mean()
     
-    df['momentum'] = 0.0
-    df.loc[df['close'] > df['ema_20'], 'momentum'] += 0.25
-    df.loc[df['ema_20'] > df['ema_50'], 'momentum'] += 0.25
-    df.loc[df['close'] < df['ema_20'], 'momentum'] -= 0.25
-    df.loc[df['ema_20'] < df['ema_50'], 'momentum'] -= 0.25
-    df.loc[df['returns_7d'] > 0.03, 'momentum'] += 0.25
-    df.loc[df['returns_7d'] < -0.03, 'momentum'] -= 0.25
-    df['momentum'] = df['momentum'].clip(-1, 1)
+    ema_20 = df['ema_20'].to_numpy()
+    ema_50 = df['ema_50'].to_numpy()
+    ret7 = df['returns_7d'].to_numpy()
     
-    df['direction'] = np.sign(df['returns_1d'])
-    df['persistence'] = df['direction'].rolling(14).apply(
-        lambda x: abs(x.sum()) / len(x), raw=True
+    # +-0.25 per condition (multiples of 0.25, so the sum is exact)
+    momentum = 0.25 * (
+        (close > ema_20).astype(np.float64) + (ema_20 > ema_50) - (close < ema_20)
+        - (ema_20 < ema_50) + (ret7 > 0.03) - (ret7 < -0.03)
     )
+    momentum = np.clip(momentum, -1, 1)
+    df['momentum'] = momentum
     
-    df['regime'] = 'RANGE'
-    df.loc[df['momentum'] > 0.3, 'regime'] = 'BULL'
-    df.loc[df['momentum'] < -0.3, 'regime'] = 'BEAR'
-    df.loc[(df['momentum'].abs() < 0.2) & (df['vol_z'] > 1), 'regime'] = 'TRANSITION'
+    df['direction'] = np.sign(df['returns_1d'])
+    # |sum of the last 14 directions| / 14; the sums are small integers, so
+    # the rolling sum is exact
+    df['persistence'] = df['direction'].rolling(14).sum().abs() / 14
+    
+    regime_code = np.select(
+        [momentum > 0.3, momentum < -0.3, (np.abs(momentum) < 0.2) & (df['vol_z'].to_numpy() > 1)],
+        [REG_BULL, REG_BEAR, REG_TRANSITION],
+        default=REG_RANGE
+    ).astype(np.int8)
+    df['regime'] = np.array(REGIME_NAMES)[regime_code]
+    df['regime_code'] = regime_code
     
     df['confidence'] = (0.5 + df['momentum'].abs() * 0.3).clip(0.2, 0.85)
     
-    delta = df['close'].diff()
-    gain = delta.where(delta > 0, 0).rolling(14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-    df['rsi'] = 100 - (100 / (1 + gain / (loss + 1e-10)))
+    df['rsi'] = _rsi(close, 14)
     
     df['tail_risk'] = (df['rsi'] < 25) | (df['rsi'] > 80) | (df['vol_z'] > 2)
-    df['tail_polarity'] = 'none'
-    df.loc[(df['tail_risk']) & (df['momentum'] < 0), 'tail_polarity'] = 'downside'
+    tail_code = np.where(
+        df['tail_risk'].to_numpy() & (momentum < 0), TAIL_DOWNSIDE, TAIL_NONE
+    ).astype(np.int8)
+    df['tail_polarity'] = np.array(TAIL_POLARITY_NAMES)[tail_code]
+    df['tail_polarity_code'] = tail_code
     
     return df.dropna()
 
 
+def _extract_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    compute_indicators() columns as plain arrays for the compiled loops:
+    float64 values, the int8 REG_* / TAIL_* code columns, and day = whole
+    days since df.index[0] (for the AA cooldowns).
+    
+    Values stay float64: float32 volatility moves the LP fees (and every
+    metric after them), the AA thresholds see the same risk, and a few
+    hundred rows x 10 columns fit in cache either way.
+    """
+    return {
+        'close': df['close'].to_numpy(dtype=np.float64),
+        'day': np.asarray((df.index - df.index[0]).days, dtype=np.int64),
+        'regime': df['regime_code'].to_numpy(dtype=np.int8),
+        'confidence': df['confidence'].to_numpy(dtype=np.float64),
+        'momentum': df['momentum'].to_numpy(dtype=np.float64),
+        'tail_risk': df['tail_risk'].to_numpy(dtype=np.bool_),
+        'tail_polarity': df['tail_polarity_code'].to_numpy(dtype=np.int8),
+        'vol_z': df['vol_z'].to_numpy(dtype=np.float64),
+        'returns_30d': df['returns_30d'].to_numpy(dtype=np.float64),
+        'returns_7d': df['returns_7d'].to_numpy(dtype=np.float64),
+        'persistence': df['persistence'].to_numpy(dtype=np.float64),
+        'volatility': df['volatility'].to_numpy(dtype=np.float64),
+    }
+
+
 # ══════════════════════════════════════════════════════════════════
 # ASSET ALLOCATION v1.4.1
 # ══════════════════════════════════════════════════════════════════
 
-def aa_v141(row, position, last_action, days_since):
-    """Asset Allocation v1.4.1 with counter-cyclical logic."""
-    regime = row['regime']
-    conf = row['confidence']
-    mom = row['momentum']
-    tail = row['tail_risk']
-    tail_pol = row['tail_polarity']
-    vol_z = row['vol_z'] if not np.isnan(row['vol_z']) else 0
-    ret30 = row['returns_30d'] if not np.isnan(row['returns_30d']) else 0
+# Codes for the compiled loops; ACTION_NAMES / REASON_NAMES map them back.
+# Actions are bit flags: buy / sell side plus ACT_STRONG.
+ACT_HOLD, ACT_BUY, ACT_SELL, ACT_STRONG = 0, 0b001, 0b010, 0b100
+ACT_STRONG_BUY = ACT_STRONG | ACT_BUY
+ACT_STRONG_SELL = ACT_STRONG | ACT_SELL
+ACTION_NAMES = {
+    ACT_HOLD: "HOLD", ACT_BUY: "BUY", ACT_SELL: "SELL",
+    ACT_STRONG_BUY: "STRONG_BUY", ACT_STRONG_SELL: "STRONG_SELL",
+}
+
+REASON_NAMES = (
+    "hold", "panic_protect", "tail", "conf", "cd",
+    "euphoria", "bull", "panic_hold", "bear", "trans",
+)
+(R_HOLD, R_PANIC_PROTECT, R_TAIL, R_CONF, R_CD,
+ R_EUPHORIA, R_BULL, R_PANIC_HOLD, R_BEAR, R_TRANS) = range(len(REASON_NAMES))
+
+
+@njit(cache=True)
+def aa_v141(regime, conf, mom, tail, tail_pol, vol_z, ret30, last_action, days_since):
+    """
+    Asset Allocation v1.4.1 with counter-cyclical logic.
+    
+    One day's values: regime / tail_pol as REG_* / TAIL_* codes, last_action
+    as ACT_*, days_since in days. Returns (ACT_* action, size, R_* reason).
+    """
+    if np.isnan(vol_z):
+        vol_z = 0.0
+    if np.isnan(ret30):
+        ret30 = 0.0
     
     # Panic detection (v1.4.1 tuned)
     is_panic = (
@@ -136,93 +402,130 @@ def aa_v141(row, position, last_action, days_since):
     )
     
     # Counter-cyclical: don't sell panic
-    if tail and tail_pol == 'downside':
+    if tail and tail_pol == TAIL_DOWNSIDE:
         if is_panic:
-            return "HOLD", 0, "panic_protect"
-        return "STRONG_SELL", -0.50, "tail"
+            return ACT_HOLD, 0.0, R_PANIC_PROTECT
+        return ACT_STRONG_SELL, -0.50, R_TAIL
     
     # Standard logic
     if conf < 0.40:
-        return "HOLD", 0, "conf"
-    if last_action == "BUY" and days_since < 3:
-        return "HOLD", 0, "cd"
-    if last_action == "SELL" and days_since < 7:
-        return "HOLD", 0, "cd"
-    if "STRONG" in last_action and days_since < 14:
-        return "HOLD", 0, "cd"
-    
-    if regime == "BULL":
+        return ACT_HOLD, 0.0, R_CONF
+    if last_action == ACT_BUY and days_since < 3:
+        return ACT_HOLD, 0.0, R_CD
+    if last_action == ACT_SELL and days_since < 7:
+        return ACT_HOLD, 0.0, R_CD
+    if last_action & ACT_STRONG and days_since < 14:
+        return ACT_HOLD, 0.0, R_CD
+    
+    if regime == REG_BULL:
         if mom > 0.70:  # Don't buy euphoria
-            return "HOLD", 0, "euphoria"
+            return ACT_HOLD, 0.0, R_EUPHORIA
         if conf >= 0.70 and mom > 0.50:
-            return "STRONG_BUY", 0.20, "bull"
+            return ACT_STRONG_BUY, 0.20, R_BULL
         elif conf >= 0.50 and mom > 0:
-            return "BUY", 0.10, "bull"
-    elif regime == "BEAR":
+            return ACT_BUY, 0.10, R_BULL
+    elif regime == REG_BEAR:
         if is_panic:
-            return "HOLD", 0, "panic_hold"
+            return ACT_HOLD, 0.0, R_PANIC_HOLD
         if conf >= 0.60 and mom < -0.50:
-            return "SELL", -0.30, "bear"
+            return ACT_SELL, -0.30, R_BEAR
         elif conf >= 0.50 and mom < 0:
-            return "SELL", -0.15, "bear"
-    elif regime == "TRANSITION":
+            return ACT_SELL, -0.15, R_BEAR
+    elif regime == REG_TRANSITION:
         if mom < -0.30 and conf >= 0.50 and not is_panic:
-            return "SELL", -0.10, "trans"
+            return ACT_SELL, -0.10, R_TRANS
     
-    return "HOLD", 0, "hold"
+    return ACT_HOLD, 0.0, R_HOLD
 
 
 # ══════════════════════════════════════════════════════════════════
 # LP POLICY v2.0.2
 # ══════════════════════════════════════════════════════════════════
 
-def lp_v202(row):
-    """LP Policy v2.0.2 with conservative trend management."""
-    regime = row['regime']
-    persistence = row['persistence'] if not np.isnan(row['persistence']) else 0.5
-    momentum = abs(row['momentum'])
-    ret7 = abs(row['returns_7d']) if not np.isnan(row['returns_7d']) else 0
-    vol_z = row['vol_z'] if not np.isnan(row['vol_z']) else 0
+def lp_v202(
+    regime: np.ndarray,
+    persistence: np.ndarray,
+    momentum: np.ndarray,
+    ret7: np.ndarray,
+    vol_z: np.ndarray
+) -> np.ndarray:
+    """
+    LP Policy v2.0.2 with conservative trend management.
+    
+    Whole-series version: per-day arrays in (regime as REG_* codes), the LP
+    exposure for every day out.
+    """
+    persistence = np.where(np.isnan(persistence), 0.5, persistence)
+    momentum = np.abs(momentum)
+    ret7 = np.where(np.isnan(ret7), 0.0, np.abs(ret7))
+    vol_z = np.where(np.isnan(vol_z), 0.0, vol_z)
     
     # Strong trend detection (v2.0.2)
-    is_strong_trend = persistence > 0.45 or momentum > 0.5 or ret7 > 0.05
-    is_weak_trend = persistence > 0.35 or momentum > 0.3
+    is_strong_trend = (persistence > 0.45) | (momentum > 0.5) | (ret7 > 0.05)
+    is_weak_trend = (persistence > 0.35) | (momentum > 0.3)
     
     # v2.0.2 conservative exposure
-    if regime == "RANGE" and not is_weak_trend:
-        exposure = 0.60
-    elif regime == "RANGE" and is_weak_trend:
-        exposure = 0.30
-    elif is_strong_trend:
-        exposure = 0.10  # Minimal in strong trends
-    elif is_weak_trend:
-        exposure = 0.20
-    else:
-        exposure = 0.40
+    is_range = regime == REG_RANGE
+    exposure = np.select(
+        [is_range & ~is_weak_trend, is_range, is_strong_trend, is_weak_trend],
+        [0.60, 0.30, 0.10, 0.20],  # 0.10: minimal in strong trends
+        default=0.40
+    )
     
     # Gap risk adjustment
-    if vol_z > 2.0:
-        exposure *= 0.5
+    exposure = np.where(vol_z > 2.0, exposure * 0.5, exposure)
     
-    return {'exposure': min(0.80, max(0.05, exposure))}
+    return np.clip(exposure, 0.05, 0.80)
 
 
 def calculate_il(p1, p2):
-    if p1 <= 0 or p2 <= 0:
-        return 0
-    r = p2 / p1
-    return 2 * np.sqrt(r) / (1 + r) - 1
+    """IL for a move from p1 to p2 (scalars or arrays); 0 where a price is not positive."""
+    p1 = np.asarray(p1, dtype=np.float64)
+    p2 = np.asarray(p2, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = p2 / p1
+        il = 2 * np.sqrt(r) / (1 + r) - 1
+    return np.where((p1 <= 0) | (p2 <= 0), 0.0, il)
 
 
 def calculate_fees(vol):
-    daily_vol = vol / np.sqrt(365) if vol > 0 else 0
-    return min(daily_vol * 0.003, 0.01)
+    """Daily fee rate for annualized vol (scalars or arrays)."""
+    vol = np.asarray(vol, dtype=np.float64)
+    daily_vol = np.where(vol > 0, vol / _SQRT365, 0.0)
+    return np.minimum(daily_vol * 0.003, 0.01)
+
+
+def _lp_daily(close: np.ndarray, volatility: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-day LP inputs that don't depend on the LP value: (IL vs the previous
+    close, value growth 1 + IL + half the price move, fee rate). Day 0 has no
+    previous close and is never used by the loops.
+    """
+    prev = np.empty_like(close)
+    prev[0] = np.nan
+    prev[1:] = close[:-1]
+    
+    daily_il = calculate_il(prev, close)
+    price_change = close / prev - 1
+    growth = 1 + daily_il + price_change * 0.5
+    
+    vol = np.where(np.isnan(volatility), 0.5, volatility)
+    return daily_il, growth, calculate_fees(vol)
 
 
 # ══════════════════════════════════════════════════════════════════
 # BACKTEST ENGINE
 # ══════════════════════════════════════════════════════════════════
 
+# Rows of _run_books_core()'s equity, positions in run_books()' result
+BOOK_NAMES = ("Full System (AA+LP)", "AA Only (no LP)", "LP Only (no AA)")
+BOOK_FULL, BOOK_AA, BOOK_LP = range(len(BOOK_NAMES))
+
+# Indicator warm-up: the books start trading on this bar. A module-level
+# constant, so numba freezes it into the compiled loops like a literal.
+WARMUP_DAYS = 60
+
+
 @dataclass
 class PortfolioResult:
     name: str
@@ -239,216 +542,252 @@ class PortfolioResult:
     panic_protects: int
 
 
-def run_full_system(df, initial=100000):
-    """Full system: AA v1.4.1 + LP v2.0.2"""
-    
-    # Portfolio split: 60% directional (spot), 40% LP book
-    spot_value = initial * 0.60
-    lp_value = initial * 0.40
-    
-    spot_btc = spot_value / df.iloc[0]['close']
-    spot_cash = 0
-    
-    total_fees = 0
-    total_il = 0
-    equity = []
-    
-    last_action = "HOLD"
-    last_date = df.index[0]
-    aa_trades = 0
-    panic_protects = 0
-    
-    for i in range(60, len(df)):
-        row = df.iloc[i]
-        price = row['close']
-        prev_price = df.iloc[i-1]['close']
-        date = row.name
-        
-        # ═══ DIRECTIONAL BOOK (AA v1.4.1) ═══
-        days_since = (date - last_date).days
-        spot_total = spot_cash + spot_btc * price
-        position = (spot_btc * price) / spot_total if spot_total > 0 else 0
-        
-        action, size, reason = aa_v141(row, position, last_action, days_since)
-        
-        if reason == "panic_protect":
-            panic_protects += 1
+@njit(cache=True)
+def _aa_book_step(
+    price, today, regime, conf, mom, tail, tail_pol, vol_z, ret30,
+    spot_btc, spot_cash, last_action, last_day
+):
+    """
+    One day of an AA v1.4.1 spot book.
+    Returns (spot_btc, spot_cash, last_action, last_day, traded, panic_protect).
+    """
+    action, size, reason = aa_v141(
+        regime, conf, mom, tail, tail_pol, vol_z, ret30, last_action, today - last_day
+    )
+    panic_protect = 1 if reason == R_PANIC_PROTECT else 0
+    traded = 0
+    
+    if action != ACT_HOLD and size != 0:
+        if size > 0:  # BUY
+            cash_use = spot_cash * min(size * 2, 1.0)
+            if cash_use > 100:
+                spot_btc += cash_use / price
+                spot_cash -= cash_use
+                last_action, last_day = action, today
+                traded = 1
+        else:  # SELL
+            btc_sell = spot_btc * min(abs(size), 1.0)
+            if btc_sell * price > 100:
+                spot_cash += btc_sell * price
+                spot_btc -= btc_sell
+                last_action, last_day = action, today
+                traded = 1
+    
+    return spot_btc, spot_cash, last_action, last_day, traded, panic_protect
+
+
+@njit(cache=True)
+def _lp_book_step(lp_value, il, growth, fee_rate, exposure):
+    """
+    One day of an LP v2.0.2 book: IL + price component + fees.
+    Returns (lp_value, il_amt, fees).
+    """
+    if lp_value <= 0:
+        return lp_value, 0.0, 0.0
+    
+    il_amt = lp_value * abs(il)
+    lp_value = lp_value * growth
+    fees = fee_rate * lp_value * exposure
+    return lp_value + fees, il_amt, fees
+
+
+@njit(cache=True)
+def _run_books_core(
+    close, day, regime, conf, mom, tail, tail_pol, vol_z, ret30,
+    lp_exposure, lp_il, lp_growth, lp_fee_rate, initial
+):
+    """
+    The full system, AA-only and LP-only books in one day loop over the
+    _extract_arrays() / _lp_daily() columns. The books don't share state
+    (each AA book has its own cash, so its own trades and cooldowns).
+    
+    Returns (equity[3, n - WARMUP_DAYS] in BOOK_* rows,
+             full: spot_value, lp_value, total_fees, total_il, aa_trades, panic_protects,
+             aa: final, aa_trades, panic_protects,
+             lp: lp_value, total_fees, total_il).
+    """
+    n = close.shape[0]
+    equity = np.empty((3, max(n - WARMUP_DAYS, 0)))
+    
+    # Full system: 60% directional (spot), 40% LP book
+    f_spot_value = initial * 0.60
+    f_lp = initial * 0.40
+    f_btc = f_spot_value / close[0]
+    f_cash = 0.0
+    f_last, f_day = ACT_HOLD, day[0]
+    f_fees = 0.0
+    f_il = 0.0
+    f_trades = 0
+    f_panics = 0
+    
+    # AA only: 50/50 spot
+    a_btc = (initial * 0.5) / close[0]
+    a_cash = initial * 0.5
+    a_last, a_day = ACT_HOLD, day[0]
+    a_trades = 0
+    a_panics = 0
+    
+    # LP only
+    l_lp = initial
+    l_fees = 0.0
+    l_il = 0.0
+    
+    for i in range(WARMUP_DAYS, n):
+        price = close[i]
         
-        if action != "HOLD" and size != 0:
-            if size > 0:  # BUY
-                cash_use = spot_cash * min(size * 2, 1.0)
-                if cash_use > 100:
-                    spot_btc += cash_use / price
-                    spot_cash -= cash_use
-                    last_action, last_date = action, date
-                    aa_trades += 1
-            else:  # SELL
-                btc_sell = spot_btc * min(abs(size), 1.0)
-                if btc_sell * price > 100:
-                    spot_cash += btc_sell * price
-                    spot_btc -= btc_sell
-                    last_action, last_date = action, date
-                    aa_trades += 1
+        # ═══ FULL SYSTEM ═══
+        f_btc, f_cash, f_last, f_day, traded, panic = _aa_book_step(
+            price, day[i], regime[i], conf[i], mom[i], tail[i], tail_pol[i], vol_z[i], ret30[i],
+            f_btc, f_cash, f_last, f_day
+        )
+        f_trades += traded
+        f_panics += panic
+        f_spot_value = f_cash + f_btc * price
         
-        # Update spot value
-        spot_value = spot_cash + spot_btc * price
+        f_lp, il_amt, fees = _lp_book_step(f_lp, lp_il[i], lp_growth[i], lp_fee_rate[i], lp_exposure[i])
+        f_il += il_amt
+        f_fees += fees
         
-        # ═══ LP BOOK (LP v2.0.2) ═══
-        lp_policy = lp_v202(row)
-        target_exp = lp_policy['exposure']
+        equity[BOOK_FULL, i - WARMUP_DAYS] = f_spot_value + f_lp
         
-        # LP value changes: IL + price component + fees
-        if lp_value > 0:
-            daily_il = calculate_il(prev_price, price)
-            il_amt = lp_value * abs(daily_il)
-            total_il += il_amt
-            
-            price_change = price / prev_price - 1
-            lp_value = lp_value * (1 + daily_il + price_change * 0.5)
-            
-            vol = row['volatility'] if not np.isnan(row['volatility']) else 0.5
-            fees = calculate_fees(vol) * lp_value * target_exp
-            total_fees += fees
-            lp_value += fees
+        # ═══ AA ONLY ═══
+        a_btc, a_cash, a_last, a_day, traded, panic = _aa_book_step(
+            price, day[i], regime[i], conf[i], mom[i], tail[i], tail_pol[i], vol_z[i], ret30[i],
+            a_btc, a_cash, a_last, a_day
+        )
+        a_trades += traded
+        a_panics += panic
+        equity[BOOK_AA, i - WARMUP_DAYS] = a_cash + a_btc * price
         
-        # Track total equity
-        total_equity = spot_value + lp_value
-        equity.append(total_equity)
+        # ═══ LP ONLY ═══
+        l_lp, il_amt, fees = _lp_book_step(l_lp, lp_il[i], lp_growth[i], lp_fee_rate[i], lp_exposure[i])
+        l_il += il_amt
+        l_fees += fees
+        equity[BOOK_LP, i - WARMUP_DAYS] = l_lp
+    
+    a_final = a_cash + a_btc * close[n - 1]
+    return (
+        equity,
+        f_spot_value, f_lp, f_fees, f_il, f_trades, f_panics,
+        a_final, a_trades, a_panics,
+        l_lp, l_fees, l_il,
+    )
+
+
+# Prefer the AOT-compiled kernels from build_aot.py (no JIT warmup), but only
+# if they were built from this exact file; otherwise use the JIT (or plain
+# Python) versions.
+_SOURCE_CRC = zlib.crc32(Path(__file__).read_bytes())
+try:
+    import combined_kernel as _aot
+    if _aot.source_crc() != _SOURCE_CRC:
+        _aot = None
+except ImportError:
+    _aot = None
+
+if _aot is not None:
+    _phase_path, _rsi, _run_books = _aot.phase_path, _aot.rsi, _aot.run_books
+    _rolling_mean, _rolling_std = _aot.rolling_mean, _aot.rolling_std
+else:
+    _phase_path, _rsi, _run_books = _phase_path_core, _rsi_core, _run_books_core
+    _rolling_mean, _rolling_std = _rolling_mean_core, _rolling_std_core
+
+
+def _equity_metrics(equity: np.ndarray) -> Tuple[float, float]:
+    """(max drawdown %, annualized Sharpe) of a daily equity curve."""
+    if equity.size:
+        peak = np.maximum.accumulate(equity)
+        dd = float(np.abs(((equity - peak) / peak).min()) * 100)
+    else:
+        dd = np.nan
+    
+    # Daily simple returns; std with ddof=1 as pandas' Series.std()
+    rets = equity[1:] / equity[:-1] - 1
+    std = rets.std(ddof=1) if rets.size > 1 else 0.0
+    sharpe = (rets.mean() * 365) / (std * _SQRT365) if std > 0 else 0
+    return dd, sharpe
+
+
+def _lp_exposure(a: Dict[str, np.ndarray]) -> np.ndarray:
+    """lp_v202() exposure for every day of _extract_arrays() output."""
+    return lp_v202(a['regime'], a['persistence'], a['momentum'], a['returns_7d'], a['vol_z'])
+
+
+def run_books(df, initial=100000) -> List[PortfolioResult]:
+    """
+    Full System, AA Only and LP Only results (in that order) from one pass
+    over the data. run_full_system / run_aa_only / run_lp_only each take
+    their book from here.
+    """
+    a = _extract_arrays(df)
+    (equity,
+     spot_value, lp_value, total_fees, total_il, aa_trades, panic_protects,
+     aa_final, aa_only_trades, aa_only_panics,
+     lp_only_value, lp_only_fees, lp_only_il) = _run_books(
+        a['close'], a['day'], a['regime'], a['confidence'], a['momentum'], a['tail_risk'],
+        a['tail_polarity'], a['vol_z'], a['returns_30d'], _lp_exposure(a),
+        *_lp_daily(a['close'], a['volatility']), float(initial)
+    )
     
     final = spot_value + lp_value
-    ret = (final / initial - 1) * 100
-    
-    eq = pd.Series(equity)
-    dd = abs(((eq - eq.expanding().max()) / eq.expanding().max()).min()) * 100
-    rets = eq.pct_change().dropna()
-    sharpe = (rets.mean() * 365) / (rets.std() * np.sqrt(365)) if rets.std() > 0 else 0
-    
-    return PortfolioResult(
-        name="Full System (AA+LP)",
-        initial=initial, final=final, return_pct=ret, max_dd=dd, sharpe=sharpe,
+    dd, sharpe = _equity_metrics(equity[BOOK_FULL])
+    full = PortfolioResult(
+        name=BOOK_NAMES[BOOK_FULL],
+        initial=initial, final=final, return_pct=(final / initial - 1) * 100,
+        max_dd=dd, sharpe=sharpe,
         spot_final=spot_value, lp_final=lp_value,
         lp_fees=total_fees, lp_il=total_il,
         aa_trades=aa_trades, panic_protects=panic_protects
     )
+    
+    dd, sharpe = _equity_metrics(equity[BOOK_AA])
+    aa_only = PortfolioResult(
+        name=BOOK_NAMES[BOOK_AA],
+        initial=initial, final=aa_final, return_pct=(aa_final / initial - 1) * 100,
+        max_dd=dd, sharpe=sharpe,
+        spot_final=aa_final, lp_final=0,
+        lp_fees=0, lp_il=0,
+        aa_trades=aa_only_trades, panic_protects=aa_only_panics
+    )
+    
+    dd, sharpe = _equity_metrics(equity[BOOK_LP])
+    lp_only = PortfolioResult(
+        name=BOOK_NAMES[BOOK_LP],
+        initial=initial, final=lp_only_value, return_pct=(lp_only_value / initial - 1) * 100,
+        max_dd=dd, sharpe=sharpe,
+        spot_final=0, lp_final=lp_only_value,
+        lp_fees=lp_only_fees, lp_il=lp_only_il,
+        aa_trades=0, panic_protects=0
+    )
+    
+    return [full, aa_only, lp_only]
+
+
+def run_full_system(df, initial=100000):
+    """Full system: AA v1.4.1 + LP v2.0.2"""
+    return run_books(df, initial)[BOOK_FULL]
 
 
 def run_aa_only(df, initial=100000):
     """AA only, no LP"""
-    spot_btc = (initial * 0.5) / df.iloc[0]['close']
-    spot_cash = initial * 0.5
-    equity = []
-    
-    last_action = "HOLD"
-    last_date = df.index[0]
-    aa_trades = 0
-    panic_protects = 0
-    
-    for i in range(60, len(df)):
-        row = df.iloc[i]
-        price = row['close']
-        date = row.name
-        
-        days_since = (date - last_date).days
-        spot_total = spot_cash + spot_btc * price
-        position = (spot_btc * price) / spot_total if spot_total > 0 else 0
-        
-        action, size, reason = aa_v141(row, position, last_action, days_since)
-        
-        if reason == "panic_protect":
-            panic_protects += 1
-        
-        if action != "HOLD" and size != 0:
-            if size > 0:
-                cash_use = spot_cash * min(size * 2, 1.0)
-                if cash_use > 100:
-                    spot_btc += cash_use / price
-                    spot_cash -= cash_use
-                    last_action, last_date = action, date
-                    aa_trades += 1
-            else:
-                btc_sell = spot_btc * min(abs(size), 1.0)
-                if btc_sell * price > 100:
-                    spot_cash += btc_sell * price
-                    spot_btc -= btc_sell
-                    last_action, last_date = action, date
-                    aa_trades += 1
-        
-        equity.append(spot_cash + spot_btc * price)
-    
-    final = spot_cash + spot_btc * df.iloc[-1]['close']
-    ret = (final / initial - 1) * 100
-    
-    eq = pd.Series(equity)
-    dd = abs(((eq - eq.expanding().max()) / eq.expanding().max()).min()) * 100
-    rets = eq.pct_change().dropna()
-    sharpe = (rets.mean() * 365) / (rets.std() * np.sqrt(365)) if rets.std() > 0 else 0
-    
-    return PortfolioResult(
-        name="AA Only (no LP)",
-        initial=initial, final=final, return_pct=ret, max_dd=dd, sharpe=sharpe,
-        spot_final=final, lp_final=0,
-        lp_fees=0, lp_il=0,
-        aa_trades=aa_trades, panic_protects=panic_protects
-    )
+    return run_books(df, initial)[BOOK_AA]
 
 
 def run_lp_only(df, initial=100000):
     """LP only, no directional"""
-    lp_value = initial
-    total_fees = 0
-    total_il = 0
-    equity = []
-    
-    for i in range(60, len(df)):
-        row = df.iloc[i]
-        price = row['close']
-        prev_price = df.iloc[i-1]['close']
-        
-        lp_policy = lp_v202(row)
-        
-        if lp_value > 0:
-            daily_il = calculate_il(prev_price, price)
-            il_amt = lp_value * abs(daily_il)
-            total_il += il_amt
-            
-            price_change = price / prev_price - 1
-            lp_value = lp_value * (1 + daily_il + price_change * 0.5)
-            
-            vol = row['volatility'] if not np.isnan(row['volatility']) else 0.5
-            fees = calculate_fees(vol) * lp_value * lp_policy['exposure']
-            total_fees += fees
-            lp_value += fees
-        
-        equity.append(lp_value)
-    
-    ret = (lp_value / initial - 1) * 100
-    
-    eq = pd.Series(equity)
-    dd = abs(((eq - eq.expanding().max()) / eq.expanding().max()).min()) * 100
-    rets = eq.pct_change().dropna()
-    sharpe = (rets.mean() * 365) / (rets.std() * np.sqrt(365)) if rets.std() > 0 else 0
-    
-    return PortfolioResult(
-        name="LP Only (no AA)",
-        initial=initial, final=lp_value, return_pct=ret, max_dd=dd, sharpe=sharpe,
-        spot_final=0, lp_final=lp_value,
-        lp_fees=total_fees, lp_il=total_il,
-        aa_trades=0, panic_protects=0
-    )
+    return run_books(df, initial)[BOOK_LP]
 
 
 def run_buy_hold(df, initial=100000):
     """Buy and hold benchmark"""
-    start_p = df.iloc[60]['close']
-    end_p = df.iloc[-1]['close']
+    close = df['close'].to_numpy(dtype=np.float64)
+    start_p = close[WARMUP_DAYS]
+    end_p = close[-1]
     final = initial * (end_p / start_p)
     ret = (final / initial - 1) * 100
     
-    equity = [initial * (df.iloc[i]['close'] / start_p) for i in range(60, len(df))]
-    eq = pd.Series(equity)
-    dd = abs(((eq - eq.expanding().max()) / eq.expanding().max()).min()) * 100
-    rets = eq.pct_change().dropna()
-    sharpe = (rets.mean() * 365) / (rets.std() * np.sqrt(365)) if rets.std() > 0 else 0
+    equity = initial * (close[WARMUP_DAYS:] / start_p)
+    dd, sharpe = _equity_metrics(equity)
     
     return PortfolioResult(
         name="Buy & Hold",
@@ -459,11 +798,81 @@ def run_buy_hold(df, initial=100000):
     )
 
 
+# ══════════════════════════════════════════════════════════════════
+# MONTE CARLO SCENARIOS
+# ══════════════════════════════════════════════════════════════════
+
+@njit(cache=True, parallel=True)
+def _run_scenarios_core(
+    close, day, regime, conf, mom, tail, tail_pol, vol_z, ret30,
+    lp_exposure, lp_il, lp_growth, lp_fee_rate, initial
+):
+    """
+    _run_books_core() for every scenario row of the 2-D inputs, scenarios in
+    parallel. Returns (equity[scenario, BOOK_*, day], final value[scenario, BOOK_*]).
+    """
+    n_scen, n = close.shape
+    equity = np.empty((n_scen, 3, max(n - WARMUP_DAYS, 0)))
+    finals = np.empty((n_scen, 3))
+    
+    for s in prange(n_scen):
+        out = _run_books_core(
+            close[s], day[s], regime[s], conf[s], mom[s], tail[s], tail_pol[s], vol_z[s], ret30[s],
+            lp_exposure[s], lp_il[s], lp_growth[s], lp_fee_rate[s], initial
+        )
+        equity[s] = out[0]
+        finals[s, BOOK_FULL] = out[1] + out[2]
+        finals[s, BOOK_AA] = out[7]
+        finals[s, BOOK_LP] = out[10]
+    
+    return equity, finals
+
+
+def run_scenarios(n_scenarios: int = 100, seed: int = 0, initial=100000) -> Dict[str, Dict[str, Tuple[float, float, float]]]:
+    """
+    The three books plus Buy & Hold over n_scenarios independent price paths
+    (generate_btc_data() with RandomState(seed + s)).
+    
+    Returns {strategy name: {'return_pct' / 'max_dd': (min, median, max)}}.
+    """
+    cols = []
+    for s in range(n_scenarios):
+        df = compute_indicators(generate_btc_data(np.random.RandomState(seed + s)))
+        a = _extract_arrays(df)
+        cols.append((
+            a['close'], a['day'], a['regime'], a['confidence'], a['momentum'], a['tail_risk'],
+            a['tail_polarity'], a['vol_z'], a['returns_30d'], _lp_exposure(a),
+            *_lp_daily(a['close'], a['volatility']),
+        ))
+    
+    # Every path has the same phases, so the same length: stack to [scenario, day]
+    stacked = [np.stack(col) for col in zip(*cols)]
+    equity, finals = _run_scenarios_core(*stacked, float(initial))
+    
+    close = stacked[0]
+    bh_equity = initial * (close[:, WARMUP_DAYS:] / close[:, WARMUP_DAYS:WARMUP_DAYS + 1])
+    
+    returns = {name: (finals[:, b] / initial - 1) * 100 for b, name in enumerate(BOOK_NAMES)}
+    returns["Buy & Hold"] = (bh_equity[:, -1] / initial - 1) * 100
+    max_dds = {name: np.array([_equity_metrics(eq)[0] for eq in equity[:, b]]) for b, name in enumerate(BOOK_NAMES)}
+    max_dds["Buy & Hold"] = np.array([_equity_metrics(eq)[0] for eq in bh_equity])
+    
+    def band(x):
+        return float(np.min(x)), float(np.median(x)), float(np.max(x))
+    
+    return {
+        name: {'return_pct': band(returns[name]), 'max_dd': band(max_dds[name])}
+        for name in returns
+    }
+
+
 # ══════════════════════════════════════════════════════════════════
 # REPORT
 # ══════════════════════════════════════════════════════════════════
 
 def print_report(results, df):
+    close = df['close'].to_numpy()
+    
     print("=" * 90)
     print("         COMBINED BACKTEST — AA v1.4.1 + LP v2.0.2")
     print("=" * 90)
@@ -471,10 +880,10 @@ def print_report(results, df):
     
     print("DATA SUMMARY")
     print("-" * 40)
-    print(f"Period: {df.index[60].strftime('%Y-%m-%d')} to {df.index[-1].strftime('%Y-%m-%d')}")
-    print(f"Days: {len(df) - 60}")
-    print(f"Start: ${df.iloc[60]['close']:,.0f} → End: ${df.iloc[-1]['close']:,.0f}")
-    print(f"B&H Return: {(df.iloc[-1]['close'] / df.iloc[60]['close'] - 1) * 100:+.1f}%")
+    print(f"Period: {df.index[WARMUP_DAYS].strftime('%Y-%m-%d')} to {df.index[-1].strftime('%Y-%m-%d')}")
+    print(f"Days: {len(df) - WARMUP_DAYS}")
+    print(f"Start: ${close[WARMUP_DAYS]:,.0f} → End: ${close[-1]:,.0f}")
+    print(f"B&H Return: {(close[-1] / close[WARMUP_DAYS] - 1) * 100:+.1f}%")
     print()
     
     print("=" * 90)
@@ -545,6 +954,24 @@ def print_report(results, df):
     print("=" * 90)
 
 
+def print_scenario_report(bands, n_scenarios):
+    print()
+    print("=" * 90)
+    print(f"                         MONTE CARLO ({n_scenarios} scenarios)")
+    print("=" * 90)
+    print()
+    
+    print(f"{'Strategy':<22} {'Return min / median / max':>32}    {'MaxDD min / median / max':>26}")
+    print("-" * 90)
+    for name, b in bands.items():
+        r, d = b['return_pct'], b['max_dd']
+        print(f"{name:<22} {r[0]:>+9.1f}% {r[1]:>+9.1f}% {r[2]:>+9.1f}%"
+              f"    {d[0]:>7.1f}% {d[1]:>7.1f}% {d[2]:>7.1f}%")
+    
+    print()
+    print("=" * 90)
+
+
 def main():
     print()
     print("Generating data...")
@@ -556,15 +983,18 @@ def main():
     print("Running backtests...")
     
     results = [
-        run_full_system(df),
-        run_aa_only(df),
-        run_lp_only(df),
+        *run_books(df),
         run_buy_hold(df),
     ]
     
     print()
     print_report(results, df)
     
+    print()
+    print(f"Running {MC_SCENARIOS} Monte Carlo scenarios...")
+    bands = run_scenarios(MC_SCENARIOS)
+    print_scenario_report(bands, MC_SCENARIOS)
+    
     # Save results
     output = {
         "generated_at": datetime.now().isoformat(),
@@ -25,11 +25,13 @@ Key metrics:
 
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from typing import Callable, List, Dict, Tuple
 import json
 
+from _njit import njit, prange
+
 np.random.seed(42)
 
 
@@ -48,6 +50,22 @@ FEE_TIER = 0.003
 # DATA GENERATION
 # ══════════════════════════════════════════════════════════════════
 
+@njit(cache=True)
+def _phase_path(start_p, end_p, days, shocks):
+    """
+    One generate_btc_data() phase: from start_p, drift 10% of the way to the
+    straight line towards end_p each day plus shocks[d - 1], floored at 10000.
+    """
+    prices = np.empty(days)
+    prices[0] = start_p
+    for d in range(1, days):
+        progress = d / days
+        target = start_p + (end_p - start_p) * progress
+        drift = 0.1 * (target - prices[d - 1]) / prices[d - 1]
+        prices[d] = max(prices[d - 1] * (1 + drift + shocks[d - 1]), 10000.0)
+    return prices
+
+
 def generate_btc_data() -> pd.DataFrame:
     """Generate realistic BTC price data with regime phases."""
     
@@ -64,38 +82,24 @@ def generate_btc_data() -> pd.DataFrame:
         ("Distribution", 60, 70000, 65000, 0.03, "RANGE"),
     ]
     
-    all_prices = []
-    all_dates = []
-    all_regimes = []
-    current_date = datetime(2023, 1, 1)
+    total = sum(phase[1] for phase in phases)
+    close = np.empty(total)
+    regime_true = np.empty(total, dtype=object)
     
+    pos = 0
     for name, days, start_p, end_p, vol, regime in phases:
-        prices = [start_p]
-        for d in range(1, days):
-            progress = d / days
-            target = start_p + (end_p - start_p) * progress
-            drift = 0.1 * (target - prices[-1]) / prices[-1]
-            shock = np.random.normal(0, vol)
-            new_price = prices[-1] * (1 + drift + shock)
-            prices.append(max(new_price, 10000))
+        prices = close[pos:pos + days]
+        prices[:] = _phase_path(float(start_p), float(end_p), days, np.random.normal(0, vol, days - 1))
         
         # Adjust to hit target
         adj = end_p / prices[-1]
-        prices = [p * (1 + (adj - 1) * (i / len(prices))) for i, p in enumerate(prices)]
-        
-        for i, p in enumerate(prices):
-            all_prices.append(p)
-            all_dates.append(current_date + timedelta(days=i))
-            all_regimes.append(regime)
+        prices *= 1 + (adj - 1) * (np.arange(days) / days)
         
-        current_date = all_dates[-1] + timedelta(days=1)
+        regime_true[pos:pos + days] = regime
+        pos += days
     
-    df = pd.DataFrame({
-        'date': all_dates,
-        'close': all_prices,
-        'regime_true': all_regimes
-    })
-    df.set_index('date', inplace=True)
+    dates = pd.date_range(datetime(2023, 1, 1), periods=total, freq='D', name='date')
+    df = pd.DataFrame({'close': close, 'regime_true': regime_true}, index=dates)
     
     return df
 
@@ -118,140 +122,175 @@ def compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['ema_20'] = df['close'].ewm(span=20).mean()
     df['ema_50'] = df['close'].ewm(span=50).mean()
     
-    df['momentum'] = 0.0
-    df.loc[df['close'] > df['ema_20'], 'momentum'] += 0.25
-    df.loc[df['ema_20'] > df['ema_50'], 'momentum'] += 0.25
-    df.loc[df['close'] < df['ema_20'], 'momentum'] -= 0.25
-    df.loc[df['ema_20'] < df['ema_50'], 'momentum'] -= 0.25
-    df.loc[df['returns_7d'] > 0.03, 'momentum'] += 0.25
-    df.loc[df['returns_7d'] < -0.03, 'momentum'] -= 0.25
-    df['momentum'] = df['momentum'].clip(-1, 1)
+    close = df['close'].to_numpy()
+    ema_20 = df['ema_20'].to_numpy()
+    ema_50 = df['ema_50'].to_numpy()
+    ret7 = df['returns_7d'].to_numpy()
+    
+    # +-0.25 per condition (multiples of 0.25, so the sum is exact)
+    momentum = 0.25 * (
+        (close > ema_20).astype(np.float64) + (ema_20 > ema_50) - (close < ema_20)
+        - (ema_20 < ema_50) + (ret7 > 0.03) - (ret7 < -0.03)
+    )
+    momentum = np.clip(momentum, -1, 1)
+    df['momentum'] = momentum
     
     # Trend persistence (how consistent is direction)
     df['direction'] = np.sign(df['returns_1d'])
-    df['persistence'] = df['direction'].rolling(14).apply(
-        lambda x: abs(x.sum()) / len(x), raw=True
+    # |sum of signs| / 14 over full windows; the rolling sum of ±1/0 is exact
+    df['persistence'] = df['direction'].rolling(14).sum().abs() / 14
+    
+    # Regime detection (first match wins: TRANSITION, BEAR, BULL, else RANGE)
+    vol_z = df['vol_z'].to_numpy()
+    df['regime'] = np.select(
+        [(np.abs(momentum) < 0.2) & (vol_z > 1), momentum < -0.3, momentum > 0.3],
+        ['TRANSITION', 'BEAR', 'BULL'],
+        'RANGE',
     )
     
-    # Regime detection
-    df['regime'] = 'RANGE'
-    df.loc[df['momentum'] > 0.3, 'regime'] = 'BULL'
-    df.loc[df['momentum'] < -0.3, 'regime'] = 'BEAR'
-    df.loc[(df['momentum'].abs() < 0.2) & (df['vol_z'] > 1), 'regime'] = 'TRANSITION'
-    
     # Confidence
     df['confidence'] = (0.5 + df['momentum'].abs() * 0.3).clip(0.2, 0.85)
     
     return df.dropna()
 
 
+def _extract_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    compute_indicators() columns the policies and backtests read, as plain
+    arrays: float64 values and the regime names.
+    """
+    return {
+        'close': df['close'].to_numpy(dtype=np.float64),
+        'volatility': df['volatility'].to_numpy(dtype=np.float64),
+        'vol_z': df['vol_z'].to_numpy(dtype=np.float64),
+        'momentum': df['momentum'].to_numpy(dtype=np.float64),
+        'persistence': df['persistence'].to_numpy(dtype=np.float64),
+        'confidence': df['confidence'].to_numpy(dtype=np.float64),
+        'regime': df['regime'].to_numpy(),
+    }
+
+
 # ══════════════════════════════════════════════════════════════════
 # IL & FEE CALCULATIONS
 # ══════════════════════════════════════════════════════════════════
 
-def calculate_il(price_start: float, price_end: float) -> float:
+def calculate_il(price_start, price_end):
     """
-    Calculate Impermanent Loss.
+    Calculate Impermanent Loss (scalars or arrays).
     IL = 2 * sqrt(price_ratio) / (1 + price_ratio) - 1
+    0 where a price is not positive.
     """
-    if price_start <= 0 or price_end <= 0:
-        return 0
-    
-    price_ratio = price_end / price_start
-    il = 2 * np.sqrt(price_ratio) / (1 + price_ratio) - 1
-    return il
+    price_start = np.asarray(price_start, dtype=np.float64)
+    price_end = np.asarray(price_end, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_ratio = price_end / price_start
+        il = 2 * np.sqrt(price_ratio) / (1 + price_ratio) - 1
+    return np.where((price_start <= 0) | (price_end <= 0), 0.0, il)
 
 
-def calculate_daily_fees(volatility: float, volume_proxy: float = 1.0) -> float:
+def calculate_daily_fees(volatility, volume_proxy: float = 1.0):
     """
-    Estimate daily fees from LP.
+    Estimate daily fees from LP (scalars or arrays).
     
     Simplified: fees ∝ volatility * volume * fee_tier
     Higher vol = more trading = more fees
     """
     # Daily vol from annual
-    daily_vol = volatility / np.sqrt(365)
+    daily_vol = np.asarray(volatility, dtype=np.float64) / np.sqrt(365)
     
     # Fee estimate: vol * turnover proxy
     # In high vol, more trading happens through the pool
     daily_fees = daily_vol * volume_proxy * FEE_TIER
     
-    return min(daily_fees, 0.01)  # Cap at 1% daily
+    return np.minimum(daily_fees, 0.01)  # Cap at 1% daily
+
+
+def _lp_daily(close: np.ndarray, volatility: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-day inputs of the LP loop that don't depend on the position: (IL vs
+    the previous close, price ratio vs the previous close, LP value growth
+    1 + IL + half the price move, fee rate). Day 0 has no previous close and
+    is never used by the loop.
+    """
+    prev = np.empty_like(close)
+    prev[0] = np.nan
+    prev[1:] = close[:-1]
+    
+    daily_il = calculate_il(prev, close)
+    price_ratio = close / prev
+    # LP gets half the price change (balanced position)
+    growth = 1 + daily_il + (price_ratio - 1) * 0.5
+    
+    vol = np.where(np.isnan(volatility), 0.5, volatility)
+    return daily_il, price_ratio, growth, calculate_daily_fees(vol)
 
 
 # ══════════════════════════════════════════════════════════════════
 # LP POLICY MODELS
 # ══════════════════════════════════════════════════════════════════
 
-def lp_policy_v201(row, position_value: float) -> Dict:
+# Risk quadrant codes of the policies' 'quadrant' array (QUADRANT_NAMES maps
+# them back); Q_NA for policies that don't classify
+QUADRANT_NAMES = ("N/A", "Q1", "Q2", "Q3", "Q4")
+Q_NA, Q1, Q2, Q3, Q4 = range(len(QUADRANT_NAMES))
+
+def lp_policy_v201(a: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
     """
-    LP Policy v2.0.1 — Adaptive regime-aware exposure.
+    LP Policy v2.0.1 — Adaptive regime-aware exposure, for every day of the
+    _extract_arrays() output. Returns exposure, vol_structure, quadrant (Q*
+    codes) and hedge arrays.
     
     Key insight: 
     - RANGE = high exposure (harvest fees)
     - TRENDING = low exposure (avoid IL)
     - TRANSITION = medium exposure (uncertainty = opportunity)
     """
-    regime = row['regime']
-    momentum = row['momentum']
-    persistence = row['persistence'] if not np.isnan(row['persistence']) else 0.5
-    vol_z = row['vol_z'] if not np.isnan(row['vol_z']) else 0
-    confidence = row['confidence']
+    regime = a['regime']
+    momentum = a['momentum']
+    persistence = np.where(np.isnan(a['persistence']), 0.5, a['persistence'])
+    vol_z = np.where(np.isnan(a['vol_z']), 0.0, a['vol_z'])
+    confidence = a['confidence']
+    
+    is_bull = regime == "BULL"
+    is_bear = regime == "BEAR"
+    is_range = regime == "RANGE"
+    trending = persistence > 0.6
+    ranging = persistence < 0.3
     
     # Vol structure classification
-    if persistence > 0.6:
-        vol_structure = "TREND_DOMINANT"
-    elif persistence < 0.3:
-        vol_structure = "RANGE_DOMINANT"
-    else:
-        vol_structure = "MIXED"
+    vol_structure = np.select(
+        [trending, ranging], ["TREND_DOMINANT", "RANGE_DOMINANT"], "MIXED"
+    )
     
     # Base exposure by regime
-    if regime == "BULL":
-        if persistence > 0.6:
-            base_exposure = 0.30  # Trending up = IL risk
-        else:
-            base_exposure = 0.60  # Choppy bull = good
-    elif regime == "BEAR":
-        if persistence > 0.6:
-            base_exposure = 0.20  # Strong bear = avoid
-        else:
-            base_exposure = 0.40  # Bear chop = okay
-    elif regime == "RANGE":
-        base_exposure = 0.80  # RANGE = harvest!
-    else:  # TRANSITION
-        if confidence < 0.4:
-            base_exposure = 0.50  # Low confidence = opportunity
-        else:
-            base_exposure = 0.35  # High confidence = trend forming
+    base_exposure = np.select(
+        [
+            is_bull & trending,   # Trending up = IL risk
+            is_bull,              # Choppy bull = good
+            is_bear & trending,   # Strong bear = avoid
+            is_bear,              # Bear chop = okay
+            is_range,             # RANGE = harvest!
+            confidence < 0.4,     # TRANSITION, low confidence = opportunity
+        ],
+        [0.30, 0.60, 0.20, 0.40, 0.80, 0.50],
+        0.35,                     # TRANSITION, high confidence = trend forming
+    )
     
-    # Adjust for vol structure
-    if vol_structure == "RANGE_DOMINANT":
-        base_exposure *= 1.2  # Range vol = good
-    elif vol_structure == "TREND_DOMINANT":
-        base_exposure *= 0.7  # Trend vol = bad
+    # Adjust for vol structure: range vol = good, trend vol = bad
+    base_exposure = base_exposure * np.select([ranging, trending], [1.2, 0.7], 1.0)
     
-    # Adjust for extreme vol
-    if vol_z > 2.0:
-        base_exposure *= 0.6  # Gap risk
-    elif vol_z < -1.0:
-        base_exposure *= 1.1  # Low vol = harvest
+    # Adjust for extreme vol: gap risk / low vol = harvest
+    base_exposure = base_exposure * np.select([vol_z > 2.0, vol_z < -1.0], [0.6, 1.1], 1.0)
     
     # Clamp
-    exposure = min(0.90, max(0.10, base_exposure))
+    exposure = np.clip(base_exposure, 0.10, 0.90)
     
     # Risk quadrant
-    risk_dir = -row['momentum']  # Simplified: negative momentum = risk-off
-    risk_lp = 0.5 - persistence + (0.5 if regime == "RANGE" else 0)
-    
-    if risk_dir >= 0 and risk_lp >= 0:
-        quadrant = "Q1"
-    elif risk_dir < 0 and risk_lp >= 0:
-        quadrant = "Q2"
-    elif risk_dir >= 0 and risk_lp < 0:
-        quadrant = "Q3"
-    else:
-        quadrant = "Q4"
+    risk_dir = -momentum  # Simplified: negative momentum = risk-off
+    risk_lp = 0.5 - persistence + np.where(is_range, 0.5, 0.0)
+    
+    # Q1..Q4 from the two sign bits: risk-off direction +1, negative LP risk +2
+    quadrant = (1 + (risk_dir < 0) + 2 * (risk_lp < 0)).astype(np.int8)
     
     return {
         'exposure': exposure,
@@ -261,24 +300,24 @@ def lp_policy_v201(row, position_value: float) -> Dict:
     }
 
 
-def lp_policy_static(row, position_value: float) -> Dict:
-    """Static 50% LP exposure - baseline."""
+def _constant_policy(a: Dict[str, np.ndarray], exposure: float) -> Dict[str, np.ndarray]:
+    n = len(a['close'])
     return {
-        'exposure': 0.50,
-        'vol_structure': 'UNKNOWN',
-        'quadrant': 'N/A',
-        'hedge': False,
+        'exposure': np.full(n, exposure),
+        'vol_structure': np.full(n, 'UNKNOWN'),
+        'quadrant': np.full(n, Q_NA, dtype=np.int8),
+        'hedge': np.zeros(n, dtype=np.bool_),
     }
 
 
-def lp_policy_aggressive(row, position_value: float) -> Dict:
+def lp_policy_static(a: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Static 50% LP exposure - baseline."""
+    return _constant_policy(a, 0.50)
+
+
+def lp_policy_aggressive(a: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
     """Aggressive 80% LP exposure."""
-    return {
-        'exposure': 0.80,
-        'vol_structure': 'UNKNOWN',
-        'quadrant': 'N/A',
-        'hedge': False,
-    }
+    return _constant_policy(a, 0.80)
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -299,120 +338,172 @@ class LPBacktestResult:
     days_in_q2: int  # Key metric: Q2 = LP opportunity
 
 
-def run_lp_backtest(
-    df: pd.DataFrame,
-    policy_func,
-    policy_name: str,
-    initial_capital: float = 100000
-) -> LPBacktestResult:
+def _max_drawdown_pct(equity: np.ndarray) -> float:
+    """Max drawdown (%) of an equity curve; NaN if it is empty."""
+    if not equity.size:
+        return np.nan
+    rolling_max = np.maximum.accumulate(equity)
+    drawdowns = (equity - rolling_max) / rolling_max
+    return abs(drawdowns.min()) * 100
+
+
+@njit(cache=True)
+def _lp_loop(exposure, daily_il, price_ratio, growth, fee_rate, initial_capital, start):
     """
-    Run LP backtest.
+    Day loop of run_lp_backtest() from day `start`: rebalance to exposure[i]
+    when off by more than 10%, then IL, price move and fees.
     
-    Portfolio split:
-    - LP portion: earns fees, suffers IL
-    - Spot portion: tracks price
+    Returns (equity_curve[n - start], lp_value, spot_value, total_fees, total_il).
     """
-    capital = initial_capital
+    n = exposure.shape[0]
     lp_value = initial_capital * 0.5  # Start 50% in LP
     spot_value = initial_capital * 0.5  # Start 50% in spot
+    total_fees = 0.0
+    total_il = 0.0
+    equity_curve = np.empty(max(n - start, 0))
     
-    total_fees = 0
-    total_il = 0
-    equity_curve = []
-    q2_days = 0
-    
-    entry_price = df.iloc[0]['close']
-    
-    for i in range(30, len(df)):
-        row = df.iloc[i]
-        price = row['close']
-        prev_price = df.iloc[i-1]['close']
-        
-        # Get policy
-        policy = policy_func(row, capital)
-        target_exposure = policy['exposure']
-        
-        if policy.get('quadrant') == 'Q2':
-            q2_days += 1
+    for i in range(start, n):
+        target_exposure = exposure[i]
         
         # Current exposure
         total_value = lp_value + spot_value
-        current_exposure = lp_value / total_value if total_value > 0 else 0
+        current_exposure = lp_value / total_value if total_value > 0 else 0.0
         
         # Rebalance if needed (>10% deviation)
         if abs(current_exposure - target_exposure) > 0.10:
             lp_value = total_value * target_exposure
             spot_value = total_value * (1 - target_exposure)
         
-        # Calculate daily IL on LP position
+        # Daily IL on LP position; LP value changes: -IL + price move component
         if lp_value > 0:
-            daily_il = calculate_il(prev_price, price)
-            il_amount = lp_value * abs(daily_il)
-            total_il += il_amount
-            
-            # LP value changes: -IL + price move component
-            price_change = (price / prev_price - 1)
-            # LP gets half the price change (balanced position)
-            lp_value = lp_value * (1 + daily_il + price_change * 0.5)
+            total_il += lp_value * abs(daily_il[i])
+            lp_value = lp_value * growth[i]
         
-        # Spot value tracks price
-        spot_value = spot_value * (price / prev_price)
+        # Spot value tracks price. Rebalances reset it, so this stays a running
+        # product rather than a cumprod of price_ratio
+        spot_value = spot_value * price_ratio[i]
         
-        # Calculate and add fees
+        # Add fees
         if lp_value > 0:
-            vol = row['volatility'] if not np.isnan(row['volatility']) else 0.5
-            daily_fees = calculate_daily_fees(vol) * lp_value
+            daily_fees = fee_rate[i] * lp_value
             total_fees += daily_fees
             lp_value += daily_fees
         
         # Track equity
-        capital = lp_value + spot_value
-        equity_curve.append(capital)
+        equity_curve[i - start] = lp_value + spot_value
     
-    # Final calculations
-    final_capital = lp_value + spot_value
-    total_return = (final_capital / initial_capital - 1) * 100
+    return equity_curve, lp_value, spot_value, total_fees, total_il
+
+
+@njit(cache=True, parallel=True)
+def _lp_loops(exposure, daily_il, price_ratio, growth, fee_rate, initial_capital, start):
+    """
+    _lp_loop() for every policy row of exposure[policy, day], policies in
+    parallel over the same daily arrays.
     
-    # Max drawdown
-    equity = pd.Series(equity_curve)
-    rolling_max = equity.expanding().max()
-    drawdowns = (equity - rolling_max) / rolling_max
-    max_dd = abs(drawdowns.min()) * 100
+    Returns (equity[policy, n - start], totals[policy] = (lp_value,
+    spot_value, total_fees, total_il)).
+    """
+    n_pol, n = exposure.shape
+    equity = np.empty((n_pol, max(n - start, 0)))
+    totals = np.empty((n_pol, 4))
     
-    # Fee/IL ratio
-    fee_il_ratio = total_fees / total_il if total_il > 0 else 10.0
+    for p in prange(n_pol):
+        out = _lp_loop(exposure[p], daily_il, price_ratio, growth, fee_rate, initial_capital, start)
+        equity[p] = out[0]
+        totals[p, 0] = out[1]
+        totals[p, 1] = out[2]
+        totals[p, 2] = out[3]
+        totals[p, 3] = out[4]
     
-    # Average exposure
-    avg_exposure = 0.5  # Simplified
+    return equity, totals
+
+
+def run_lp_backtests(
+    df: pd.DataFrame,
+    policies: List[Tuple[Callable, str]],
+    initial_capital: float = 100000,
+    arrays: Dict[str, np.ndarray] = None,
+) -> List[LPBacktestResult]:
+    """
+    Run one LP backtest per (policy_func, policy_name), in that order.
     
-    return LPBacktestResult(
-        name=policy_name,
-        initial_capital=initial_capital,
-        final_capital=final_capital,
-        total_return_pct=total_return,
-        total_fees_earned=total_fees,
-        total_il_suffered=total_il,
-        fee_il_ratio=fee_il_ratio,
-        avg_exposure=avg_exposure,
-        max_drawdown_pct=max_dd,
-        days_in_q2=q2_days,
+    Portfolio split:
+    - LP portion: earns fees, suffers IL
+    - Spot portion: tracks price
+    
+    policy_func maps the _extract_arrays() output to per-day policy arrays
+    (see lp_policy_v201); the position recurrences then run side by side in
+    _lp_loops(). Pass arrays to reuse one _extract_arrays(df).
+    """
+    a = _extract_arrays(df) if arrays is None else arrays
+    plans = [policy_func(a) for policy_func, _ in policies]
+    exposure = np.stack([np.asarray(plan['exposure'], dtype=np.float64) for plan in plans])
+    
+    daily_il, price_ratio, growth, fee_rate = _lp_daily(a['close'], a['volatility'])
+    equity, totals = _lp_loops(
+        exposure, daily_il, price_ratio, growth, fee_rate, float(initial_capital), 30
     )
+    
+    results = []
+    for k, (plan, (_, policy_name)) in enumerate(zip(plans, policies)):
+        lp_value, spot_value, total_fees, total_il = totals[k]
+        
+        # Final calculations
+        final_capital = lp_value + spot_value
+        total_return = (final_capital / initial_capital - 1) * 100
+        
+        # Max drawdown
+        max_dd = _max_drawdown_pct(equity[k])
+        
+        # Fee/IL ratio
+        fee_il_ratio = total_fees / total_il if total_il > 0 else 10.0
+        
+        # Average exposure
+        avg_exposure = 0.5  # Simplified
+        
+        results.append(LPBacktestResult(
+            name=policy_name,
+            initial_capital=initial_capital,
+            final_capital=final_capital,
+            total_return_pct=total_return,
+            total_fees_earned=total_fees,
+            total_il_suffered=total_il,
+            fee_il_ratio=fee_il_ratio,
+            avg_exposure=avg_exposure,
+            max_drawdown_pct=max_dd,
+            days_in_q2=int((plan['quadrant'][30:] == Q2).sum()),
+        ))
+    
+    return results
+
+
+def run_lp_backtest(
+    df: pd.DataFrame,
+    policy_func,
+    policy_name: str,
+    initial_capital: float = 100000,
+    arrays: Dict[str, np.ndarray] = None,
+) -> LPBacktestResult:
+    """Run LP backtest for one policy (see run_lp_backtests)."""
+    return run_lp_backtests(df, [(policy_func, policy_name)], initial_capital, arrays)[0]
 
 
-def run_spot_only(df: pd.DataFrame, initial_capital: float = 100000) -> LPBacktestResult:
+def run_spot_only(
+    df: pd.DataFrame,
+    initial_capital: float = 100000,
+    arrays: Dict[str, np.ndarray] = None,
+) -> LPBacktestResult:
     """Spot only benchmark (no LP)."""
-    start_price = df.iloc[30]['close']
-    end_price = df.iloc[-1]['close']
+    close = (_extract_arrays(df) if arrays is None else arrays)['close']
+    start_price = close[30]
+    end_price = close[-1]
     
     final = initial_capital * (end_price / start_price)
     total_return = (final / initial_capital - 1) * 100
     
-    equity = [initial_capital * (df.iloc[i]['close'] / start_price) 
-              for i in range(30, len(df))]
-    equity = pd.Series(equity)
-    rolling_max = equity.expanding().max()
-    drawdowns = (equity - rolling_max) / rolling_max
-    max_dd = abs(drawdowns.min()) * 100
+    equity = initial_capital * (close[30:] / start_price)
+    max_dd = _max_drawdown_pct(equity)
     
     return LPBacktestResult(
         name="Spot Only (No LP)",
@@ -435,6 +526,8 @@ def run_spot_only(df: pd.DataFrame, initial_capital: float = 100000) -> LPBackte
 def print_lp_report(results: List[LPBacktestResult], df: pd.DataFrame):
     """Print CFO report for LP backtest."""
     
+    close = df['close'].to_numpy(dtype=np.float64)
+    
     print("=" * 80)
     print("         LP POLICY BACKTEST — CFO ANALYSIS")
     print("=" * 80)
@@ -444,9 +537,9 @@ def print_lp_report(results: List[LPBacktestResult], df: pd.DataFrame):
     print("-" * 40)
     print(f"Period: {df.index[30].strftime('%Y-%m-%d')} to {df.index[-1].strftime('%Y-%m-%d')}")
     print(f"Days: {len(df) - 30}")
-    print(f"Start Price: ${df.iloc[30]['close']:,.0f}")
-    print(f"End Price: ${df.iloc[-1]['close']:,.0f}")
-    print(f"Price Change: {(df.iloc[-1]['close'] / df.iloc[30]['close'] - 1) * 100:+.1f}%")
+    print(f"Start Price: ${close[30]:,.0f}")
+    print(f"End Price: ${close[-1]:,.0f}")
+    print(f"Price Change: {(close[-1] / close[30] - 1) * 100:+.1f}%")
     print()
     
     print("=" * 80)
@@ -533,6 +626,7 @@ def main():
     
     print("Computing indicators...")
     df = compute_indicators(df)
+    arrays = _extract_arrays(df)
     print(f"Data ready: {len(df)} days")
     print()
     
@@ -541,23 +635,20 @@ def main():
     
     results = []
     
-    # v2.0.1 Adaptive
-    r1 = run_lp_backtest(df, lp_policy_v201, "LP v2.0.1 Adaptive")
-    results.append(r1)
-    print(f"  v2.0.1:    {r1.total_return_pct:+.1f}%, Fee/IL: {r1.fee_il_ratio:.2f}x")
+    lp_runs = run_lp_backtests(df, [
+        (lp_policy_v201, "LP v2.0.1 Adaptive"),
+        (lp_policy_static, "Static 50% LP"),
+        (lp_policy_aggressive, "Aggressive 80% LP"),
+    ], arrays=arrays)
+    results.extend(lp_runs)
     
-    # Static 50%
-    r2 = run_lp_backtest(df, lp_policy_static, "Static 50% LP")
-    results.append(r2)
+    r1, r2, r3 = lp_runs
+    print(f"  v2.0.1:    {r1.total_return_pct:+.1f}%, Fee/IL: {r1.fee_il_ratio:.2f}x")
     print(f"  Static:    {r2.total_return_pct:+.1f}%, Fee/IL: {r2.fee_il_ratio:.2f}x")
-    
-    # Aggressive 80%
-    r3 = run_lp_backtest(df, lp_policy_aggressive, "Aggressive 80% LP")
-    results.append(r3)
     print(f"  Aggr 80%:  {r3.total_return_pct:+.1f}%, Fee/IL: {r3.fee_il_ratio:.2f}x")
     
     # Spot only
-    r4 = run_spot_only(df)
+    r4 = run_spot_only(df, arrays=arrays)
     results.append(r4)
     print(f"  Spot Only: {r4.total_return_pct:+.1f}%")
     
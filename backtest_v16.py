@@ -3,10 +3,16 @@ Backtest v1.6 TREND-FOLLOWING vs v1.4.1 CONSERVATIVE
 """
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from datetime import datetime, timedelta
 
+from _njit import njit
+
 np.random.seed(42)
 
+REGIME_NAMES = ("BULL", "BEAR", "RANGE", "TRANSITION")
+REG_BULL, REG_BEAR, REG_RANGE, REG_TRANSITION = range(len(REGIME_NAMES))
+
 def generate_btc_cycle():
     """Generate realistic BTC 2022-2025 cycle"""
     phases = [
@@ -30,51 +36,61 @@ def generate_btc_cycle():
 
 
 def compute_indicators(prices):
-    """Compute momentum, vol_z, returns"""
+    """Compute momentum, vol_z, returns (zero for the first 30 days)"""
     n = len(prices)
     momentum = np.zeros(n)
     vol_z = np.zeros(n)
     returns_30d = np.zeros(n)
+    if n <= 30:
+        return momentum, vol_z, returns_30d
     
-    for i in range(30, n):
-        ret = (prices[i] / prices[i-20] - 1)
-        momentum[i] = np.clip(ret * 5, -1, 1)
-        
-        rets = np.diff(prices[i-30:i]) / prices[i-30:i-1]
-        vol = np.std(rets) * np.sqrt(365)
-        vol_z[i] = (vol - 0.6) / 0.3
-        
-        returns_30d[i] = prices[i] / prices[i-30] - 1
+    momentum[30:] = np.clip((prices[30:] / prices[10:-20] - 1) * 5, -1, 1)
+    
+    # Day i: std of the 29 daily returns inside prices[i-30:i]
+    rets = np.diff(prices) / prices[:-1]
+    vol = np.std(sliding_window_view(rets[:n - 2], 29), axis=1) * np.sqrt(365)
+    vol_z[30:] = (vol - 0.6) / 0.3
+    
+    returns_30d[30:] = prices[30:] / prices[:-30] - 1
     
     return momentum, vol_z, returns_30d
 
 
-def detect_regime(momentum, returns_30d):
-    """Simple regime detection"""
+@njit(cache=True)
+def _regime_code(momentum, returns_30d):
+    """Simple regime detection, as a REG_* code"""
     if momentum > 0.3 and returns_30d > 0.05:
-        return "BULL"
+        return REG_BULL
     elif momentum < -0.3 and returns_30d < -0.05:
-        return "BEAR"
+        return REG_BEAR
     elif abs(momentum) < 0.2:
-        return "RANGE"
+        return REG_RANGE
     else:
-        return "TRANSITION"
+        return REG_TRANSITION
+
+
+def detect_regime(momentum, returns_30d):
+    """Simple regime detection"""
+    return REGIME_NAMES[_regime_code(momentum, returns_30d)]
+
+
+def _price_bands(prices):
+    """(20th, 80th) price percentiles: bottoms and tops for analysis"""
+    bottom_20, top_20 = np.percentile(prices, [20, 80])
+    return bottom_20, top_20
 
 
-def backtest_v14(prices, momentum, vol_z, returns_30d):
-    """v1.4.1 CONSERVATIVE - original params"""
-    capital = 100000
-    position = 0
+@njit(cache=True)
+def _backtest_v14_loop(prices, momentum, vol_z, returns_30d, bottom_20, top_20):
+    """Day loop of backtest_v14(); bottom_20 / top_20 are the 20th / 80th price percentiles"""
+    capital = 100000.0
+    position = 0.0
     cash = capital
     last_trade = 0
     trades = 0
     sells_at_bottom = 0
     buys_at_top = 0
     
-    # Find bottoms and tops for analysis
-    bottom_20 = np.percentile(prices, 20)
-    top_20 = np.percentile(prices, 80)
-    
     # POSITION LIMITS
     MAX_POSITION_VALUE = capital * 1.0  # Max 100% in BTC
     
@@ -83,7 +99,7 @@ def backtest_v14(prices, momentum, vol_z, returns_30d):
         mom = momentum[i]
         vol = vol_z[i]
         ret30 = returns_30d[i]
-        regime = detect_regime(mom, ret30)
+        regime = _regime_code(mom, ret30)
         
         conf = 0.3 + abs(mom) * 0.5
         position_value = position * price
@@ -100,7 +116,7 @@ def backtest_v14(prices, momentum, vol_z, returns_30d):
             continue
         
         # OLD logic
-        if regime == "BULL" and mom > 0.3 and conf >= 0.50:
+        if regime == REG_BULL and mom > 0.3 and conf >= 0.50:
             if position_value < MAX_POSITION_VALUE and cash > 0:
                 buy_amount = min(cash * 0.10, MAX_POSITION_VALUE - position_value)
                 if buy_amount > 100:
@@ -111,7 +127,7 @@ def backtest_v14(prices, momentum, vol_z, returns_30d):
                     trades += 1
                     if price > top_20:
                         buys_at_top += 1
-        elif regime == "BEAR" and mom < -0.3 and conf >= 0.50 and not is_panic:
+        elif regime == REG_BEAR and mom < -0.3 and conf >= 0.50 and not is_panic:
             if position > 0:
                 sell_units = position * 0.15
                 cash += sell_units * price
@@ -125,10 +141,23 @@ def backtest_v14(prices, momentum, vol_z, returns_30d):
     return (final_value / capital - 1) * 100, trades, sells_at_bottom
 
 
-def backtest_v16(prices, momentum, vol_z, returns_30d):
-    """v1.6.0 TREND-FOLLOWING - new aggressive params"""
-    capital = 100000
-    position = 0
+def backtest_v14(prices, momentum, vol_z, returns_30d, bottom_20=None, top_20=None):
+    """
+    v1.4.1 CONSERVATIVE - original params
+    
+    bottom_20 / top_20: 20th / 80th price percentiles (computed from prices
+    if not given).
+    """
+    if bottom_20 is None or top_20 is None:
+        bottom_20, top_20 = _price_bands(prices)
+    return _backtest_v14_loop(prices, momentum, vol_z, returns_30d, bottom_20, top_20)
+
+
+@njit(cache=True)
+def _backtest_v16_loop(prices, momentum, vol_z, returns_30d, bottom_20, top_20):
+    """Day loop of backtest_v16(); bottom_20 / top_20 are the 20th / 80th price percentiles"""
+    capital = 100000.0
+    position = 0.0
     cash = capital
     last_buy = 0
     last_sell = 0
@@ -136,9 +165,6 @@ def backtest_v16(prices, momentum, vol_z, returns_30d):
     sells_at_bottom = 0
     buys_at_top = 0
     
-    bottom_20 = np.percentile(prices, 20)
-    top_20 = np.percentile(prices, 80)
-    
     # POSITION LIMITS
     MAX_POSITION_VALUE = capital * 1.0  # Max 100% of initial capital in BTC
     
@@ -147,7 +173,7 @@ def backtest_v16(prices, momentum, vol_z, returns_30d):
         mom = momentum[i]
         vol = vol_z[i]
         ret30 = returns_30d[i]
-        regime = detect_regime(mom, ret30)
+        regime = _regime_code(mom, ret30)
         
         conf = 0.3 + abs(mom) * 0.5
         
@@ -162,7 +188,7 @@ def backtest_v16(prices, momentum, vol_z, returns_30d):
         sell_cooldown = i - last_buy < 7
         
         # v1.6 TREND-FOLLOWING logic
-        if regime == "BULL":
+        if regime == REG_BULL:
             # В бычке - покупаем, но с лимитом
             if not buy_cooldown and conf >= 0.30 and mom > -0.2:
                 if position_value < MAX_POSITION_VALUE and cash > 0:
@@ -177,7 +203,7 @@ def backtest_v16(prices, momentum, vol_z, returns_30d):
                         if price > top_20:
                             buys_at_top += 1
                         
-        elif regime == "BEAR":
+        elif regime == REG_BEAR:
             # В медведе - продаём только при подтверждении
             if not sell_cooldown and not is_panic:
                 if conf >= 0.70 and mom < -0.40 and ret30 < -0.15:
@@ -203,6 +229,18 @@ def backtest_v16(prices, momentum, vol_z, returns_30d):
     return (final_value / capital - 1) * 100, trades, sells_at_bottom
 
 
+def backtest_v16(prices, momentum, vol_z, returns_30d, bottom_20=None, top_20=None):
+    """
+    v1.6.0 TREND-FOLLOWING - new aggressive params
+    
+    bottom_20 / top_20: 20th / 80th price percentiles (computed from prices
+    if not given).
+    """
+    if bottom_20 is None or top_20 is None:
+        bottom_20, top_20 = _price_bands(prices)
+    return _backtest_v16_loop(prices, momentum, vol_z, returns_30d, bottom_20, top_20)
+
+
 def main():
     print("\n" + "="*70)
     print("BACKTEST: v1.4.1 CONSERVATIVE vs v1.6.0 TREND-FOLLOWING")
@@ -213,8 +251,9 @@ def main():
     
     bh_return = (prices[-1] / prices[0] - 1) * 100
     
-    v14_return, v14_trades, v14_sells_bottom = backtest_v14(prices, momentum, vol_z, returns_30d)
-    v16_return, v16_trades, v16_sells_bottom = backtest_v16(prices, momentum, vol_z, returns_30d)
+    bottom_20, top_20 = _price_bands(prices)
+    v14_return, v14_trades, v14_sells_bottom = backtest_v14(prices, momentum, vol_z, returns_30d, bottom_20, top_20)
+    v16_return, v16_trades, v16_sells_bottom = backtest_v16(prices, momentum, vol_z, returns_30d, bottom_20, top_20)
     
     print(f"\nData: {len(prices)} days")
     print(f"BTC: ${prices[0]:,.0f} → ${prices[-1]:,.0f}")
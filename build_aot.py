@@ -0,0 +1,131 @@
+"""
+Build the AOT-compiled allocation core and backtest kernels.
+
+    pip install numba
+    python build_aot.py
+
+Compiles asset_allocation's decision core with numba.pycc into an
+`allocation_core` extension module next to this file. The module needs
+only numpy at runtime, so JIT warmup disappears from short runs (cron,
+Telegram bot). asset_allocation uses it automatically when it was built
+from the current asset_allocation.py and falls back to numba JIT / plain
+Python otherwise — rebuild after editing that file.
+
+The same goes for backtest.py's indicator recurrences and bar loop, built
+into `backtest_kernel`, and backtest_combined.py's price paths, RSI and day
+loop, built into `combined_kernel`.
+"""
+
+import os
+import sys
+
+from numba.pycc import CC
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import asset_allocation as aa
+import backtest as bt
+import backtest_combined as bc
+
+
+# (conf_no_action, conf_action, conf_strong_sell, conf_strong_buy,
+#  mom_strong, mom_weak, max_actions_30d, cooldown x3), see aa._CORE_PARAMS
+PARAMS = "Tuple((f8, f8, f8, f8, f8, f8, i8, i8, i8, i8))"
+
+DECIDE_ACTION_SIG = (
+    "UniTuple(i8, 6)("
+    "i8, f8, f8, f8, f8, i8, b1, i8, i8, i8, i8, i8, i8, " + PARAMS + ")"
+)
+DECIDE_PAIR_SIG = (
+    "UniTuple(i8, 12)("
+    "i8, f8, f8, f8, f8, i8, b1, i8, i8, i8, i8, i8, i8, i8, " + PARAMS + ")"
+)
+COOLDOWN_SIG = "i8(i8, i8, i8, " + PARAMS + ")"
+
+# backtest.py: (equity, final_equity, bar, regime, confidence, momentum, reason)
+EWM_MEAN_SIG = "f8[:](f8[:], f8, b1, i8)"
+WILDER_SMOOTH_SIG = "f8[:](f8[:], f8, i8)"
+FLOORED_PRICE_PATH_SIG = "f8[:](f8, f8[:], f8)"
+BACKTEST_LOOP_SIG = (
+    "Tuple((f8[:], f8, i8[:], i1[:], f8[:], f8[:], i1[:]))("
+    "i1[:], f8[:], f8[:], i1[:], f8[:], f8[:], i8, f8, f8)"
+)
+SHARPE_RATIO_SIG = "f8(f8[:])"
+
+# backtest_combined.py: close, day, regime, confidence, momentum, tail_risk,
+# tail_polarity, vol_z, returns_30d, LP exposure, IL, growth, fee rate, initial
+PHASE_PATH_SIG = "f8[:](f8, f8, i8, f8[:])"
+RSI_SIG = "f8[:](f8[:], i8)"
+ROLLING_SIG = "f8[:](f8[:], i8)"
+RUN_BOOKS_SIG = (
+    "Tuple((f8[:, :], f8, f8, f8, f8, i8, i8, f8, i8, i8, f8, f8, f8))("
+    "f8[:], i8[:], i1[:], f8[:], f8[:], b1[:], i1[:], f8[:], f8[:], "
+    "f8[:], f8[:], f8[:], f8[:], f8)"
+)
+
+
+def build(output_dir: str = None) -> str:
+    cc = CC("allocation_core")
+    cc.output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+    cc.verbose = True
+
+    source_crc = aa._SOURCE_CRC
+
+    @cc.export("source_crc", "i8()")
+    def _source_crc():
+        return source_crc
+
+    cc.export("decide_action", DECIDE_ACTION_SIG)(aa._decide_action_core.py_func)
+    cc.export("decide_pair", DECIDE_PAIR_SIG)(aa._decide_pair_core.py_func)
+    cc.export("cooldown_remaining", COOLDOWN_SIG)(aa._cooldown_remaining.py_func)
+
+    cc.compile()
+    return cc.output_dir
+
+
+def build_backtest(output_dir: str = None) -> str:
+    cc = CC("backtest_kernel")
+    cc.output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+    cc.verbose = True
+
+    source_crc = bt._SOURCE_CRC
+
+    @cc.export("source_crc", "i8()")
+    def _source_crc():
+        return source_crc
+
+    cc.export("ewm_mean", EWM_MEAN_SIG)(bt._ewm_mean_core.py_func)
+    cc.export("wilder_smooth", WILDER_SMOOTH_SIG)(bt._wilder_smooth_core.py_func)
+    cc.export("floored_price_path", FLOORED_PRICE_PATH_SIG)(bt._floored_price_path_core.py_func)
+    cc.export("backtest_loop", BACKTEST_LOOP_SIG)(bt._backtest_loop_core.py_func)
+    cc.export("sharpe_ratio", SHARPE_RATIO_SIG)(bt._sharpe_ratio_core.py_func)
+
+    cc.compile()
+    return cc.output_dir
+
+
+def build_combined(output_dir: str = None) -> str:
+    cc = CC("combined_kernel")
+    cc.output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+    cc.verbose = True
+
+    source_crc = bc._SOURCE_CRC
+
+    @cc.export("source_crc", "i8()")
+    def _source_crc():
+        return source_crc
+
+    cc.export("phase_path", PHASE_PATH_SIG)(bc._phase_path_core.py_func)
+    cc.export("rsi", RSI_SIG)(bc._rsi_core.py_func)
+    cc.export("rolling_mean", ROLLING_SIG)(bc._rolling_mean_core.py_func)
+    cc.export("rolling_std", ROLLING_SIG)(bc._rolling_std_core.py_func)
+    cc.export("run_books", RUN_BOOKS_SIG)(bc._run_books_core.py_func)
+
+    cc.compile()
+    return cc.output_dir
+
+
+if __name__ == "__main__":
+    print(f"Built allocation_core in {build()}")
+    print(f"Built backtest_kernel in {build_backtest()}")
+    print(f"Built combined_kernel in {build_combined()}")